@@ -132,6 +132,85 @@ def configure_logging(app):
     app.logger.info('Application TheDraftClinic démarrée')
 
 
+# ==============================================================================
+# CRÉATION DES INDEX MANQUANTS
+# ==============================================================================
+
+def create_missing_indexes():
+    """
+    Crée les index déclarés dans les modèles mais absents de la base.
+    
+    db.create_all() ne crée les index que pour les nouvelles tables. Cette
+    fonction complète les tables existantes lorsqu'un index est ajouté à
+    un modèle (ex: index composites de pagination).
+    
+    Note:
+        Doit être appelée dans un contexte d'application, après create_all().
+    """
+    from sqlalchemy import inspect
+    
+    inspector = inspect(db.engine)
+    
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(db.engine)
+                logging.getLogger(__name__).info(f"Index créé: {index.name}")
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Erreur création index {index.name}: {e}")
+
+
+def create_missing_columns():
+    """
+    Ajoute les colonnes déclarées dans les modèles mais absentes de la base.
+    
+    db.create_all() ne modifie pas les tables existantes. Seules les
+    colonnes nullables sont ajoutées automatiquement (ex: rendu stocké des
+    pages); les autres nécessitent une migration manuelle.
+    
+    Note:
+        Doit être appelée dans un contexte d'application, après create_all().
+    """
+    from sqlalchemy import inspect, text
+    
+    inspector = inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable:
+                logging.getLogger(__name__).warning(
+                    f"Colonne {table.name}.{column.name} absente: migration manuelle requise"
+                )
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(text(
+                        f"ALTER TABLE {preparer.format_table(table)} "
+                        f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                    ))
+                logging.getLogger(__name__).info(f"Colonne créée: {table.name}.{column.name}")
+            except Exception as e:
+                logging.getLogger(__name__).error(
+                    f"Erreur création colonne {table.name}.{column.name}: {e}"
+                )
+
+
 # ==============================================================================
 # FONCTION DE CRÉATION DE L'APPLICATION (FACTORY PATTERN)
 # ==============================================================================
@@ -205,6 +284,17 @@ def create_app():
     # Création du dossier uploads s'il n'existe pas
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
+    # Envoi des téléchargements: '' (par le worker), 'x-sendfile' ou
+    # 'x-accel-redirect' (fichier servi par le serveur frontal)
+    app.config['UPLOAD_SENDFILE_MODE'] = os.environ.get('UPLOAD_SENDFILE_MODE', '')
+    
+    # Emplacement interne Nginx correspondant au dossier d'uploads (X-Accel-Redirect)
+    app.config['UPLOAD_ACCEL_PREFIX'] = os.environ.get('UPLOAD_ACCEL_PREFIX', '/_uploads/')
+    
+    # Réception des uploads en flux, directement dans le dossier d'uploads
+    from services.file_service import init_file_service
+    init_file_service(app)
+    
     # --------------------------------------------------------------------------
     # CONFIGURATION DES IDENTIFIANTS ADMIN PAR DÉFAUT
     # --------------------------------------------------------------------------
@@ -218,6 +308,126 @@ def create_app():
     # Mot de passe admin (depuis variable d'environnement, requis pour création)
     app.config['ADMIN_PASSWORD'] = os.environ.get('ADMIN_PASSWORD')
     
+    # --------------------------------------------------------------------------
+    # CONFIGURATION DU RATE LIMITER
+    # --------------------------------------------------------------------------
+    
+    # Stockage des compteurs: memory:// (par worker), sqlite:///chemin
+    # (partagé entre workers locaux) ou redis://hote:port/db
+    app.config['RATE_LIMIT_STORAGE_URL'] = os.environ.get(
+        'RATE_LIMIT_STORAGE_URL',
+        'memory://'
+    )
+    
+    # Nombre maximum de clés conservées (stockages mémoire et SQLite)
+    app.config['RATE_LIMIT_MAX_KEYS'] = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 10000))
+    
+    # Intervalle (secondes) entre deux balayages des clés des IP inactives
+    app.config['RATE_LIMIT_SWEEP_INTERVAL'] = int(os.environ.get('RATE_LIMIT_SWEEP_INTERVAL', 60))
+    
+    # --------------------------------------------------------------------------
+    # CONFIGURATION DU JOURNAL D'ACTIVITÉ
+    # --------------------------------------------------------------------------
+    
+    # Écriture différée (par lots, en arrière-plan) des entrées de simple trace
+    app.config['ACTIVITY_LOG_ASYNC'] = os.environ.get('ACTIVITY_LOG_ASYNC', '').lower() in ('1', 'true', 'yes')
+    
+    # Capacité de la file (au-delà, les entrées sont abandonnées et comptées)
+    app.config['ACTIVITY_LOG_QUEUE_SIZE'] = int(os.environ.get('ACTIVITY_LOG_QUEUE_SIZE', 10000))
+    
+    # Nombre maximum de lignes par INSERT
+    app.config['ACTIVITY_LOG_BATCH_SIZE'] = int(os.environ.get('ACTIVITY_LOG_BATCH_SIZE', 200))
+    
+    # Délai maximum (secondes) avant l'écriture d'une entrée
+    app.config['ACTIVITY_LOG_FLUSH_INTERVAL'] = float(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL', 1.0))
+    
+    # Durée de conservation des entrées en base (jours), au-delà: archive gzip
+    app.config['ACTIVITY_LOG_RETENTION_DAYS'] = int(os.environ.get('ACTIVITY_LOG_RETENTION_DAYS', 365))
+    
+    # Dossier des archives du journal (fichiers .jsonl.gz)
+    app.config['ACTIVITY_LOG_ARCHIVE_FOLDER'] = os.environ.get(
+        'ACTIVITY_LOG_ARCHIVE_FOLDER',
+        os.path.join(app.instance_path, 'archives')
+    )
+    
+    # --------------------------------------------------------------------------
+    # BUDGET ET INSTRUMENTATION DES REQUÊTES SQL
+    # --------------------------------------------------------------------------
+    
+    # Dépassement du plafond de requêtes d'une page (@query_budget): erreur
+    # si activé (développement, CI), simple avertissement sinon
+    app.config['QUERY_BUDGET_STRICT'] = os.environ.get('QUERY_BUDGET_STRICT', '').lower() in ('1', 'true', 'yes')
+    
+    # Mesure des requêtes SQL par requête HTTP (Server-Timing, page admin)
+    app.config['SQL_INSTRUMENTATION'] = os.environ.get('SQL_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes')
+    
+    # Nombre de requêtes HTTP conservées par endpoint pour la page admin
+    app.config['SQL_INSTRUMENTATION_WINDOW'] = int(os.environ.get('SQL_INSTRUMENTATION_WINDOW', 500))
+    
+    # --------------------------------------------------------------------------
+    # MÉTRIQUES DE LATENCE PAR ENDPOINT
+    # --------------------------------------------------------------------------
+    
+    # Histogrammes de durée, de temps de rendu et de taille par endpoint
+    app.config['PERF_METRICS'] = os.environ.get('PERF_METRICS', '').lower() in ('1', 'true', 'yes')
+    
+    # Fichier SQLite où les workers cumulent leurs mesures
+    app.config['PERF_METRICS_STORE'] = os.environ.get(
+        'PERF_METRICS_STORE',
+        os.path.join(app.instance_path, 'perf_metrics.sqlite3')
+    )
+    
+    # Délai maximum (secondes) avant l'écriture des mesures d'un worker
+    app.config['PERF_METRICS_FLUSH_INTERVAL'] = float(os.environ.get('PERF_METRICS_FLUSH_INTERVAL', 10))
+    
+    # Jeton d'accès à /metrics (Authorization: Bearer); sans jeton, accès
+    # limité aux requêtes locales
+    app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+    
+    # --------------------------------------------------------------------------
+    # CACHE HTTP DES PAGES PUBLIQUES
+    # --------------------------------------------------------------------------
+    
+    # Fraîcheur (secondes) des pages publiques servies aux visiteurs anonymes
+    app.config['HTTP_CACHE_MAX_AGE'] = int(os.environ.get('HTTP_CACHE_MAX_AGE', 60))
+    
+    # Durée (secondes) d'affichage d'une page périmée pendant sa revalidation
+    app.config['HTTP_CACHE_STALE_WHILE_REVALIDATE'] = int(
+        os.environ.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', 300)
+    )
+    
+    # Cache des pages complètes: memory:// (par worker), file:///chemin
+    # (partagé entre workers locaux) ou none:// (désactivé)
+    app.config['PAGE_CACHE_URL'] = os.environ.get('PAGE_CACHE_URL', 'memory://')
+    
+    # Nombre maximum de pages conservées (éviction LRU)
+    app.config['PAGE_CACHE_MAX_ENTRIES'] = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 500))
+    
+    # --------------------------------------------------------------------------
+    # ASSETS STATIQUES COMPILÉS
+    # --------------------------------------------------------------------------
+    
+    # Dossier des assets produits par build_assets.py (manifest.json,
+    # fichiers à empreinte et variantes .gz/.br), servis sous /assets
+    app.config['ASSETS_FOLDER'] = os.environ.get(
+        'ASSETS_FOLDER',
+        os.path.join(app.static_folder, 'dist')
+    )
+    
+    # Durée de cache (secondes) des assets compilés, dont le nom change avec le contenu
+    app.config['ASSETS_MAX_AGE'] = int(os.environ.get('ASSETS_MAX_AGE', 31536000))
+    
+    # --------------------------------------------------------------------------
+    # CACHE DE BYTECODE DES TEMPLATES
+    # --------------------------------------------------------------------------
+    
+    # Dossier partagé par les workers où les templates compilés sont
+    # conservés (vide: désactivé); rempli au déploiement par warm_templates.py
+    app.config['JINJA_BYTECODE_CACHE_DIR'] = os.environ.get(
+        'JINJA_BYTECODE_CACHE_DIR',
+        os.path.join(app.instance_path, 'jinja_cache')
+    )
+    
     # --------------------------------------------------------------------------
     # INITIALISATION DES EXTENSIONS
     # --------------------------------------------------------------------------
@@ -231,6 +441,26 @@ def create_app():
     # Initialisation de la protection CSRF
     csrf.init_app(app)
     
+    # Initialisation du stockage des limiteurs de taux
+    from security.rate_limiter import init_rate_limiter
+    init_rate_limiter(app)
+    
+    # Écriture différée du journal d'activité (si activée)
+    from services.activity_log_writer import init_activity_log_writer
+    init_activity_log_writer(app)
+    
+    # Instrumentation SQL par requête (si activée)
+    from services.sql_instrumentation import init_sql_instrumentation
+    init_sql_instrumentation(app)
+    
+    # Histogrammes de latence par endpoint (si activés)
+    from services.perf_metrics import init_perf_metrics
+    init_perf_metrics(app)
+    
+    # Sources des métriques exportées sur /metrics (pool, limiteurs, i18n)
+    from services.metrics_exporter import init_metrics_exporter
+    init_metrics_exporter(app)
+    
     # --------------------------------------------------------------------------
     # CONFIGURATION DE FLASK-LOGIN
     # --------------------------------------------------------------------------
@@ -312,15 +542,36 @@ def create_app():
     # CONTEXT PROCESSORS (Variables globales pour templates)
     # --------------------------------------------------------------------------
     
+    # Cache par processus des paramètres du site et des pages du footer,
+    # invalidé entre workers par un fichier tampon de version
+    from services.site_cache import init_site_cache
+    init_site_cache(app)
+    
+    # Templates compilés partagés entre workers (cache de bytecode sur disque)
+    from services.template_cache import init_template_cache
+    init_template_cache(app)
+    
+    # Assets compilés (asset_url, route /assets avec cache immuable)
+    from services.assets import init_assets
+    init_assets(app)
+    
+    # En-têtes de cache: ETag et cache public des pages publiques anonymes,
+    # no-store pour les autres pages HTML
+    from services.http_cache import init_http_cache
+    init_http_cache(app)
+    
+    # Pages publiques complètes servies sans base ni rendu (anonymes)
+    from services.page_cache import init_page_cache
+    init_page_cache(app)
+    
     @app.context_processor
     def inject_site_settings():
         """Injecte les paramètres du site dans tous les templates."""
         from datetime import datetime
         try:
-            from models.site_settings import SiteSettings
-            from models.page import Page
-            settings = SiteSettings.get_settings()
-            footer_pages = Page.get_footer_pages()
+            from services.site_cache import get_site_settings, get_footer_pages
+            settings = get_site_settings()
+            footer_pages = get_footer_pages()
             return {
                 'site_settings': settings,
                 'footer_pages': footer_pages,
@@ -337,9 +588,22 @@ def create_app():
         # Création de toutes les tables définies dans les modèles
         db.create_all()
         
+        # Ajout des colonnes et index déclarés après la création des tables
+        create_missing_columns()
+        create_missing_indexes()
+        
         # Création du compte administrateur par défaut si nécessaire
         from services.admin_service import create_default_admin
         create_default_admin()
+        
+        # Ligne des compteurs du dashboard admin (calculée si absente)
+        from models.dashboard_counter import DashboardCounters
+        DashboardCounters.ensure_counters()
+        
+        # Création des paramètres du site par défaut si nécessaire (plutôt
+        # qu'au premier affichage, où le commit expirerait les objets chargés)
+        from models.site_settings import SiteSettings
+        SiteSettings.get_settings()
     
     # --------------------------------------------------------------------------
     # CONFIGURATION DU LOGGING
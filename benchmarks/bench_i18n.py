@@ -0,0 +1,150 @@
+"""
+================================================================================
+TheDraftClinic - Micro-benchmark des traductions (i18n)
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Compare le coût des appels t() d'une page (landing.html et son layout)
+entre l'ancienne implémentation (langue relue dans la session et parcours
+des dictionnaires imbriqués à chaque appel) et l'actuelle (langue mémorisée
+sur g et tables aplaties compilées par utils.i18n.load_translations()).
+
+Usage:
+    python benchmarks/bench_i18n.py
+    python benchmarks/bench_i18n.py --pages 2000 --lang fr
+
+Le script n'a besoin ni de la base de données ni des variables
+d'environnement de l'application: il crée une application Flask minimale
+pour disposer d'un contexte de requête.
+================================================================================
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from flask import Flask
+
+from utils import i18n
+
+# Templates rendus pour la page d'accueil
+PAGE_TEMPLATES = ('landing.html', 'layouts/base.html')
+
+# Appels t('...') statiques dans un template
+KEY_PATTERN = re.compile(r"""\bt\(\s*['"]([\w.]+)['"]""")
+
+
+def extract_page_keys():
+    """
+    Extrait les clés de traduction utilisées par la page d'accueil.
+
+    Returns:
+        list: Clés dans l'ordre d'apparition (doublons conservés)
+    """
+    keys = []
+    for name in PAGE_TEMPLATES:
+        path = os.path.join(ROOT_DIR, 'templates', name)
+        with open(path, 'r', encoding='utf-8') as f:
+            keys.extend(KEY_PATTERN.findall(f.read()))
+    return keys
+
+
+def legacy_t(key, **kwargs):
+    """
+    Ancienne implémentation de t(): résolution de la langue depuis la
+    session à chaque appel, découpe de la clé et parcours des dictionnaires
+    imbriqués, puis de la langue par défaut en cas d'échec.
+    """
+    lang = i18n.resolve_locale()
+
+    if lang not in i18n.TRANSLATIONS:
+        lang = i18n.DEFAULT_LANGUAGE
+
+    translations = i18n.TRANSLATIONS.get(lang, {})
+
+    keys = key.split('.')
+    value = translations
+
+    try:
+        for k in keys:
+            value = value[k]
+    except (KeyError, TypeError):
+        fallback = i18n.TRANSLATIONS.get(i18n.DEFAULT_LANGUAGE, {})
+        try:
+            value = fallback
+            for k in keys:
+                value = value[k]
+        except (KeyError, TypeError):
+            return key
+
+    if isinstance(value, str) and kwargs:
+        try:
+            value = value.format(**kwargs)
+        except KeyError:
+            pass
+
+    return value
+
+
+def time_page(translate, keys, pages):
+    """
+    Mesure le temps moyen des traductions d'une page.
+
+    Args:
+        translate: Fonction de traduction à mesurer
+        keys: Clés traduites par la page
+        pages: Nombre de rendus simulés
+
+    Returns:
+        float: Temps moyen par page en microsecondes
+    """
+    start = time.perf_counter()
+    for _ in range(pages):
+        for key in keys:
+            translate(key)
+    return (time.perf_counter() - start) / pages * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark de utils.i18n.t()')
+    parser.add_argument('--pages', type=int, default=5000, help='Nombre de pages simulées')
+    parser.add_argument('--lang', default='fr', help='Langue de la requête simulée')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.secret_key = 'benchmark'
+    i18n.load_translations()
+
+    keys = extract_page_keys()
+
+    with app.test_request_context(f'/?lang={args.lang}'):
+        mismatches = [key for key in keys if legacy_t(key) != i18n.t(key)]
+        if mismatches:
+            print(f"Résultats différents pour: {', '.join(sorted(set(mismatches)))}")
+            return 1
+
+        # Échauffement
+        time_page(legacy_t, keys, 100)
+        time_page(i18n.t, keys, 100)
+
+        legacy = time_page(legacy_t, keys, args.pages)
+        compiled = time_page(i18n.t, keys, args.pages)
+
+    print(f"Page: {' + '.join(PAGE_TEMPLATES)} ({len(keys)} appels t(), langue {args.lang})")
+    print(f"  Ancienne version  : {legacy:8.1f} µs/page")
+    print(f"  Version actuelle  : {compiled:8.1f} µs/page")
+    print(f"  Gain              : {legacy - compiled:8.1f} µs/page ({legacy / compiled:.2f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+================================================================================
+TheDraftClinic - Micro-benchmark du limiteur de taux
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Compare le coût d'une requête limitée (is_allowed + record_request +
+get_remaining_requests) selon le trafic d'une IP dans la fenêtre:
+- exact: ancienne implémentation (liste des timestamps reconstruite à
+  chaque appel), reproduite ici comme référence
+- sliding_window et gcra: algorithmes de RateLimiter (stockage mémoire)
+
+Usage:
+    python benchmarks/bench_rate_limiter.py
+    python benchmarks/bench_rate_limiter.py --calls 20000
+================================================================================
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from collections import defaultdict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from security.rate_limiter import RateLimiter, ALGORITHMS
+from security.rate_limit_backends import MemoryBackend
+
+# Nombres de requêtes déjà présentes dans la fenêtre pour l'IP mesurée
+TRAFFIC_LEVELS = (10, 100, 1000, 10000)
+
+
+class ExactRateLimiter:
+    """Ancienne implémentation: liste des timestamps par IP."""
+
+    def __init__(self, max_requests=10, window_seconds=60):
+        self.requests = defaultdict(list)
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+
+    def _cleanup_old_requests(self, ip_address):
+        cutoff_time = time.time() - self.window_seconds
+        self.requests[ip_address] = [
+            timestamp for timestamp in self.requests[ip_address]
+            if timestamp > cutoff_time
+        ]
+
+    def is_allowed(self, ip_address):
+        self._cleanup_old_requests(ip_address)
+        return len(self.requests[ip_address]) < self.max_requests
+
+    def record_request(self, ip_address):
+        self.requests[ip_address].append(time.time())
+
+    def get_remaining_requests(self, ip_address):
+        self._cleanup_old_requests(ip_address)
+        return max(0, self.max_requests - len(self.requests[ip_address]))
+
+
+def build_limiter(algorithm, max_requests):
+    """
+    Crée un limiteur de l'algorithme demandé.
+
+    Args:
+        algorithm (str): 'exact' ou un algorithme de RateLimiter
+        max_requests (int): Limite de la fenêtre
+
+    Returns:
+        Le limiteur
+    """
+    if algorithm == 'exact':
+        return ExactRateLimiter(max_requests=max_requests, window_seconds=3600)
+    return RateLimiter(max_requests=max_requests, window_seconds=3600,
+                       name=f'bench-{algorithm}', backend=MemoryBackend(),
+                       algorithm=algorithm)
+
+
+def time_calls(limiter, traffic, calls):
+    """
+    Mesure le coût moyen d'une requête pour une IP déjà active.
+
+    Args:
+        limiter: Limiteur à mesurer
+        traffic (int): Requêtes déjà enregistrées pour l'IP
+        calls (int): Nombre de requêtes mesurées
+
+    Returns:
+        float: Temps moyen par requête en microsecondes
+    """
+    ip_address = '203.0.113.7'
+    for _ in range(traffic):
+        limiter.record_request(ip_address)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        if limiter.is_allowed(ip_address):
+            limiter.record_request(ip_address)
+        limiter.get_remaining_requests(ip_address)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark de RateLimiter')
+    parser.add_argument('--calls', type=int, default=2000, help='Requêtes mesurées par cas')
+    args = parser.parse_args()
+
+    # Les refus éventuels ne doivent pas être journalisés pendant la mesure
+    logging.disable(logging.WARNING)
+
+    algorithms = ('exact',) + ALGORITHMS
+    print(f"{'Trafic/IP':>10} " + ' '.join(f'{name:>16}' for name in algorithms))
+
+    for traffic in TRAFFIC_LEVELS:
+        # Limite assez haute pour que toutes les requêtes soient acceptées
+        max_requests = 2 * (traffic + args.calls)
+        results = [
+            time_calls(build_limiter(algorithm, max_requests), traffic, args.calls)
+            for algorithm in algorithms
+        ]
+        print(f'{traffic:>10} ' + ' '.join(f'{value:>11.2f} µs/r' for value in results))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,414 @@
+"""
+================================================================================
+TheDraftClinic - Static Asset Build Script
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+This script builds the static assets served under /assets:
+    - css/tailwind.css: Tailwind bundle purged to the classes used in
+      templates/ and static/js/ (Tailwind CLI, tailwind.config.js)
+    - css/styles.css and js/main.js: minified copies of the sources
+
+Each file is written under a fingerprinted name (content hash) with
+precompressed .gz and .br siblings, and listed in manifest.json, which the
+application reads at startup (services.assets). Run it at deploy time,
+before starting the workers; the pages then load no CDN script.
+
+Usage:
+    python build_assets.py
+    python build_assets.py --tailwind ./tailwindcss   # Tailwind CLI to use
+    python build_assets.py --no-tailwind              # Skip the Tailwind bundle
+    python build_assets.py --clean                    # Delete files of previous builds
+
+The Tailwind CLI is looked up in this order: --tailwind, $TAILWIND_BIN,
+"tailwindcss" on the PATH, node_modules/.bin/tailwindcss. The standalone
+executable (v3) needs neither Node.js nor network access. Brotli files
+require the optional "brotli" package (pip install brotli).
+================================================================================
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import argparse
+import subprocess
+import tempfile
+
+from services.assets import MANIFEST_NAME
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_FOLDER = os.path.join(ROOT, 'static')
+DEFAULT_OUTPUT = os.path.join(STATIC_FOLDER, 'dist')
+
+# Tailwind sources
+TAILWIND_CONFIG = os.path.join(ROOT, 'tailwind.config.js')
+TAILWIND_INPUT = os.path.join(ROOT, 'assets', 'tailwind.css')
+TAILWIND_ASSET = 'css/tailwind.css'
+
+# Static sources minified as-is (paths relative to static/)
+SOURCE_ASSETS = ('css/styles.css', 'js/main.js')
+
+# Length of the content hash in file names
+HASH_LENGTH = 10
+
+# Files smaller than this are not precompressed
+MIN_COMPRESS_SIZE = 256
+
+
+# ==============================================================================
+# MINIFICATION
+# ==============================================================================
+
+class _Minifier:
+    """
+    Minify CSS or JavaScript source outside strings and comments.
+
+    The source is split into code, strings (quotes and template literals
+    without nested backticks), comments and, for JavaScript, regular
+    expression literals. Strings and regular expressions are copied as-is,
+    comments are dropped (except /*! ... */ license comments) and runs of
+    code are passed to minify_code.
+
+    Attributes:
+        js (bool): JavaScript source (// comments, regex literals)
+        minify_code (callable): Minifies a run of code
+    """
+
+    def __init__(self, js, minify_code):
+        self.js = js
+        self.minify_code = minify_code
+
+    def _regex_allowed(self, code):
+        """A '/' starts a regex literal after an operator or a keyword."""
+        code = code.rstrip()
+        if not code:
+            return True
+        if code[-1] in '(,=:[!&|?{};+-*%<>~^':
+            return True
+        return re.search(r'\b(return|typeof|case|do|else|in|of|new|delete|void|throw)$', code) is not None
+
+    def minify(self, source):
+        """
+        Minify a source file.
+
+        Args:
+            source (str): Source code
+
+        Returns:
+            str: Minified code
+        """
+        parts = []
+        code = []
+        i = 0
+        length = len(source)
+
+        def flush():
+            if code:
+                parts.append(self.minify_code(''.join(code)))
+                code.clear()
+
+        while i < length:
+            char = source[i]
+            if char in '"\'`':
+                j = i + 1
+                while j < length and source[j] != char:
+                    j += 2 if source[j] == '\\' else 1
+                flush()
+                parts.append(source[i:j + 1])
+                i = j + 1
+            elif source.startswith('/*', i):
+                end = source.find('*/', i + 2)
+                end = length if end == -1 else end + 2
+                if source.startswith('/*!', i):
+                    flush()
+                    parts.append(source[i:end] + '\n')
+                else:
+                    # A comment separates tokens: replaced by a space
+                    code.append(' ')
+                i = end
+            elif self.js and source.startswith('//', i):
+                end = source.find('\n', i)
+                i = length if end == -1 else end
+            elif self.js and char == '/' and self._regex_allowed(
+                    (parts[-1] if parts else '') + ''.join(code)):
+                j = i + 1
+                in_class = False
+                while j < length and source[j] != '\n' and (source[j] != '/' or in_class):
+                    if source[j] == '\\':
+                        j += 1
+                    elif source[j] == '[':
+                        in_class = True
+                    elif source[j] == ']':
+                        in_class = False
+                    j += 1
+                j += 1
+                while j < length and (source[j].isalnum() or source[j] == '_'):
+                    j += 1
+                flush()
+                parts.append(source[i:j])
+                i = j
+            else:
+                code.append(char)
+                i += 1
+        flush()
+        return ''.join(parts)
+
+
+def _minify_css_code(code):
+    """Collapse whitespace in a run of CSS code."""
+    code = re.sub(r'\s+', ' ', code)
+    code = re.sub(r' ?([{};,>]) ?', r'\1', code)
+    return code.replace(';}', '}')
+
+
+def _minify_js_code(code):
+    """Strip indentation and blank lines in a run of JavaScript code (line breaks kept)."""
+    return '\n'.join(line.strip() for line in code.split('\n'))
+
+
+def minify_css(source):
+    """
+    Minify a CSS file: comments and whitespace are removed.
+
+    Args:
+        source (str): CSS source
+
+    Returns:
+        str: Minified CSS
+    """
+    return _Minifier(False, _minify_css_code).minify(source).strip()
+
+
+def minify_js(source):
+    """
+    Minify a JavaScript file conservatively.
+
+    Comments, indentation and blank lines are removed; line breaks are kept
+    so that automatic semicolon insertion behaves as in the source.
+
+    Args:
+        source (str): JavaScript source
+
+    Returns:
+        str: Minified JavaScript
+    """
+    js = _Minifier(True, _minify_js_code).minify(source)
+    return '\n'.join(line for line in js.split('\n') if line.strip()) + '\n'
+
+
+# ==============================================================================
+# TAILWIND
+# ==============================================================================
+
+def find_tailwind(explicit=None):
+    """
+    Locate the Tailwind CLI.
+
+    Args:
+        explicit (str): Path given on the command line
+
+    Returns:
+        str: Executable path, or None if not found
+    """
+    for candidate in (explicit, os.environ.get('TAILWIND_BIN')):
+        if candidate:
+            return candidate
+    found = shutil.which('tailwindcss')
+    if found:
+        return found
+    local = os.path.join(ROOT, 'node_modules', '.bin', 'tailwindcss')
+    return local if os.path.exists(local) else None
+
+
+def build_tailwind(executable):
+    """
+    Compile the purged and minified Tailwind bundle.
+
+    Args:
+        executable (str): Tailwind CLI
+
+    Returns:
+        bytes: Bundle content
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'tailwind.css')
+        subprocess.run(
+            [executable, '-c', TAILWIND_CONFIG, '-i', TAILWIND_INPUT, '-o', output, '--minify'],
+            cwd=ROOT, check=True
+        )
+        with open(output, 'rb') as f:
+            return f.read()
+
+
+# ==============================================================================
+# OUTPUT
+# ==============================================================================
+
+def fingerprint(path, content):
+    """
+    Return the fingerprinted name of an asset.
+
+    Args:
+        path (str): Source path (ex: 'css/styles.css')
+        content (bytes): Built content
+
+    Returns:
+        str: Ex: 'css/styles.3f2a9c1b0d.css'
+    """
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    base, extension = os.path.splitext(path)
+    return f'{base}.{digest}{extension}'
+
+
+def write_asset(output, built, content, brotli):
+    """
+    Write an asset and its precompressed siblings.
+
+    Args:
+        output (str): Output folder
+        built (str): Fingerprinted path
+        content (bytes): Built content
+        brotli: brotli module, or None
+
+    Returns:
+        list: Written paths (relative to the output folder)
+    """
+    written = [built]
+    path = os.path.join(output, built)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+    if len(content) >= MIN_COMPRESS_SIZE:
+        # mtime=0: identical output for identical content
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        written.append(built + '.gz')
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(content, quality=11))
+            written.append(built + '.br')
+    return written
+
+
+def clean_output(output, keep):
+    """
+    Delete files of previous builds.
+
+    Args:
+        output (str): Output folder
+        keep (set): Paths to keep (relative to the output folder)
+
+    Returns:
+        int: Number of deleted files
+    """
+    deleted = 0
+    for root, dirs, files in os.walk(output):
+        for name in files:
+            relative = os.path.relpath(os.path.join(root, name), output).replace(os.sep, '/')
+            if relative not in keep:
+                os.remove(os.path.join(root, name))
+                deleted += 1
+    return deleted
+
+
+def build_assets(output=DEFAULT_OUTPUT, tailwind=None, skip_tailwind=False, clean=False):
+    """
+    Build every asset and write the manifest.
+
+    Args:
+        output (str): Output folder
+        tailwind (str): Tailwind CLI path (looked up if None)
+        skip_tailwind (bool): Do not build the Tailwind bundle
+        clean (bool): Delete files of previous builds
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    print("=" * 60)
+    print("TheDraftClinic - Static Asset Build")
+    print("=" * 60)
+    print()
+
+    try:
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+            print("[!] brotli not installed: .br files are not written (pip install brotli)")
+
+        assets = {}
+
+        if not skip_tailwind:
+            executable = find_tailwind(tailwind)
+            if executable is None:
+                print("ERROR: Tailwind CLI not found.")
+                print("Install the standalone executable (TAILWIND_BIN) or use --no-tailwind.")
+                return False
+            print(f"[*] Building {TAILWIND_ASSET} with {executable}...")
+            assets[TAILWIND_ASSET] = build_tailwind(executable)
+
+        for path in SOURCE_ASSETS:
+            print(f"[*] Minifying {path}...")
+            with open(os.path.join(STATIC_FOLDER, path), encoding='utf-8') as f:
+                source = f.read()
+            minified = minify_css(source) if path.endswith('.css') else minify_js(source)
+            assets[path] = minified.encode('utf-8')
+
+        files = {}
+        written = {MANIFEST_NAME}
+        for path, content in assets.items():
+            built = fingerprint(path, content)
+            files[path] = built
+            written.update(write_asset(output, built, content, brotli))
+            print(f"      ✓ {built} ({len(content)} bytes)")
+
+        version = hashlib.sha256(
+            '\n'.join(sorted(files.values())).encode('utf-8')
+        ).hexdigest()[:16]
+        manifest_path = os.path.join(output, MANIFEST_NAME)
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'files': files}, f, indent=2, sort_keys=True)
+        os.replace(manifest_path + '.tmp', manifest_path)
+        print(f"[*] Manifest written: {manifest_path}")
+
+        if clean:
+            print(f"[*] Deleted {clean_output(output, written)} files of previous builds")
+
+        print()
+        print("=" * 60)
+        print("Asset build completed successfully!")
+        print("=" * 60)
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Asset build failed!")
+        print(f"Details: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build fingerprinted, minified and precompressed static assets')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Output folder (ASSETS_FOLDER)')
+    parser.add_argument('--tailwind', default=None, help='Tailwind CLI executable')
+    parser.add_argument('--no-tailwind', action='store_true', help='Skip the Tailwind bundle')
+    parser.add_argument('--clean', action='store_true', help='Delete files of previous builds')
+    args = parser.parse_args()
+
+    success = build_assets(
+        output=args.output,
+        tailwind=args.tailwind,
+        skip_tailwind=args.no_tailwind,
+        clean=args.clean
+    )
+    sys.exit(0 if success else 1)
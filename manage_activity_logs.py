@@ -0,0 +1,116 @@
+"""
+================================================================================
+TheDraftClinic - Activity Log Maintenance Script
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+This script keeps the activity_logs table bounded:
+    - archive: move entries older than the retention period to a gzip
+      JSON Lines file, in batches, then delete them
+    - partition: convert activity_logs to a monthly partitioned table
+      (PostgreSQL only, one-off)
+    - ensure-partitions: create the partitions of the coming months
+
+Usage:
+    python manage_activity_logs.py archive
+    python manage_activity_logs.py archive --days 180 --batch-size 5000
+    python manage_activity_logs.py archive --dry-run
+    python manage_activity_logs.py partition
+    python manage_activity_logs.py ensure-partitions --months-ahead 6
+
+Run "archive" (and "ensure-partitions" on a partitioned table) from a daily
+cron job. Defaults come from ACTIVITY_LOG_RETENTION_DAYS and
+ACTIVITY_LOG_ARCHIVE_FOLDER.
+================================================================================
+"""
+
+import sys
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def run(args):
+    """
+    Run the requested maintenance command.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    print("=" * 60)
+    print(f"TheDraftClinic - Activity Log Maintenance ({args.command})")
+    print("=" * 60)
+    print()
+
+    try:
+        from app import create_app
+        from services import activity_log_retention as retention
+
+        app = create_app()
+
+        with app.app_context():
+            if args.command == 'archive':
+                days = args.days or app.config['ACTIVITY_LOG_RETENTION_DAYS']
+                result = retention.archive_activity_logs(
+                    app.config['ACTIVITY_LOG_ARCHIVE_FOLDER'],
+                    retention_days=days,
+                    batch_size=args.batch_size,
+                    dry_run=args.dry_run
+                )
+                verb = "would be archived" if args.dry_run else "archived"
+                print(f"[*] Entries older than {result['cutoff']:%Y-%m-%d %H:%M} ({days} days)")
+                print(f"      ✓ {result['archived']} entries {verb}")
+                if result['path']:
+                    print(f"      ✓ Archive: {result['path']}")
+                if not args.dry_run:
+                    retention.ensure_activity_log_partitions(args.months_ahead)
+
+            elif args.command == 'partition':
+                print("[*] Converting activity_logs to a partitioned table...")
+                if retention.partition_activity_logs(args.months_ahead):
+                    print("      ✓ Table converted")
+                else:
+                    print("      ✓ Table already partitioned, partitions checked")
+
+            elif args.command == 'ensure-partitions':
+                count = retention.ensure_activity_log_partitions(args.months_ahead)
+                if count:
+                    print(f"      ✓ {count} monthly partitions checked")
+                else:
+                    print("      - activity_logs is not partitioned, nothing to do")
+
+        print()
+        print("=" * 60)
+        print("Activity log maintenance completed successfully!")
+        print("=" * 60)
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Activity log maintenance failed!")
+        print(f"Details: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Archive and partition the activity log')
+    parser.add_argument('command', choices=['archive', 'partition', 'ensure-partitions'])
+    parser.add_argument('--days', type=int, default=None,
+                        help='Retention period in days (default: ACTIVITY_LOG_RETENTION_DAYS)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Entries archived per batch')
+    parser.add_argument('--months-ahead', type=int, default=3,
+                        help='Monthly partitions created in advance')
+    parser.add_argument('--dry-run', action='store_true', help='Count entries only (archive)')
+    args = parser.parse_args()
+
+    success = run(args)
+    sys.exit(0 if success else 1)
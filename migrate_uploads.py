@@ -0,0 +1,171 @@
+"""
+================================================================================
+TheDraftClinic - Upload Layout Migration Script
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+This script moves files stored flat in the upload folder to the sharded
+"ab/cd/<name>" layout and rewrites the rows that reference them, in
+batches:
+    - documents.filename
+    - revision_attachments.filename
+    - payments.proof_document
+    - site_settings logo / favicon / OpenGraph image
+
+It then recounts the references of every stored file (file_blobs), so
+that files uploaded before reference counting are tracked and never
+deleted while a row still points to them.
+
+Usage:
+    python migrate_uploads.py
+    python migrate_uploads.py --dry-run          # Report only, change nothing
+    python migrate_uploads.py --batch-size 200   # Rows per transaction
+
+The migration can be interrupted and run again: a file is moved before its
+row is updated, and the download resolver finds files at either location
+while the migration is in progress.
+================================================================================
+"""
+
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Default number of rows updated per transaction
+DEFAULT_BATCH_SIZE = 500
+
+
+def migrate_column(model, attribute, folder, upload_root, batch_size, dry_run):
+    """
+    Move the files referenced by one column and rewrite its rows.
+
+    Args:
+        model: SQLAlchemy model
+        attribute (str): Column holding the file name
+        folder (str): Upload sub-folder of the column ('' for the root)
+        upload_root (str): UPLOAD_FOLDER
+        batch_size (int): Rows per transaction
+        dry_run (bool): Report only
+
+    Returns:
+        dict: Counters (rows, moved, missing)
+    """
+    from app import db
+    from services.file_service import shard_path
+
+    column = getattr(model, attribute)
+    folder_path = os.path.join(upload_root, folder)
+    stats = {'rows': 0, 'moved': 0, 'missing': 0}
+
+    last_id = 0
+    while True:
+        rows = model.query.filter(
+            model.id > last_id,
+            column.isnot(None),
+            column != '',
+            ~column.contains('/')
+        ).order_by(model.id).limit(batch_size).all()
+
+        if not rows:
+            break
+
+        for row in rows:
+            last_id = row.id
+            filename = getattr(row, attribute)
+            target = shard_path(filename)
+            source_path = os.path.join(folder_path, filename)
+            target_path = os.path.join(folder_path, target)
+
+            if os.path.isfile(source_path):
+                if not dry_run:
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    os.replace(source_path, target_path)
+                stats['moved'] += 1
+            elif not os.path.isfile(target_path):
+                # File missing on disk: keep the row unchanged
+                print(f"      ⚠ {model.__tablename__}#{row.id}: file not found ({filename})")
+                stats['missing'] += 1
+                continue
+
+            if not dry_run:
+                setattr(row, attribute, target)
+            stats['rows'] += 1
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+
+    return stats
+
+
+def migrate_uploads(batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Migrate every file-referencing column to the sharded layout.
+
+    Args:
+        batch_size (int): Rows per transaction
+        dry_run (bool): Report only
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    print("=" * 60)
+    print("TheDraftClinic - Upload Layout Migration" + (" (dry run)" if dry_run else ""))
+    print("=" * 60)
+    print()
+
+    try:
+        from app import create_app
+        from models.file_blob import FileBlob, get_reference_columns
+        from services.site_cache import bump_cache_version
+
+        app = create_app()
+
+        with app.app_context():
+            upload_root = app.config['UPLOAD_FOLDER']
+
+            for model, attribute, folder in get_reference_columns():
+                label = f"{model.__tablename__}.{attribute}"
+                print(f"[*] Migrating {label}...")
+                stats = migrate_column(model, attribute, folder, upload_root, batch_size, dry_run)
+                print(f"      ✓ {stats['rows']} rows, {stats['moved']} files moved, "
+                      f"{stats['missing']} missing")
+
+            if not dry_run:
+                print("[*] Rebuilding file references...")
+                print(f"      ✓ {FileBlob.rebuild()} files referenced")
+
+                # Cached site settings still hold the old branding file names
+                bump_cache_version()
+
+        print()
+        print("=" * 60)
+        print("Upload layout migration completed successfully!")
+        print("=" * 60)
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Upload migration failed!")
+        print(f"Details: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Move uploads to the sharded ab/cd/<name> layout')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Rows updated per transaction')
+    parser.add_argument('--dry-run', action='store_true', help='Report only, change nothing')
+    args = parser.parse_args()
+
+    success = migrate_uploads(batch_size=args.batch_size, dry_run=args.dry_run)
+    sys.exit(0 if success else 1)
@@ -13,3 +13,5 @@ from models.site_settings import SiteSettings
 from models.page import Page
 from models.deadline_extension import DeadlineExtension
 from models.revision_request import RevisionRequest, RevisionAttachment
+from models.dashboard_counter import DashboardCounters
+from models.file_blob import FileBlob
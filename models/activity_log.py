@@ -39,13 +39,20 @@ class ActivityLog(db.Model):
     
     __tablename__ = 'activity_logs'
     
+    # Index de tri chronologique (activité récente du dashboard et des
+    # statistiques) et de l'historique d'une demande. Le second couvre aussi
+    # les recherches par request_id seul.
+    __table_args__ = (
+        db.Index('ix_activity_logs_created_at_id', 'created_at', 'id'),
+        db.Index('ix_activity_logs_request_id_created_at', 'request_id', 'created_at'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     
     request_id = db.Column(
         db.Integer, 
         db.ForeignKey('service_requests.id'), 
-        nullable=False,
-        index=True
+        nullable=False
     )
     
     user_id = db.Column(
@@ -70,8 +77,10 @@ class ActivityLog(db.Model):
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    user = db.relationship('User', backref='activity_logs', lazy='joined')
-    service_request = db.relationship('ServiceRequest', backref='activity_logs', lazy='joined')
+    # Chargement explicite: jointure sur les pages de détail (load_detail),
+    # projection réduite sur les listes (recent)
+    user = db.relationship('User', backref='activity_logs')
+    service_request = db.relationship('ServiceRequest', backref='activity_logs')
     
     ACTION_TYPES = [
         ('comment', 'Commentaire'),
@@ -140,12 +149,67 @@ class ActivityLog(db.Model):
         }
         return colors.get(self.action_type, 'gray')
     
+    @staticmethod
+    def recent(limit=10):
+        """
+        Retourne les dernières entrées pour les listes (dashboard, statistiques).
+        
+        Projection réduite: colonnes affichées de l'entrée et nom de
+        l'auteur seulement (sans les colonnes texte de l'utilisateur ni la
+        demande). Accéder à la demande d'une entrée de cette liste lève une
+        erreur plutôt que de déclencher une requête par ligne.
+        
+        Args:
+            limit (int): Nombre d'entrées
+            
+        Returns:
+            list: Entrées, de la plus récente à la plus ancienne
+        """
+        from sqlalchemy.orm import joinedload, load_only, raiseload
+        from models.user import User
+        
+        return ActivityLog.query.options(
+            load_only(
+                ActivityLog.request_id, ActivityLog.user_id, ActivityLog.action_type,
+                ActivityLog.title, ActivityLog.description, ActivityLog.created_at
+            ),
+            joinedload(ActivityLog.user).load_only(User.first_name, User.last_name),
+            raiseload(ActivityLog.service_request)
+        ).order_by(
+            ActivityLog.created_at.desc(), ActivityLog.id.desc()
+        ).limit(limit).all()
+    
+    @staticmethod
+    def _values(request_id, user_id, action_type, title=None, description=None,
+                metadata=None, visible_to_client=True):
+        """
+        Construit les colonnes d'une entrée de log d'activité.
+        
+        Returns:
+            dict: Valeurs des colonnes de la ligne
+        """
+        import json
+        
+        return {
+            'request_id': request_id,
+            'user_id': user_id,
+            'action_type': action_type,
+            'title': title,
+            'description': description,
+            'metadata_json': json.dumps(metadata) if metadata else None,
+            'is_visible_to_client': visible_to_client,
+            'created_at': datetime.utcnow()
+        }
+    
     @staticmethod
     def log_action(request_id, user_id, action_type, title=None, description=None, 
                    metadata=None, visible_to_client=True):
         """
         Helper pour créer une entrée de log d'activité.
         
+        L'entrée est ajoutée à la session courante et validée avec le
+        reste de la transaction de l'appelant.
+        
         Args:
             request_id: ID de la demande
             user_id: ID de l'utilisateur
@@ -158,20 +222,44 @@ class ActivityLog(db.Model):
         Returns:
             ActivityLog: L'entrée créée
         """
-        import json
-        
-        log = ActivityLog(
-            request_id=request_id,
-            user_id=user_id,
-            action_type=action_type,
-            title=title,
-            description=description,
-            metadata_json=json.dumps(metadata) if metadata else None,
-            is_visible_to_client=visible_to_client
-        )
+        log = ActivityLog(**ActivityLog._values(
+            request_id, user_id, action_type, title, description,
+            metadata, visible_to_client
+        ))
         
         db.session.add(log)
         return log
     
+    @staticmethod
+    def log_event(request_id, user_id, action_type, title=None, description=None,
+                  metadata=None, visible_to_client=True):
+        """
+        Enregistre une entrée de simple trace, hors transaction métier.
+        
+        Avec l'écriture différée (ACTIVITY_LOG_ASYNC), l'entrée est mise en
+        file et insérée par lots en arrière-plan: la requête ne paie pas de
+        commit. Sinon, elle est validée immédiatement.
+        
+        Args:
+            Identiques à log_action
+            
+        Returns:
+            bool: True si l'entrée est enregistrée ou en file
+        """
+        from services.activity_log_writer import get_activity_log_writer
+        
+        values = ActivityLog._values(
+            request_id, user_id, action_type, title, description,
+            metadata, visible_to_client
+        )
+        
+        writer = get_activity_log_writer()
+        if writer is not None:
+            return writer.submit(values)
+        
+        db.session.add(ActivityLog(**values))
+        db.session.commit()
+        return True
+    
     def __repr__(self):
         return f'<ActivityLog {self.id} - {self.action_type}>'
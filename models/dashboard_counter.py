@@ -0,0 +1,334 @@
+"""
+================================================================================
+TheDraftClinic - Modèle Compteurs du Dashboard
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module définit le modèle DashboardCounters, une table matérialisée d'une
+seule ligne contenant les compteurs affichés sur le dashboard admin:
+- Nombre de demandes par statut et total
+- Paiements en attente de vérification
+- Nombre de clients
+
+Maintenance incrémentale:
+    Un listener SQLAlchemy 'before_flush' calcule les variations (insertions,
+    changements de statut, suppressions) de ServiceRequest, Payment et User,
+    puis applique un UPDATE atomique "col = col + delta" dans la même
+    transaction. Les compteurs restent donc cohérents quelle que soit la
+    route qui modifie les données (update_status, verify_payment,
+    new_request, register, etc.).
+
+    La ligne est créée au démarrage de l'application (ensure_counters),
+    à partir des tables sources. Si elle manque à l'affichage, les valeurs
+    sont calculées sans rien enregistrer: une requête GET ne fait pas de
+    commit.
+================================================================================
+"""
+
+from app import db
+from datetime import datetime
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Identifiant unique de la ligne de compteurs
+COUNTERS_ROW_ID = 1
+
+# Statuts suivis individuellement (un compteur par statut)
+TRACKED_REQUEST_STATUSES = (
+    'submitted', 'under_review', 'quote_sent', 'quote_accepted',
+    'awaiting_deposit', 'deposit_pending', 'in_progress', 'revision',
+    'completed', 'delivered', 'cancelled', 'rejected'
+)
+
+
+class DashboardCounters(db.Model):
+    """
+    Modèle représentant les compteurs matérialisés du dashboard admin.
+
+    La table ne contient qu'une seule ligne (id = 1). Le dashboard la lit
+    en une requête au lieu de compter les tables à chaque affichage.
+    """
+
+    __tablename__ = 'dashboard_counters'
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    requests_total = db.Column(db.Integer, nullable=False, default=0)
+
+    requests_submitted = db.Column(db.Integer, nullable=False, default=0)
+    requests_under_review = db.Column(db.Integer, nullable=False, default=0)
+    requests_quote_sent = db.Column(db.Integer, nullable=False, default=0)
+    requests_quote_accepted = db.Column(db.Integer, nullable=False, default=0)
+    requests_awaiting_deposit = db.Column(db.Integer, nullable=False, default=0)
+    requests_deposit_pending = db.Column(db.Integer, nullable=False, default=0)
+    requests_in_progress = db.Column(db.Integer, nullable=False, default=0)
+    requests_revision = db.Column(db.Integer, nullable=False, default=0)
+    requests_completed = db.Column(db.Integer, nullable=False, default=0)
+    requests_delivered = db.Column(db.Integer, nullable=False, default=0)
+    requests_cancelled = db.Column(db.Integer, nullable=False, default=0)
+    requests_rejected = db.Column(db.Integer, nullable=False, default=0)
+
+    payments_pending = db.Column(db.Integer, nullable=False, default=0)
+
+    clients_total = db.Column(db.Integer, nullable=False, default=0)
+
+    rebuilt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @staticmethod
+    def status_column(status):
+        """
+        Retourne le nom de la colonne de compteur d'un statut de demande.
+
+        Args:
+            status: Code du statut (ex: 'in_progress')
+
+        Returns:
+            str: Nom de colonne, ou None si le statut n'est pas suivi
+        """
+        if status in TRACKED_REQUEST_STATUSES:
+            return f'requests_{status}'
+        return None
+
+    @staticmethod
+    def compute_values():
+        """
+        Compte les demandes, paiements et clients dans les tables sources.
+
+        Returns:
+            dict: {colonne: valeur} pour toutes les colonnes de compteurs
+        """
+        from models.request import ServiceRequest
+        from models.payment import Payment
+        from models.user import User
+
+        status_rows = db.session.execute(
+            select(ServiceRequest.status, func.count(ServiceRequest.id))
+            .group_by(ServiceRequest.status)
+        ).all()
+
+        values = {'requests_total': 0}
+        for status in TRACKED_REQUEST_STATUSES:
+            values[f'requests_{status}'] = 0
+        for status, count in status_rows:
+            values['requests_total'] += count
+            column = DashboardCounters.status_column(status)
+            if column:
+                values[column] = count
+
+        values['payments_pending'] = Payment.query.filter_by(status='pending').count()
+        values['clients_total'] = User.query.filter_by(is_admin=False).count()
+        values['rebuilt_at'] = datetime.utcnow()
+        return values
+
+    @staticmethod
+    def rebuild():
+        """
+        Recalcule tous les compteurs depuis les tables sources et les enregistre.
+
+        Utilisé à la création de la ligne (démarrage) et pour corriger une
+        éventuelle dérive (ex: modification directe en base). Valide la
+        session: ne pas appeler pendant une requête HTTP.
+
+        Returns:
+            DashboardCounters: La ligne de compteurs à jour
+        """
+        values = DashboardCounters.compute_values()
+
+        counters = db.session.get(DashboardCounters, COUNTERS_ROW_ID)
+        if counters is None:
+            counters = DashboardCounters(id=COUNTERS_ROW_ID)
+            db.session.add(counters)
+        for column, value in values.items():
+            setattr(counters, column, value)
+
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Un autre worker a créé la ligne en parallèle
+            db.session.rollback()
+            counters = db.session.get(DashboardCounters, COUNTERS_ROW_ID)
+
+        logger.info("Compteurs du dashboard reconstruits")
+        return counters
+
+    @staticmethod
+    def ensure_counters():
+        """
+        Crée la ligne de compteurs si elle n'existe pas (démarrage).
+
+        Returns:
+            DashboardCounters: La ligne de compteurs
+        """
+        counters = db.session.get(DashboardCounters, COUNTERS_ROW_ID)
+        if counters is None:
+            counters = DashboardCounters.rebuild()
+        return counters
+
+    @staticmethod
+    def get_counters():
+        """
+        Récupère la ligne de compteurs.
+
+        Si la ligne manque (créée normalement au démarrage), les compteurs
+        sont calculés depuis les tables sources sans être enregistrés.
+
+        Returns:
+            DashboardCounters: L'instance des compteurs (non enregistrée
+                si la ligne manque)
+        """
+        counters = db.session.get(DashboardCounters, COUNTERS_ROW_ID)
+        if counters is None:
+            logger.warning("Ligne des compteurs du dashboard absente: valeurs calculées")
+            counters = DashboardCounters(id=COUNTERS_ROW_ID, **DashboardCounters.compute_values())
+        return counters
+
+    def count_for_status(self, status):
+        """
+        Retourne le nombre de demandes pour un statut ('all' pour le total).
+
+        Args:
+            status: Code du statut ou 'all'
+
+        Returns:
+            int: Nombre de demandes
+        """
+        if not status or status == 'all':
+            return self.requests_total
+        column = DashboardCounters.status_column(status)
+        return getattr(self, column) if column else 0
+
+    def to_dashboard_stats(self):
+        """
+        Retourne les statistiques au format attendu par admin/dashboard.html.
+
+        Returns:
+            dict: total_requests, pending_requests, in_progress,
+                  pending_payments, total_users
+        """
+        return {
+            'total_requests': self.requests_total,
+            'pending_requests': self.requests_submitted + self.requests_under_review,
+            'in_progress': self.requests_in_progress + self.requests_revision,
+            'pending_payments': self.payments_pending,
+            'total_users': self.clients_total
+        }
+
+    def __repr__(self):
+        return f'<DashboardCounters {self.requests_total} demandes>'
+
+
+# ==============================================================================
+# MAINTENANCE INCRÉMENTALE
+# ==============================================================================
+
+def _previous_value(session, instance, attribute):
+    """
+    Retourne la valeur d'un attribut avant modification dans la session.
+
+    Si l'ancienne valeur n'était pas chargée (objet expiré après un commit),
+    elle est relue en base sur la connexion courante.
+
+    Args:
+        session: Session SQLAlchemy en cours de flush
+        instance: Objet modifié
+        attribute: Nom de l'attribut
+
+    Returns:
+        tuple: (modifié, ancienne valeur)
+    """
+    history = inspect(instance).attrs[attribute].history
+    if not history.added:
+        return False, None
+    if history.deleted:
+        return True, history.deleted[0]
+
+    model = type(instance)
+    previous = session.connection().execute(
+        select(getattr(model, attribute)).where(model.id == instance.id)
+    ).scalar()
+    return True, previous
+
+
+@event.listens_for(Session, 'before_flush')
+def _apply_counter_deltas(session, flush_context, instances):
+    """
+    Calcule les variations de compteurs du flush et les applique en base.
+
+    Les valeurs par défaut des colonnes (statut 'submitted', paiement
+    'pending', is_admin False) ne sont pas encore appliquées avant le flush:
+    une valeur None est donc interprétée comme la valeur par défaut.
+    """
+    from models.request import ServiceRequest
+    from models.payment import Payment
+    from models.user import User
+
+    deltas = {}
+
+    def bump(column, amount):
+        if column:
+            deltas[column] = deltas.get(column, 0) + amount
+
+    for instance in session.new:
+        if isinstance(instance, ServiceRequest):
+            bump('requests_total', 1)
+            bump(DashboardCounters.status_column(instance.status or 'submitted'), 1)
+        elif isinstance(instance, Payment):
+            if (instance.status or 'pending') == 'pending':
+                bump('payments_pending', 1)
+        elif isinstance(instance, User):
+            if not instance.is_admin:
+                bump('clients_total', 1)
+
+    for instance in session.dirty:
+        if isinstance(instance, ServiceRequest):
+            changed, old_status = _previous_value(session, instance, 'status')
+            if changed and old_status != instance.status:
+                bump(DashboardCounters.status_column(old_status), -1)
+                bump(DashboardCounters.status_column(instance.status), 1)
+        elif isinstance(instance, Payment):
+            changed, old_status = _previous_value(session, instance, 'status')
+            if changed and old_status != instance.status:
+                bump('payments_pending', (instance.status == 'pending') - (old_status == 'pending'))
+        elif isinstance(instance, User):
+            changed, was_admin = _previous_value(session, instance, 'is_admin')
+            if changed and bool(was_admin) != bool(instance.is_admin):
+                bump('clients_total', -1 if instance.is_admin else 1)
+
+    for instance in session.deleted:
+        if isinstance(instance, ServiceRequest):
+            bump('requests_total', -1)
+            bump(DashboardCounters.status_column(instance.status), -1)
+        elif isinstance(instance, Payment):
+            if instance.status == 'pending':
+                bump('payments_pending', -1)
+        elif isinstance(instance, User):
+            if not instance.is_admin:
+                bump('clients_total', -1)
+
+    deltas = {column: amount for column, amount in deltas.items() if amount}
+    if not deltas:
+        return
+
+    table = DashboardCounters.__table__
+    session.connection().execute(
+        update(table)
+        .where(table.c.id == COUNTERS_ROW_ID)
+        .values({
+            column: table.c[column] + amount
+            for column, amount in deltas.items()
+        })
+    )
@@ -0,0 +1,381 @@
+"""
+================================================================================
+TheDraftClinic - Modèle Fichiers Stockés (références)
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module définit le modèle FileBlob qui compte les références vers chaque
+fichier du dossier d'uploads.
+
+Stockage adressé par contenu:
+    Les fichiers uploadés sont nommés d'après l'empreinte SHA-256 de leur
+    contenu (voir services.file_service): un même brouillon envoyé à chaque
+    révision n'est stocké qu'une fois par dossier. Plusieurs lignes
+    (Document, RevisionAttachment, Payment.proof_document, fichiers de
+    branding de SiteSettings) peuvent donc désigner le même fichier.
+
+Comptage des références:
+    Comme pour les compteurs du dashboard, un listener 'before_flush'
+    calcule les variations de références (insertions, changements de nom
+    de fichier, suppressions) et les applique en base dans la même
+    transaction. Après le commit, les fichiers dont le compteur est tombé
+    à zéro sont supprimés du disque.
+
+    Un fichier libéré pendant son délai de grâce (upload puis suppression
+    en moins d'une minute, logo remplacé aussitôt) garde une ligne à zéro:
+    sweep_unreferenced_files reprend ces lignes, au plus une fois par
+    SWEEP_INTERVAL après un commit qui libère des fichiers, et à chaque
+    lancement de rebuild_file_refs.py.
+================================================================================
+"""
+
+from app import db
+from datetime import datetime
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.orm import Session
+import os
+import time
+import logging
+
+from models.dashboard_counter import _previous_value
+
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Colonnes référençant un fichier: (modèle, attribut, sous-dossier d'uploads)
+FILE_REFERENCES = (
+    ('Document', 'filename', ''),
+    ('RevisionAttachment', 'filename', 'revisions'),
+    ('Payment', 'proof_document', ''),
+    ('SiteSettings', 'logo_filename', 'branding'),
+    ('SiteSettings', 'favicon_filename', 'branding'),
+    ('SiteSettings', 'og_image_filename', 'branding'),
+)
+
+# Un fichier écrit il y a moins de RELEASE_GRACE_SECONDS n'est jamais
+# supprimé: il peut appartenir à un upload identique en cours de commit
+RELEASE_GRACE_SECONDS = 60
+
+# Intervalle minimum (secondes) entre deux balayages des lignes à zéro
+SWEEP_INTERVAL = 3600
+
+# Clé de session.info des fichiers à libérer après le commit
+_RELEASE_KEY = 'file_blobs_to_release'
+
+# Prochain balayage des lignes à zéro (horloge monotone, par processus)
+_next_sweep = 0.0
+
+
+def get_reference_columns():
+    """
+    Retourne les colonnes référençant un fichier.
+
+    Returns:
+        list: Tuples (modèle, attribut, sous-dossier d'uploads)
+    """
+    from models.document import Document
+    from models.revision_request import RevisionAttachment
+    from models.payment import Payment
+    from models.site_settings import SiteSettings
+
+    models = {
+        'Document': Document,
+        'RevisionAttachment': RevisionAttachment,
+        'Payment': Payment,
+        'SiteSettings': SiteSettings
+    }
+    return [(models[name], attribute, folder) for name, attribute, folder in FILE_REFERENCES]
+
+
+def blob_path(folder, filename):
+    """
+    Construit le chemin d'un fichier relatif au dossier d'uploads.
+
+    Args:
+        folder (str): Sous-dossier ('' pour la racine)
+        filename (str): Nom du fichier
+
+    Returns:
+        str: Chemin relatif (ex: 'branding/ab12...png')
+    """
+    return f'{folder}/{filename}' if folder else filename
+
+
+class FileBlob(db.Model):
+    """
+    Modèle représentant un fichier stocké et son nombre de références.
+
+    Attributes:
+        path (str): Chemin du fichier relatif au dossier d'uploads
+        ref_count (int): Nombre de lignes qui référencent le fichier
+    """
+
+    __tablename__ = 'file_blobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    path = db.Column(db.String(300), nullable=False, unique=True)
+
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @staticmethod
+    def get_ref_count(path):
+        """
+        Retourne le nombre de références d'un fichier.
+
+        Args:
+            path (str): Chemin relatif au dossier d'uploads
+
+        Returns:
+            int: Nombre de références, ou None si le fichier n'est pas suivi
+        """
+        return db.session.execute(
+            select(FileBlob.ref_count).where(FileBlob.path == path)
+        ).scalar()
+
+    @staticmethod
+    def rebuild():
+        """
+        Recalcule les références de tous les fichiers depuis les tables.
+
+        Utilisé pour prendre en charge les fichiers uploadés avant le
+        comptage des références, ou pour corriger une dérive.
+
+        Returns:
+            int: Nombre de fichiers référencés
+        """
+        counts = {}
+        for model, attribute, folder in get_reference_columns():
+            column = getattr(model, attribute)
+            for (filename,) in db.session.execute(select(column).where(column.isnot(None))):
+                if filename:
+                    path = blob_path(folder, filename)
+                    counts[path] = counts.get(path, 0) + 1
+
+        db.session.execute(update(FileBlob).values(ref_count=0))
+        existing = set(db.session.execute(select(FileBlob.path)).scalars())
+        for path, count in counts.items():
+            if path in existing:
+                db.session.execute(
+                    update(FileBlob).where(FileBlob.path == path).values(ref_count=count)
+                )
+            else:
+                db.session.add(FileBlob(path=path, ref_count=count))
+        db.session.commit()
+
+        logger.info(f"Références de fichiers reconstruites: {len(counts)} fichiers")
+        return len(counts)
+
+    def __repr__(self):
+        return f'<FileBlob {self.path} ({self.ref_count})>'
+
+
+# ==============================================================================
+# MAINTENANCE DES RÉFÉRENCES
+# ==============================================================================
+
+def _reference_deltas(session):
+    """
+    Calcule les variations de références des objets de la session.
+
+    Args:
+        session: Session SQLAlchemy en cours de flush
+
+    Returns:
+        dict: {chemin relatif: variation}
+    """
+    deltas = {}
+
+    def bump(folder, filename, amount):
+        if filename:
+            path = blob_path(folder, filename)
+            deltas[path] = deltas.get(path, 0) + amount
+
+    for model, attribute, folder in get_reference_columns():
+        for instance in session.new:
+            if isinstance(instance, model):
+                bump(folder, getattr(instance, attribute), 1)
+
+        for instance in session.dirty:
+            if isinstance(instance, model):
+                changed, old_filename = _previous_value(session, instance, attribute)
+                new_filename = getattr(instance, attribute)
+                if changed and old_filename != new_filename:
+                    bump(folder, old_filename, -1)
+                    bump(folder, new_filename, 1)
+
+        for instance in session.deleted:
+            if isinstance(instance, model):
+                bump(folder, getattr(instance, attribute), -1)
+
+    return {path: amount for path, amount in deltas.items() if amount}
+
+
+def _upsert_reference(connection, path, amount):
+    """
+    Ajoute une variation au compteur d'un fichier (création si absent).
+
+    Args:
+        connection: Connexion de la transaction en cours
+        path (str): Chemin relatif du fichier
+        amount (int): Variation du nombre de références
+    """
+    table = FileBlob.__table__
+    now = datetime.utcnow()
+
+    dialect = connection.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        connection.execute(
+            insert(table)
+            .values(path=path, ref_count=max(amount, 0), created_at=now, updated_at=now)
+            .on_conflict_do_update(
+                index_elements=[table.c.path],
+                set_={'ref_count': table.c.ref_count + amount, 'updated_at': now}
+            )
+        )
+        return
+
+    result = connection.execute(
+        update(table).where(table.c.path == path)
+        .values(ref_count=table.c.ref_count + amount, updated_at=now)
+    )
+    if result.rowcount == 0 and amount > 0:
+        connection.execute(
+            table.insert().values(path=path, ref_count=amount, created_at=now, updated_at=now)
+        )
+
+
+@event.listens_for(Session, 'before_flush')
+def _apply_reference_deltas(session, flush_context, instances):
+    """
+    Applique les variations de références du flush en base.
+
+    Les fichiers qui ne sont plus référencés sont mémorisés pour être
+    supprimés après le commit.
+    """
+    deltas = _reference_deltas(session)
+    if not deltas:
+        return
+
+    connection = session.connection()
+    for path, amount in deltas.items():
+        _upsert_reference(connection, path, amount)
+        if amount < 0:
+            session.info.setdefault(_RELEASE_KEY, set()).add(path)
+
+
+@event.listens_for(Session, 'after_commit')
+def _release_unreferenced_files(session):
+    """Supprime du disque les fichiers libérés par la transaction validée."""
+    global _next_sweep
+
+    paths = session.info.pop(_RELEASE_KEY, None)
+    if not paths:
+        return
+    release_files(paths)
+
+    # Fichiers conservés lors d'une libération précédente (délai de grâce)
+    if time.monotonic() >= _next_sweep:
+        _next_sweep = time.monotonic() + SWEEP_INTERVAL
+        try:
+            sweep_unreferenced_files()
+        except Exception as e:
+            logger.error(f"Erreur balayage des fichiers sans référence: {e}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_released_files(session):
+    """Oublie les fichiers à libérer d'une transaction annulée."""
+    session.info.pop(_RELEASE_KEY, None)
+
+
+def release_files(paths, upload_folder=None):
+    """
+    Supprime les fichiers qui n'ont plus aucune référence.
+
+    La ligne de comptage n'est supprimée (puis le fichier effacé) que si
+    son compteur est toujours nul dans une transaction distincte. Un
+    fichier écrit depuis moins de RELEASE_GRACE_SECONDS est conservé avec
+    un compteur nul.
+
+    Args:
+        paths: Chemins relatifs au dossier d'uploads
+        upload_folder (str): Dossier d'uploads (défaut: UPLOAD_FOLDER)
+
+    Returns:
+        int: Nombre de fichiers supprimés du disque
+    """
+    from flask import current_app
+
+    if upload_folder is None:
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+
+    table = FileBlob.__table__
+    removed = 0
+    for path in paths:
+        file_path = os.path.join(upload_folder, path)
+        try:
+            if time.time() - os.path.getmtime(file_path) < RELEASE_GRACE_SECONDS:
+                continue
+        except OSError:
+            pass
+
+        with db.engine.begin() as connection:
+            released = connection.execute(
+                delete(table).where(table.c.path == path, table.c.ref_count <= 0)
+            ).rowcount
+        if not released:
+            continue
+
+        try:
+            os.remove(file_path)
+            removed += 1
+            logger.info(f"Fichier sans référence supprimé: {path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Erreur suppression du fichier {path}: {e}")
+
+    return removed
+
+
+def sweep_unreferenced_files(upload_folder=None):
+    """
+    Supprime les fichiers dont le compteur de références est resté nul.
+
+    Reprend les lignes à zéro que release_files a conservées pendant le
+    délai de grâce; les fichiers écrits depuis moins de
+    RELEASE_GRACE_SECONDS sont de nouveau conservés.
+
+    Args:
+        upload_folder (str): Dossier d'uploads (défaut: UPLOAD_FOLDER)
+
+    Returns:
+        int: Nombre de fichiers supprimés du disque
+    """
+    table = FileBlob.__table__
+    with db.engine.connect() as connection:
+        paths = connection.execute(
+            select(table.c.path).where(table.c.ref_count <= 0)
+        ).scalars().all()
+    if not paths:
+        return 0
+
+    removed = release_files(paths, upload_folder)
+    logger.info(f"Balayage des fichiers sans référence: {removed}/{len(paths)} supprimés")
+    return removed
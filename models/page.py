@@ -10,6 +10,9 @@ Website: www.myoneart.com
 
 Ce module définit le modèle Page pour les pages de contenu dynamique.
 Permet de créer des pages comme CGU, CGV, Politique de confidentialité, etc.
+
+Le HTML rendu (et la table des matières des pages Markdown) est calculé à
+l'enregistrement et stocké avec la page (voir services.page_renderer).
 ================================================================================
 """
 
@@ -46,6 +49,12 @@ class Page(db.Model):
     
     content_format = db.Column(db.String(20), default='html')
     
+    # Rendu HTML du contenu et table des matières (Markdown), recalculés
+    # par render_content() à chaque enregistrement. Chargés ensemble et
+    # seulement à la demande (lus via le cache des rendus)
+    rendered_html = db.deferred(db.Column(db.Text), group='rendered')
+    rendered_toc = db.deferred(db.Column(db.Text), group='rendered')
+    
     meta_title = db.Column(db.String(70))
     meta_description = db.Column(db.String(160))
     
@@ -102,6 +111,43 @@ class Page(db.Model):
         slug = slug.strip('-')
         return slug
     
+    def render_content(self):
+        """
+        Calcule et stocke le rendu HTML du contenu.
+        
+        À appeler avant chaque enregistrement du contenu (création, édition).
+        """
+        from services.page_renderer import render_page_content
+        self.rendered_html, self.rendered_toc = render_page_content(
+            self.content, self.content_format
+        )
+    
+    def _get_render(self):
+        """
+        Retourne le rendu de la version courante de la page.
+        
+        Le rendu est lu dans le cache LRU du processus, sinon dans les
+        colonnes stockées (une requête si elles n'ont pas été chargées).
+        Une page enregistrée avant le stockage du rendu est convertie à la
+        volée (sans écriture).
+        
+        Returns:
+            tuple: (html, toc)
+        """
+        from services.page_renderer import get_cached_render, cache_render, render_page_content
+        
+        key = (self.id, self.updated_at)
+        rendered = get_cached_render(key)
+        if rendered is not None:
+            return rendered
+        
+        if self.rendered_html is not None:
+            rendered = (self.rendered_html, self.rendered_toc)
+        else:
+            rendered = render_page_content(self.content, self.content_format)
+        cache_render(key, rendered)
+        return rendered
+    
     def get_rendered_content(self):
         """
         Retourne le contenu rendu (HTML ou Markdown converti).
@@ -109,17 +155,16 @@ class Page(db.Model):
         Returns:
             str: Le contenu HTML
         """
-        if self.content_format == 'markdown':
-            try:
-                import markdown
-                return markdown.markdown(
-                    self.content or '',
-                    extensions=['tables', 'fenced_code', 'toc']
-                )
-            except ImportError:
-                logger.warning("Module markdown non installé, retour au contenu brut")
-                return self.content or ''
-        return self.content or ''
+        return self._get_render()[0]
+    
+    def get_toc(self):
+        """
+        Retourne la table des matières d'une page Markdown.
+        
+        Returns:
+            str: HTML de la table des matières, ou None
+        """
+        return self._get_render()[1]
     
     def get_type_display(self):
         """Retourne le libellé du type de page."""
@@ -59,6 +59,13 @@ class Payment(db.Model):
     # Nom de la table dans la base de données
     __tablename__ = 'payments'
     
+    # Index composites pour la pagination par curseur (created_at, id),
+    # avec ou sans filtre de statut
+    __table_args__ = (
+        db.Index('ix_payments_created_at_id', 'created_at', 'id'),
+        db.Index('ix_payments_status_created_at_id', 'status', 'created_at', 'id'),
+    )
+    
     # --------------------------------------------------------------------------
     # CLÉS
     # --------------------------------------------------------------------------
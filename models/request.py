@@ -65,6 +65,13 @@ class ServiceRequest(db.Model):
     # Nom de la table dans la base de données
     __tablename__ = 'service_requests'
     
+    # Index composites pour la pagination par curseur (created_at, id),
+    # avec ou sans filtre de statut
+    __table_args__ = (
+        db.Index('ix_service_requests_created_at_id', 'created_at', 'id'),
+        db.Index('ix_service_requests_status_created_at_id', 'status', 'created_at', 'id'),
+    )
+    
     # --------------------------------------------------------------------------
     # CLÉS
     # --------------------------------------------------------------------------
@@ -254,19 +261,20 @@ class ServiceRequest(db.Model):
     # RELATIONS
     # --------------------------------------------------------------------------
     
-    # Documents associés à cette demande
+    # Documents associés à cette demande (chargeables avec selectinload,
+    # voir load_detail)
     documents = db.relationship(
         'Document',
         backref='request',
-        lazy='dynamic',
+        order_by='Document.id',
         doc="Documents uploadés pour cette demande"
     )
     
-    # Paiements pour cette demande
+    # Paiements pour cette demande, du plus récent au plus ancien
     payments = db.relationship(
         'Payment',
         backref='request',
-        lazy='dynamic',
+        order_by='Payment.created_at.desc()',
         doc="Paiements effectués pour cette demande"
     )
     
@@ -312,6 +320,48 @@ class ServiceRequest(db.Model):
         ('other', 'Autre service')
     ]
     
+    # --------------------------------------------------------------------------
+    # CHARGEMENT
+    # --------------------------------------------------------------------------
+    
+    @staticmethod
+    def load_detail(request_id, user_id=None):
+        """
+        Charge une demande avec tout ce qu'affichent ses pages de détail.
+        
+        Le nombre de requêtes SQL est fixe, quel que soit le nombre de
+        documents, paiements ou entrées d'historique:
+        1. la demande et son client (jointure)
+        2. les documents (selectinload)
+        3. les paiements (selectinload)
+        4. l'historique et ses auteurs (selectinload + jointure)
+        
+        Args:
+            request_id (int): ID de la demande
+            user_id (int): Propriétaire exigé (pages client), None pour l'admin
+            
+        Returns:
+            ServiceRequest: La demande et ses relations déjà chargées
+            
+        Raises:
+            404: Si la demande n'existe pas (ou n'appartient pas au client)
+        """
+        from sqlalchemy.orm import joinedload, selectinload
+        from models.activity_log import ActivityLog
+        
+        query = ServiceRequest.query.options(
+            joinedload(ServiceRequest.user),
+            selectinload(ServiceRequest.documents),
+            selectinload(ServiceRequest.payments),
+            # La demande de chaque entrée est déjà en mémoire (identity map)
+            selectinload(ServiceRequest.activity_logs).joinedload(ActivityLog.user)
+        ).filter(ServiceRequest.id == request_id)
+        
+        if user_id is not None:
+            query = query.filter(ServiceRequest.user_id == user_id)
+        
+        return query.first_or_404()
+    
     # --------------------------------------------------------------------------
     # MÉTHODES D'AFFICHAGE
     # --------------------------------------------------------------------------
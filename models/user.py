@@ -75,6 +75,11 @@ class User(UserMixin, db.Model):
     # Nom de la table dans la base de données
     __tablename__ = 'users'
     
+    # Index composite pour la pagination par curseur de la liste des clients
+    __table_args__ = (
+        db.Index('ix_users_is_admin_created_at_id', 'is_admin', 'created_at', 'id'),
+    )
+    
     # --------------------------------------------------------------------------
     # COLONNES DE LA TABLE
     # --------------------------------------------------------------------------
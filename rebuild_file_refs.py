@@ -0,0 +1,90 @@
+"""
+================================================================================
+TheDraftClinic - File Reference Rebuild Script
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+This script recounts, from the tables, how many rows reference each
+uploaded file (file_blobs):
+    - documents.filename
+    - revision_attachments.filename
+    - payments.proof_document
+    - site_settings logo / favicon / OpenGraph image
+
+Files uploaded before reference counting have no file_blobs row: they
+are kept on disk until their references are known. Run this script once
+after upgrading (migrate_uploads.py also runs the recount), and again to
+fix any drift after rows were edited directly in the database.
+
+It then deletes the files whose count is zero, including those kept by
+the release grace period (a file uploaded and deleted within a minute):
+files written in the last RELEASE_GRACE_SECONDS are still kept.
+
+Usage:
+    python rebuild_file_refs.py
+    python rebuild_file_refs.py --no-sweep    # Recount only, delete nothing
+================================================================================
+"""
+
+import sys
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def run(args):
+    """
+    Recount the references of every stored file.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    print("=" * 60)
+    print("TheDraftClinic - File Reference Rebuild")
+    print("=" * 60)
+    print()
+
+    try:
+        from app import create_app
+        from models.file_blob import FileBlob, sweep_unreferenced_files
+
+        app = create_app()
+
+        with app.app_context():
+            print("[*] Rebuilding file references...")
+            print(f"      ✓ {FileBlob.rebuild()} files referenced")
+
+            if not args.no_sweep:
+                print("[*] Deleting unreferenced files...")
+                print(f"      ✓ {sweep_unreferenced_files()} files deleted")
+
+        print()
+        print("=" * 60)
+        print("File reference rebuild completed successfully!")
+        print("=" * 60)
+        return True
+
+    except Exception as e:
+        print(f"ERROR: File reference rebuild failed!")
+        print(f"Details: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Recount the references of every uploaded file (file_blobs)')
+    parser.add_argument('--no-sweep', action='store_true',
+                        help='Recount only, do not delete unreferenced files')
+    args = parser.parse_args()
+
+    success = run(args)
+    sys.exit(0 if success else 1)
@@ -43,11 +43,18 @@ from models.payment import Payment
 from models.activity_log import ActivityLog
 from models.deadline_extension import DeadlineExtension
 from models.revision_request import RevisionRequest
-from services.file_service import save_uploaded_file
+from models.dashboard_counter import DashboardCounters
+from services.file_service import stream_uploaded_file
+from utils.pagination import keyset_paginate
+from utils.query_budget import query_budget
 
 # Configuration du logger pour ce module
 logger = logging.getLogger(__name__)
 
+# Plafond de requêtes SQL de la page de détail d'une demande
+# (voir ServiceRequest.load_detail: demande, documents, paiements, historique)
+DETAIL_PAGE_QUERY_BUDGET = 4
+
 # Création du blueprint admin
 bp = Blueprint('admin', __name__)
 
@@ -106,38 +113,21 @@ def dashboard():
         Template dashboard admin
     """
     try:
-        # Calcul des statistiques
-        total_requests = ServiceRequest.query.count()
-        pending_requests = ServiceRequest.query.filter(
-            ServiceRequest.status.in_(['submitted', 'under_review'])
-        ).count()
-        in_progress = ServiceRequest.query.filter(
-            ServiceRequest.status.in_(['in_progress', 'revision'])
-        ).count()
-        pending_payments = Payment.query.filter_by(status='pending').count()
-        total_users = User.query.filter_by(is_admin=False).count()
+        # Statistiques lues depuis la table de compteurs matérialisés
+        stats = DashboardCounters.get_counters().to_dashboard_stats()
         
         # Demandes récentes
         recent_requests = ServiceRequest.query.order_by(
             ServiceRequest.created_at.desc()
         ).limit(10).all()
         
-        # Paiements en attente
+        # Paiements en attente (le template n'en affiche que 6)
         pending_payment_verifications = Payment.query.filter_by(
             status='pending'
-        ).order_by(Payment.created_at.desc()).all()
-        
-        stats = {
-            'total_requests': total_requests,
-            'pending_requests': pending_requests,
-            'in_progress': in_progress,
-            'pending_payments': pending_payments,
-            'total_users': total_users
-        }
-        
-        recent_activities = ActivityLog.query.order_by(
-            ActivityLog.created_at.desc()
-        ).limit(10).all()
+        ).order_by(Payment.created_at.desc()).limit(6).all()
+        
+        # Activité récente (projection réduite: entrée et nom de l'auteur)
+        recent_activities = ActivityLog.recent(10)
         
         return render_template(
             'admin/dashboard.html', 
@@ -166,6 +156,8 @@ def requests_list():
     
     Query params:
         status: Filtre par statut (optionnel)
+        per_page: Taille de page (optionnel)
+        after / before: Curseurs de pagination (optionnels)
         
     Returns:
         Template liste des demandes
@@ -179,15 +171,20 @@ def requests_list():
         if status_filter != 'all':
             query = query.filter_by(status=status_filter)
         
-        # Exécution avec tri
-        requests_list = query.order_by(ServiceRequest.created_at.desc()).all()
+        # Exécution paginée par curseur (created_at, id)
+        page = keyset_paginate(query, ServiceRequest)
+        
+        # Total lu depuis les compteurs matérialisés
+        total_count = DashboardCounters.get_counters().count_for_status(status_filter)
         
         # Liste des statuts pour le filtre
         statuses = ServiceRequest.STATUS_CHOICES
         
         return render_template(
             'admin/requests_list.html', 
-            requests=requests_list, 
+            requests=page.items, 
+            page=page,
+            total_count=total_count,
             statuses=statuses,
             current_filter=status_filter
         )
@@ -205,6 +202,7 @@ def requests_list():
 @bp.route('/request/<int:request_id>')
 @login_required
 @admin_required
+@query_budget(DETAIL_PAGE_QUERY_BUDGET)
 def view_request(request_id):
     """
     Affiche les détails complets d'une demande pour l'admin.
@@ -222,17 +220,14 @@ def view_request(request_id):
         Template détail demande admin
     """
     try:
-        service_request = ServiceRequest.query.get_or_404(request_id)
-        documents = Document.query.filter_by(request_id=request_id).all()
-        payments = Payment.query.filter_by(request_id=request_id).order_by(
-            Payment.created_at.desc()
-        ).all()
+        # Demande, client, documents, paiements et historique en 4 requêtes
+        service_request = ServiceRequest.load_detail(request_id)
         
         return render_template(
             'admin/view_request.html', 
             request=service_request, 
-            documents=documents,
-            payments=payments
+            documents=service_request.documents,
+            payments=service_request.payments
         )
         
     except Exception as e:
@@ -396,18 +391,19 @@ def upload_deliverable(request_id):
         if 'deliverable' in request.files:
             file = request.files['deliverable']
             if file and file.filename:
-                saved_filename = save_uploaded_file(
+                stored = stream_uploaded_file(
                     file, 
                     current_app.config['UPLOAD_FOLDER']
                 )
-                if saved_filename:
+                if stored:
                     delivery_comment = request.form.get('delivery_comment', '').strip()
                     
                     doc = Document(
                         request_id=request_id,
-                        filename=saved_filename,
+                        filename=stored.filename,
                         original_filename=file.filename,
                         file_type=file.content_type,
+                        file_size=stored.size,
                         document_type='deliverable',
                         description=delivery_comment,
                         uploaded_by=current_user.id
@@ -512,15 +508,23 @@ def users_list():
     """
     Affiche la liste de tous les utilisateurs (clients).
     
+    Query params:
+        per_page: Taille de page (optionnel)
+        after / before: Curseurs de pagination (optionnels)
+    
     Returns:
         Template liste utilisateurs
     """
     try:
-        users = User.query.filter_by(is_admin=False).order_by(
-            User.created_at.desc()
-        ).all()
+        page = keyset_paginate(User.query.filter_by(is_admin=False), User)
+        total_count = DashboardCounters.get_counters().clients_total
         
-        return render_template('admin/users_list.html', users=users)
+        return render_template(
+            'admin/users_list.html',
+            users=page.items,
+            page=page,
+            total_count=total_count
+        )
         
     except Exception as e:
         logger.error(f"Erreur liste utilisateurs: {e}")
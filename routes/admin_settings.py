@@ -12,6 +12,7 @@ Routes pour la gestion des paramètres du site:
 - Informations légales
 - Gestion des pages dynamiques
 - Statistiques
+- Performance (mesures SQL par endpoint)
 ================================================================================
 """
 
@@ -32,6 +33,16 @@ from models.request import ServiceRequest
 from models.activity_log import ActivityLog
 from models.user import User
 from services.file_service import save_uploaded_file
+from services.stats_service import compute_request_statistics
+from services.site_cache import bump_cache_version
+from services.sql_instrumentation import (
+    get_sql_stats, reset_sql_stats, is_sql_instrumentation_enabled
+)
+from services.perf_metrics import (
+    get_perf_stats, reset_perf_stats, is_perf_metrics_enabled
+)
+from services.activity_log_writer import get_activity_log_stats
+from utils.pagination import keyset_paginate
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +88,7 @@ def settings_general():
         settings.currency = request.form.get('currency', 'EUR')
         
         db.session.commit()
+        bump_cache_version()
         flash('Paramètres généraux mis à jour.', 'success')
         return redirect(url_for('admin_settings.settings'))
     
@@ -112,6 +124,7 @@ def settings_branding():
                     settings.favicon_filename = favicon_filename
         
         db.session.commit()
+        bump_cache_version()
         flash('Branding mis à jour.', 'success')
         return redirect(url_for('admin_settings.settings'))
     
@@ -149,6 +162,7 @@ def settings_seo():
                     settings.og_image_filename = og_image_filename
         
         db.session.commit()
+        bump_cache_version()
         flash('Paramètres SEO mis à jour.', 'success')
         return redirect(url_for('admin_settings.settings'))
     
@@ -182,6 +196,7 @@ def settings_legal():
         settings.dpo_email = request.form.get('dpo_email', '')
         
         db.session.commit()
+        bump_cache_version()
         flash('Informations légales mises à jour.', 'success')
         return redirect(url_for('admin_settings.settings'))
     
@@ -208,6 +223,7 @@ def settings_advanced():
         settings.maintenance_message = request.form.get('maintenance_message', '')
         
         db.session.commit()
+        bump_cache_version()
         flash('Paramètres avancés mis à jour.', 'success')
         return redirect(url_for('admin_settings.settings'))
     
@@ -251,9 +267,11 @@ def page_new():
             page_type=request.form.get('page_type', 'custom'),
             created_by=current_user.id
         )
+        page.render_content()
         
         db.session.add(page)
         db.session.commit()
+        bump_cache_version()
         
         flash('Page créée avec succès.', 'success')
         return redirect(url_for('admin_settings.pages_list'))
@@ -281,6 +299,7 @@ def page_edit(page_id):
         
         page.content = request.form.get('content', '')
         page.content_format = request.form.get('content_format', 'html')
+        page.render_content()
         page.meta_title = request.form.get('meta_title', '')
         page.meta_description = request.form.get('meta_description', '')
         page.is_published = 'is_published' in request.form
@@ -290,6 +309,7 @@ def page_edit(page_id):
         page.page_type = request.form.get('page_type', 'custom')
         
         db.session.commit()
+        bump_cache_version()
         
         flash('Page mise à jour.', 'success')
         return redirect(url_for('admin_settings.pages_list'))
@@ -305,6 +325,7 @@ def page_delete(page_id):
     page = Page.query.get_or_404(page_id)
     db.session.delete(page)
     db.session.commit()
+    bump_cache_version()
     
     flash('Page supprimée.', 'success')
     return redirect(url_for('admin_settings.pages_list'))
@@ -315,59 +336,9 @@ def page_delete(page_id):
 @admin_required
 def statistics():
     """Affiche la page de statistiques et traçabilité."""
-    now = datetime.utcnow()
-    thirty_days_ago = now - timedelta(days=30)
-    
-    total_requests = ServiceRequest.query.count()
-    total_users = User.query.filter_by(is_admin=False).count()
-    
-    completed_requests = ServiceRequest.query.filter(
-        ServiceRequest.status.in_(['completed', 'delivered'])
-    ).all()
-    
-    on_time_deliveries = 0
-    late_deliveries = 0
-    delivery_times = []
-    
-    for req in completed_requests:
-        if req.delivered_at and req.deadline:
-            if req.delivered_at <= req.deadline:
-                on_time_deliveries += 1
-            else:
-                late_deliveries += 1
-            
-            if req.created_at:
-                delta = (req.delivered_at - req.created_at).days
-                delivery_times.append(delta)
-    
-    avg_delivery_time = sum(delivery_times) / len(delivery_times) if delivery_times else 0
-    
-    requests_by_status = {}
-    for status_code, status_label in ServiceRequest.STATUS_CHOICES:
-        count = ServiceRequest.query.filter_by(status=status_code).count()
-        requests_by_status[status_label] = count
-    
-    requests_by_service = {}
-    for service_code, service_label in ServiceRequest.SERVICE_TYPES:
-        count = ServiceRequest.query.filter_by(service_type=service_code).count()
-        if count > 0:
-            requests_by_service[service_label] = count
-    
-    recent_activities = ActivityLog.query.order_by(
-        ActivityLog.created_at.desc()
-    ).limit(50).all()
-    
-    stats = {
-        'total_requests': total_requests,
-        'total_users': total_users,
-        'completed_requests': len(completed_requests),
-        'on_time_deliveries': on_time_deliveries,
-        'late_deliveries': late_deliveries,
-        'on_time_rate': (on_time_deliveries / (on_time_deliveries + late_deliveries) * 100) if (on_time_deliveries + late_deliveries) > 0 else 0,
-        'avg_delivery_time': round(avg_delivery_time, 1),
-        'requests_by_status': requests_by_status,
-        'requests_by_service': requests_by_service
-    }
+    stats = compute_request_statistics()
+    
+    recent_activities = ActivityLog.recent(50)
     
     return render_template(
         'admin/stats.html', 
@@ -376,6 +347,32 @@ def statistics():
     )
 
 
+@bp.route('/perf')
+@login_required
+@admin_required
+def performance():
+    """Affiche la latence (tous workers), les mesures SQL et la file du journal (worker courant)."""
+    return render_template(
+        'admin/perf.html',
+        enabled=is_sql_instrumentation_enabled(),
+        sql_stats=get_sql_stats(),
+        perf_enabled=is_perf_metrics_enabled(),
+        perf_stats=get_perf_stats(),
+        activity_log_stats=get_activity_log_stats()
+    )
+
+
+@bp.route('/perf/reset', methods=['POST'])
+@login_required
+@admin_required
+def performance_reset():
+    """Vide les histogrammes de latence et l'historique SQL du worker courant."""
+    reset_sql_stats()
+    reset_perf_stats()
+    flash('Mesures réinitialisées.', 'success')
+    return redirect(url_for('admin_settings.performance'))
+
+
 # ==============================================================================
 # GESTION DES PAIEMENTS
 # ==============================================================================
@@ -384,7 +381,7 @@ def statistics():
 @login_required
 @admin_required
 def payments_list():
-    """Liste tous les paiements avec filtrage par statut."""
+    """Liste les paiements (paginés par curseur) avec filtrage par statut."""
     from models.payment import Payment
     
     status_filter = request.args.get('status', 'all')
@@ -397,7 +394,7 @@ def payments_list():
     elif status_filter == 'rejected':
         query = query.filter_by(status='rejected')
     
-    payments = query.order_by(Payment.created_at.desc()).all()
+    page = keyset_paginate(query, Payment)
     
     pending_count = Payment.query.filter_by(status='pending').count()
     verified_count = Payment.query.filter_by(status='verified').count()
@@ -405,7 +402,8 @@ def payments_list():
     
     return render_template(
         'admin/payments/list.html',
-        payments=payments,
+        payments=page.items,
+        page=page,
         current_filter=status_filter,
         pending_count=pending_count,
         verified_count=verified_count,
@@ -44,11 +44,19 @@ from models.activity_log import ActivityLog
 from models.deadline_extension import DeadlineExtension
 from models.revision_request import RevisionRequest, RevisionAttachment
 from utils.forms import ServiceRequestForm, PaymentProofForm
-from services.file_service import save_uploaded_file
+from utils.query_budget import query_budget
+from services.file_service import (
+    save_uploaded_file, stream_uploaded_file, resolve_upload,
+    send_upload, is_resumed_download
+)
 
 # Configuration du logger pour ce module
 logger = logging.getLogger(__name__)
 
+# Plafond de requêtes SQL de la page de détail d'une demande
+# (voir ServiceRequest.load_detail: demande, documents, paiements, historique)
+DETAIL_PAGE_QUERY_BUDGET = 4
+
 # Création du blueprint client
 bp = Blueprint('client', __name__)
 
@@ -177,16 +185,17 @@ def new_request():
             if form.documents.data:
                 for file in request.files.getlist('documents'):
                     if file and file.filename:
-                        saved_filename = save_uploaded_file(
+                        stored = stream_uploaded_file(
                             file, 
                             current_app.config['UPLOAD_FOLDER']
                         )
-                        if saved_filename:
+                        if stored:
                             doc = Document(
                                 request_id=service_request.id,
-                                filename=saved_filename,
+                                filename=stored.filename,
                                 original_filename=file.filename,
                                 file_type=file.content_type,
+                                file_size=stored.size,
                                 document_type='client_upload',
                                 uploaded_by=current_user.id
                             )
@@ -223,6 +232,7 @@ def new_request():
 @bp.route('/request/<int:request_id>')
 @login_required
 @client_required
+@query_budget(DETAIL_PAGE_QUERY_BUDGET)
 def view_request(request_id):
     """
     Affiche les détails d'une demande spécifique.
@@ -239,17 +249,9 @@ def view_request(request_id):
         404: Si la demande n'existe pas ou n'appartient pas au client
     """
     try:
-        # Récupération de la demande avec vérification du propriétaire
-        service_request = ServiceRequest.query.filter_by(
-            id=request_id, 
-            user_id=current_user.id
-        ).first_or_404()
-        
-        # Récupération des documents et paiements associés
-        documents = Document.query.filter_by(request_id=request_id).all()
-        payments = Payment.query.filter_by(request_id=request_id).order_by(
-            Payment.created_at.desc()
-        ).all()
+        # Demande (avec vérification du propriétaire), documents, paiements
+        # et historique en un nombre fixe de requêtes
+        service_request = ServiceRequest.load_detail(request_id, user_id=current_user.id)
         
         # Formulaire de paiement pour soumission d'acompte
         payment_form = PaymentProofForm()
@@ -257,8 +259,8 @@ def view_request(request_id):
         return render_template(
             'client/view_request.html', 
             request=service_request, 
-            documents=documents, 
-            payments=payments,
+            documents=service_request.documents, 
+            payments=service_request.payments,
             payment_form=payment_form
         )
         
@@ -428,8 +430,6 @@ def profile():
 @client_required
 def download_document(request_id, document_id):
     """Télécharge un document et enregistre l'action dans l'historique."""
-    from flask import send_from_directory
-    
     try:
         service_request = ServiceRequest.query.filter_by(
             id=request_id, 
@@ -441,23 +441,27 @@ def download_document(request_id, document_id):
             request_id=request_id
         ).first_or_404()
         
-        ActivityLog.log_action(
-            request_id=request_id,
-            user_id=current_user.id,
-            action_type='download',
-            title='Document téléchargé',
-            description=f"Le client a téléchargé: {document.original_filename}",
-            metadata={'document_id': document_id, 'filename': document.original_filename},
-            visible_to_client=True
-        )
-        db.session.commit()
+        # Emplacement réel du fichier (réparti ou ancien fichier à plat)
+        stored_path = resolve_upload(document.filename, current_app.config['UPLOAD_FOLDER'])
+        if stored_path is None:
+            logger.error(f"Fichier introuvable pour le document {document_id}: {document.filename}")
+            flash('Fichier introuvable.', 'error')
+            return redirect(url_for('client.view_request', request_id=request_id))
         
-        return send_from_directory(
-            current_app.config['UPLOAD_FOLDER'],
-            document.filename,
-            as_attachment=True,
-            download_name=document.original_filename
-        )
+        # La reprise d'un téléchargement interrompu n'est pas un nouveau téléchargement
+        if not is_resumed_download(request):
+            ActivityLog.log_event(
+                request_id=request_id,
+                user_id=current_user.id,
+                action_type='download',
+                title='Document téléchargé',
+                description=f"Le client a téléchargé: {document.original_filename}",
+                metadata={'document_id': document_id, 'filename': document.original_filename},
+                visible_to_client=True
+            )
+        
+        # Envoi par le worker (Range/ETag) ou déport vers le serveur frontal
+        return send_upload(stored_path, document.original_filename)
         
     except Exception as e:
         logger.error(f"Erreur téléchargement document {document_id}: {e}")
@@ -498,17 +502,17 @@ def request_revision(request_id):
         if 'revision_files' in request.files:
             for file in request.files.getlist('revision_files'):
                 if file and file.filename:
-                    saved_filename = save_uploaded_file(
+                    stored = stream_uploaded_file(
                         file,
                         os.path.join(current_app.config['UPLOAD_FOLDER'], 'revisions')
                     )
-                    if saved_filename:
+                    if stored:
                         attachment = RevisionAttachment(
                             revision_request_id=revision.id,
-                            filename=saved_filename,
+                            filename=stored.filename,
                             original_filename=file.filename,
                             file_type=file.content_type,
-                            file_size=0,
+                            file_size=stored.size,
                             uploaded_by=current_user.id
                         )
                         db.session.add(attachment)
@@ -13,10 +13,12 @@ Ce module gère les pages publiques accessibles sans authentification:
 - Page des services
 - Page à propos
 - Page de contact
+- Export des métriques (/metrics, OpenMetrics)
 
 Note:
     Ces routes n'ont pas besoin d'authentification car elles présentent
-    l'information publique du site.
+    l'information publique du site. Pour les visiteurs anonymes, elles
+    sont servies avec un ETag et un cache public court (services.http_cache).
 ================================================================================
 """
 
@@ -24,11 +26,16 @@ Note:
 # IMPORTATIONS
 # ==============================================================================
 
-from flask import Blueprint, render_template, abort
+from flask import Blueprint, render_template, abort, current_app, request, Response
 import logging
+from sqlalchemy.orm import defer
 
 from models.request import ServiceRequest
 from models.page import Page
+from services.http_cache import public_cache
+from services.site_cache import get_page_version
+from services.perf_metrics import is_perf_metrics_enabled
+from services.metrics_exporter import render_openmetrics, is_scrape_authorized, CONTENT_TYPE
 
 # Configuration du logger pour ce module
 logger = logging.getLogger(__name__)
@@ -42,6 +49,7 @@ bp = Blueprint('main', __name__)
 # ==============================================================================
 
 @bp.route('/')
+@public_cache()
 def index():
     """
     Affiche la page d'accueil (landing page) du site.
@@ -72,6 +80,7 @@ def index():
 # ==============================================================================
 
 @bp.route('/services')
+@public_cache()
 def services():
     """
     Affiche la page détaillée des services proposés.
@@ -98,6 +107,7 @@ def services():
 # ==============================================================================
 
 @bp.route('/about')
+@public_cache()
 def about():
     """
     Affiche la page "À propos" de TheDraftClinic.
@@ -124,6 +134,7 @@ def about():
 # ==============================================================================
 
 @bp.route('/contact')
+@public_cache()
 def contact():
     """
     Affiche la page de contact.
@@ -142,11 +153,8 @@ def contact():
         return render_template('contact.html')
 
 
-# ==============================================================================
-# CONFIGURATION DU CACHE (ANTI-CACHE)
-# ==============================================================================
-
 @bp.route('/page/<slug>')
+@public_cache(version=get_page_version)
 def view_page(slug):
     """
     Affiche une page dynamique par son slug.
@@ -158,7 +166,10 @@ def view_page(slug):
         Template page.html avec le contenu de la page
     """
     try:
-        page = Page.query.filter_by(slug=slug, is_published=True).first()
+        # Contenu source différé: le rendu est lu via le cache des rendus
+        page = Page.query.options(defer(Page.content)).filter_by(
+            slug=slug, is_published=True
+        ).first()
         
         if not page:
             abort(404)
@@ -170,13 +181,25 @@ def view_page(slug):
         abort(404)
 
 
-@bp.after_request
-def add_header(response):
+# ==============================================================================
+# EXPORT DES MÉTRIQUES
+# ==============================================================================
+
+@bp.route('/metrics')
+def metrics():
     """
-    Ajoute des en-têtes HTTP pour désactiver le cache.
+    Exporte les métriques au format OpenMetrics (collecte Prometheus).
+    
+    Accès: jeton METRICS_TOKEN (Authorization: Bearer) uniquement; sans
+    jeton configuré, la route répond 404.
+    
+    Returns:
+        Response: Texte OpenMetrics, 404 si les métriques sont désactivées
+            ou l'accès refusé
     """
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
+    if not is_perf_metrics_enabled():
+        abort(404)
+    if not is_scrape_authorized(request, current_app.config.get('METRICS_TOKEN')):
+        abort(404)
     
-    return response
+    return Response(render_openmetrics(), content_type=CONTENT_TYPE)
@@ -18,4 +18,7 @@ Ce module contient les utilitaires de sécurité pour l'application:
 # Importation des sous-modules de sécurité
 from security.decorators import admin_required, client_required, login_required_with_message
 from security.validators import validate_email, validate_password, sanitize_input
-from security.rate_limiter import RateLimiter, login_limiter, form_limiter
+from security.rate_limiter import (
+    RateLimiter, login_limiter, form_limiter, init_rate_limiter, get_rate_limit_stats,
+    get_rate_limit_backend_stats, get_rate_limit_rejections
+)
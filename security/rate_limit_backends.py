@@ -0,0 +1,472 @@
+"""
+================================================================================
+TheDraftClinic - Stockages du Limiteur de Taux
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+================================================================================
+
+Ce module définit les stockages (backends) utilisés par RateLimiter pour
+conserver ses compteurs:
+- MemoryBackend: en mémoire du processus, borné par éviction LRU
+- SQLiteBackend: fichier SQLite partagé par les workers d'une même machine
+- RedisBackend: serveur Redis (ou tout client compatible redis-py)
+
+Chaque backend ne manipule que des valeurs numériques avec une durée de vie
+(compteurs pour la fenêtre glissante, "theoretical arrival time" pour
+GCRA): le coût d'une opération est constant, quel que soit le trafic
+d'une IP.
+
+Nettoyage:
+    Les clés expirées (IP inactives) sont supprimées par un balayage amorti:
+    au plus une fois par sweep_interval, lors d'une écriture. Le nombre de
+    clés est en outre borné par max_keys. stats() expose les jauges
+    tracked_keys, evictions (clés supprimées pour respecter max_keys) et
+    expired (clés expirées supprimées).
+
+Sélection par URL (config RATE_LIMIT_STORAGE_URL):
+    memory://                  -> MemoryBackend
+    sqlite:///chemin/fichier   -> SQLiteBackend
+    redis://hote:6379/0        -> RedisBackend (paquet redis requis)
+================================================================================
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+import logging
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+# Nombre maximum de clés conservées par défaut
+DEFAULT_MAX_KEYS = 10000
+
+# Intervalle par défaut entre deux balayages des clés expirées (secondes)
+DEFAULT_SWEEP_INTERVAL = 60
+
+
+class RateLimitBackend:
+    """
+    Interface commune des stockages du limiteur de taux.
+
+    Les clés sont des chaînes, les valeurs des nombres qui expirent après
+    leur durée de vie (ttl, en secondes).
+    """
+
+    def get_many(self, keys):
+        """
+        Lit plusieurs compteurs.
+
+        Args:
+            keys (list): Clés à lire
+
+        Returns:
+            list: Valeurs numériques (0 pour une clé absente ou expirée)
+        """
+        raise NotImplementedError
+
+    def incr(self, key, ttl):
+        """
+        Incrémente un compteur de manière atomique.
+
+        Un compteur absent ou expiré repart de zéro.
+
+        Args:
+            key (str): Clé du compteur
+            ttl (int): Durée de vie en secondes
+
+        Returns:
+            int: Nouvelle valeur du compteur
+        """
+        raise NotImplementedError
+
+    def advance(self, key, now, increment):
+        """
+        Avance une date de manière atomique: valeur = max(valeur, now) + increment.
+
+        La valeur expire lorsqu'elle est atteinte (ttl = valeur - now).
+        Utilisé par l'algorithme GCRA.
+
+        Args:
+            key (str): Clé de la date
+            now (float): Timestamp courant
+            increment (float): Avance en secondes
+
+        Returns:
+            float: Nouvelle valeur
+        """
+        raise NotImplementedError
+
+    def delete(self, *keys):
+        """
+        Supprime des compteurs.
+
+        Args:
+            *keys: Clés à supprimer
+        """
+        raise NotImplementedError
+
+    def sweep(self):
+        """
+        Supprime immédiatement les clés expirées.
+
+        Returns:
+            int: Nombre de clés supprimées
+        """
+        return 0
+
+    def stats(self):
+        """
+        Retourne les jauges du stockage.
+
+        Returns:
+            dict: tracked_keys (None si inconnu), evictions, expired
+        """
+        return {'tracked_keys': None, 'evictions': 0, 'expired': 0}
+
+
+# ==============================================================================
+# STOCKAGE EN MÉMOIRE
+# ==============================================================================
+
+class MemoryBackend(RateLimitBackend):
+    """
+    Stockage en mémoire du processus avec éviction LRU.
+
+    Au-delà de max_keys clés, les moins récemment utilisées sont
+    supprimées: la mémoire reste bornée même lors d'un scan ou d'une
+    vague de bots. Les limites ne sont pas partagées entre workers.
+
+    Attributes:
+        max_keys (int): Nombre maximum de clés conservées
+        sweep_interval (int): Secondes entre deux balayages des clés expirées
+        evictions (int): Clés supprimées pour respecter max_keys
+        expired (int): Clés expirées supprimées
+    """
+
+    def __init__(self, max_keys=DEFAULT_MAX_KEYS, sweep_interval=DEFAULT_SWEEP_INTERVAL):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self.evictions = 0
+        self.expired = 0
+        # clé -> [valeur, expiration]
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.time() + sweep_interval
+
+    def _store(self, key, entry, now):
+        """Enregistre une entrée et applique les limites (verrou déjà acquis)."""
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        if now >= self._next_sweep:
+            self._sweep_locked(now)
+        while len(self._data) > self.max_keys:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _sweep_locked(self, now):
+        """Supprime les clés expirées (verrou déjà acquis)."""
+        expired_keys = [key for key, entry in self._data.items() if entry[1] <= now]
+        for key in expired_keys:
+            del self._data[key]
+        self.expired += len(expired_keys)
+        self._next_sweep = now + self.sweep_interval
+        return len(expired_keys)
+
+    def _get_entry(self, key, now):
+        """Retourne l'entrée vivante d'une clé (verrou déjà acquis)."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._data[key]
+            self.expired += 1
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get_many(self, keys):
+        now = time.time()
+        with self._lock:
+            values = []
+            for key in keys:
+                entry = self._get_entry(key, now)
+                values.append(entry[0] if entry else 0)
+            return values
+
+    def incr(self, key, ttl):
+        now = time.time()
+        with self._lock:
+            entry = self._get_entry(key, now)
+            if entry is None:
+                entry = [0, now + ttl]
+                self._store(key, entry, now)
+            entry[0] += 1
+            return entry[0]
+
+    def advance(self, key, now, increment):
+        with self._lock:
+            entry = self._get_entry(key, now)
+            value = max(entry[0] if entry else 0, now) + increment
+            self._store(key, [value, value], now)
+            return value
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def sweep(self):
+        with self._lock:
+            return self._sweep_locked(time.time())
+
+    def stats(self):
+        return {
+            'tracked_keys': len(self._data),
+            'evictions': self.evictions,
+            'expired': self.expired
+        }
+
+
+# ==============================================================================
+# STOCKAGE SQLITE (PARTAGÉ ENTRE WORKERS LOCAUX)
+# ==============================================================================
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Stockage dans un fichier SQLite partagé par les workers d'une machine.
+
+    Chaque incrément est un UPSERT unique (atomique); le mode WAL permet
+    les lectures concurrentes pendant les écritures. Le balayage est
+    effectué par chaque worker, au plus une fois par sweep_interval.
+
+    Attributes:
+        path (str): Chemin du fichier SQLite
+        max_keys (int): Nombre maximum de clés conservées
+        sweep_interval (int): Secondes entre deux balayages des clés expirées
+        evictions (int): Clés supprimées par ce processus pour respecter max_keys
+        expired (int): Clés expirées supprimées par ce processus
+    """
+
+    def __init__(self, path, max_keys=DEFAULT_MAX_KEYS, sweep_interval=DEFAULT_SWEEP_INTERVAL):
+        self.path = path
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self.evictions = 0
+        self.expired = 0
+        self._next_sweep = time.time() + sweep_interval
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Une connexion par thread (sqlite3 n'autorise pas le partage)
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limits ('
+            'key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL)'
+        )
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS ix_rate_limits_expires_at ON rate_limits (expires_at)'
+        )
+
+    def _connection(self):
+        """Retourne la connexion SQLite du thread courant."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            # Nouvelle connexion après un fork (workers Gunicorn)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA busy_timeout=5000')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        placeholders = ','.join('?' * len(keys))
+        rows = self._connection().execute(
+            f'SELECT key, value FROM rate_limits '
+            f'WHERE key IN ({placeholders}) AND expires_at > ?',
+            (*keys, time.time())
+        ).fetchall()
+        values = dict(rows)
+        return [values.get(key, 0) for key in keys]
+
+    def incr(self, key, ttl):
+        now = time.time()
+        row = self._connection().execute(
+            'INSERT INTO rate_limits (key, value, expires_at) VALUES (?, 1, ?) '
+            'ON CONFLICT(key) DO UPDATE SET '
+            'value = CASE WHEN expires_at > ? THEN value + 1 ELSE 1 END, '
+            'expires_at = CASE WHEN expires_at > ? THEN expires_at ELSE excluded.expires_at END '
+            'RETURNING value',
+            (key, now + ttl, now, now)
+        ).fetchone()
+        self._maybe_sweep(now)
+        return row[0]
+
+    def advance(self, key, now, increment):
+        row = self._connection().execute(
+            'INSERT INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET '
+            'value = MAX(CASE WHEN expires_at > ? THEN value ELSE 0 END, ?) + ?, '
+            'expires_at = MAX(CASE WHEN expires_at > ? THEN value ELSE 0 END, ?) + ? '
+            'RETURNING value',
+            (key, now + increment, now + increment, now, now, increment, now, now, increment)
+        ).fetchone()
+        self._maybe_sweep(now)
+        return row[0]
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        placeholders = ','.join('?' * len(keys))
+        self._connection().execute(
+            f'DELETE FROM rate_limits WHERE key IN ({placeholders})', keys
+        )
+
+    def _maybe_sweep(self, now):
+        """Lance un balayage si l'intervalle est écoulé."""
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self.sweep()
+
+    def sweep(self):
+        conn = self._connection()
+        expired = conn.execute(
+            'DELETE FROM rate_limits WHERE expires_at <= ?', (time.time(),)
+        ).rowcount
+        self.expired += expired
+
+        # Au-delà de max_keys, suppression des clés qui expirent le plus tôt
+        excess = conn.execute('SELECT COUNT(*) FROM rate_limits').fetchone()[0] - self.max_keys
+        if excess > 0:
+            self.evictions += conn.execute(
+                'DELETE FROM rate_limits WHERE key IN ('
+                'SELECT key FROM rate_limits ORDER BY expires_at LIMIT ?)',
+                (excess,)
+            ).rowcount
+        return expired
+
+    def stats(self):
+        tracked = self._connection().execute('SELECT COUNT(*) FROM rate_limits').fetchone()[0]
+        return {
+            'tracked_keys': tracked,
+            'evictions': self.evictions,
+            'expired': self.expired
+        }
+
+
+# ==============================================================================
+# STOCKAGE REDIS
+# ==============================================================================
+
+# Avance atomique d'une date (GCRA): max(valeur, now) + increment,
+# avec une expiration à la date atteinte
+ADVANCE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local value = math.max(tonumber(redis.call('GET', KEYS[1]) or 0), now) + tonumber(ARGV[2])
+redis.call('SET', KEYS[1], tostring(value), 'PX', math.ceil((value - now) * 1000))
+return tostring(value)
+"""
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Stockage Redis partagé par tous les workers et toutes les machines.
+
+    Utilise MGET, INCR, EXPIRE, DEL et un court script Lua (EVAL) pour
+    GCRA: n'importe quel client exposant l'API redis-py (mget, pipeline,
+    eval, delete) peut être injecté, par exemple un substitut local dans
+    les tests.
+
+    Attributes:
+        client: Client Redis (redis.Redis ou compatible)
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url):
+        """
+        Crée le backend à partir d'une URL redis://.
+
+        Args:
+            url (str): URL de connexion Redis
+
+        Returns:
+            RedisBackend: Le backend connecté
+
+        Raises:
+            ImportError: Si le paquet redis n'est pas installé
+        """
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        return [float(value) if value is not None else 0 for value in self.client.mget(keys)]
+
+    def incr(self, key, ttl):
+        pipe = self.client.pipeline()
+        pipe.incr(key)
+        # Les clés sont propres à une fenêtre: prolonger leur durée de vie
+        # à chaque incrément est sans effet sur le calcul
+        pipe.expire(key, int(ttl))
+        value, _ = pipe.execute()
+        return int(value)
+
+    def advance(self, key, now, increment):
+        value = self.client.eval(ADVANCE_SCRIPT, 1, key, repr(now), repr(increment))
+        return float(value)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*keys)
+
+    # Les clés expirent d'elles-mêmes (TTL Redis) et maxmemory-policy
+    # borne la mémoire du serveur: pas de balayage côté application.
+
+
+# ==============================================================================
+# SÉLECTION DU BACKEND
+# ==============================================================================
+
+def create_backend(url, max_keys=DEFAULT_MAX_KEYS, sweep_interval=DEFAULT_SWEEP_INTERVAL):
+    """
+    Crée un backend à partir de son URL de stockage.
+
+    En cas d'URL inconnue ou de dépendance manquante, le stockage en
+    mémoire est utilisé et l'erreur est journalisée.
+
+    Args:
+        url (str): URL du stockage (memory://, sqlite:///..., redis://...)
+        max_keys (int): Limite de clés (mémoire et SQLite)
+        sweep_interval (int): Secondes entre deux balayages des clés expirées
+
+    Returns:
+        RateLimitBackend: Le backend configuré
+    """
+    url = url or 'memory://'
+
+    try:
+        if url.startswith('sqlite:///'):
+            return SQLiteBackend(url[len('sqlite:///'):], max_keys=max_keys,
+                                 sweep_interval=sweep_interval)
+        if url.startswith(('redis://', 'rediss://', 'unix://')):
+            return RedisBackend.from_url(url)
+        if not url.startswith('memory://'):
+            logger.error(f"Stockage du rate limiter inconnu: {url}")
+    except ImportError:
+        logger.error("Module redis non installé, rate limiter en mémoire")
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"Erreur d'ouverture du stockage du rate limiter: {e}")
+
+    return MemoryBackend(max_keys=max_keys, sweep_interval=sweep_interval)
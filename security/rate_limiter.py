@@ -14,27 +14,57 @@ Ce module implémente un système de limitation de taux pour prévenir:
 ================================================================================
 """
 
+import math
 import time
-from collections import defaultdict
+import weakref
 from functools import wraps
 from flask import request, jsonify, flash, redirect, url_for
 import logging
 
+from security.rate_limit_backends import (
+    MemoryBackend, create_backend, DEFAULT_MAX_KEYS, DEFAULT_SWEEP_INTERVAL
+)
+
 # Configuration du logger pour ce module
 logger = logging.getLogger(__name__)
 
+# Limiteurs créés (configurés ensemble par init_rate_limiter)
+_limiters = weakref.WeakSet()
+
+# Algorithmes disponibles
+ALGORITHMS = ('sliding_window', 'gcra')
+
+# Tolérance des comparaisons GCRA (arrondis de window / max_requests)
+GCRA_TOLERANCE = 1e-6
+
 
 class RateLimiter:
     """
     Classe pour gérer la limitation de taux des requêtes.
     
-    Cette classe utilise un algorithme de fenêtre glissante pour
-    limiter le nombre de requêtes par IP sur une période donnée.
+    Deux algorithmes à mémoire et coût constants par IP sont disponibles:
+    
+    - 'sliding_window' (défaut): compteur à fenêtre glissante approché
+      (deux compteurs par IP: fenêtre courante et précédente). Le nombre de
+      requêtes de la dernière période est estimé par:
+      
+          précédente * (1 - progression de la fenêtre courante) + courante
+      
+    - 'gcra' (Generic Cell Rate Algorithm): une seule date par IP, le
+      "theoretical arrival time" (TAT), avancée de window / max_requests à
+      chaque requête. Une requête est acceptée tant que le TAT ne dépasse
+      pas la fin de la fenêtre: rafale de max_requests, puis une requête
+      toutes les window / max_requests secondes.
+    
+    Les valeurs sont conservées dans un backend interchangeable (mémoire,
+    SQLite, Redis).
     
     Attributes:
-        requests (dict): Dictionnaire stockant les timestamps des requêtes par IP
+        name (str): Préfixe des clés de ce limiteur dans le backend
+        backend (RateLimitBackend): Stockage des compteurs
         max_requests (int): Nombre maximum de requêtes autorisées
         window_seconds (int): Fenêtre de temps en secondes
+        algorithm (str): 'sliding_window' ou 'gcra'
         
     Example:
         limiter = RateLimiter(max_requests=5, window_seconds=60)
@@ -44,38 +74,88 @@ class RateLimiter:
             pass
     """
     
-    def __init__(self, max_requests=10, window_seconds=60):
+    def __init__(self, max_requests=10, window_seconds=60, name=None, backend=None,
+                 algorithm='sliding_window'):
         """
         Initialise le limiteur de taux.
         
         Args:
             max_requests (int): Nombre maximum de requêtes dans la fenêtre
             window_seconds (int): Durée de la fenêtre en secondes
+            name (str): Préfixe des clés (défaut: dérivé de la limite)
+            backend (RateLimitBackend): Stockage (défaut: mémoire du processus)
+            algorithm (str): 'sliding_window' (défaut) ou 'gcra'
+            
+        Raises:
+            ValueError: Si l'algorithme est inconnu
         """
-        # Dictionnaire pour stocker les timestamps par IP
-        self.requests = defaultdict(list)
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algorithme de rate limit inconnu: {algorithm}")
+        
+        # Algorithme de limitation
+        self.algorithm = algorithm
         # Nombre maximum de requêtes autorisées
         self.max_requests = max_requests
         # Fenêtre de temps en secondes
         self.window_seconds = window_seconds
+        # Préfixe des clés dans le backend
+        self.name = name or f'rl{max_requests}-{window_seconds}'
+        # Stockage des compteurs
+        self.backend = backend or MemoryBackend()
+        # Intervalle GCRA entre deux requêtes au débit nominal
+        self.emission_interval = window_seconds / max_requests
+        # Requêtes refusées par ce processus (métriques)
+        self.rejected = 0
+        
+        _limiters.add(self)
+    
+    def _window_keys(self, ip_address, now):
+        """
+        Calcule les clés des fenêtres précédente et courante.
+        
+        Args:
+            ip_address (str): L'adresse IP
+            now (float): Timestamp courant
+            
+        Returns:
+            tuple: (clé précédente, clé courante, progression de la fenêtre)
+        """
+        index, offset = divmod(now, self.window_seconds)
+        index = int(index)
+        prefix = f'{self.name}:{ip_address}'
+        return f'{prefix}:{index - 1}', f'{prefix}:{index}', offset / self.window_seconds
     
-    def _cleanup_old_requests(self, ip_address):
+    def _estimated_count(self, ip_address):
         """
-        Nettoie les anciennes requêtes hors de la fenêtre de temps.
+        Estime le nombre de requêtes de l'IP sur la dernière fenêtre.
         
         Args:
-            ip_address (str): L'adresse IP à nettoyer
+            ip_address (str): L'adresse IP
+            
+        Returns:
+            float: Nombre de requêtes estimé
+        """
+        previous_key, current_key, progress = self._window_keys(ip_address, time.time())
+        previous, current = self.backend.get_many([previous_key, current_key])
+        return previous * (1 - progress) + current
+    
+    def _gcra_key(self, ip_address):
+        """Retourne la clé du TAT GCRA d'une IP."""
+        return f'{self.name}:{ip_address}:tat'
+    
+    def _gcra_backlog(self, ip_address):
         """
-        # Temps actuel
-        current_time = time.time()
-        # Timestamp limite (début de la fenêtre)
-        cutoff_time = current_time - self.window_seconds
+        Retourne l'avance du TAT sur le temps courant (GCRA).
         
-        # Conservation uniquement des requêtes dans la fenêtre
-        self.requests[ip_address] = [
-            timestamp for timestamp in self.requests[ip_address]
-            if timestamp > cutoff_time
-        ]
+        Args:
+            ip_address (str): L'adresse IP
+            
+        Returns:
+            float: Avance en secondes (0 si l'IP est au repos)
+        """
+        now = time.time()
+        tat, = self.backend.get_many([self._gcra_key(ip_address)])
+        return max(tat - now, 0)
     
     def is_allowed(self, ip_address):
         """
@@ -87,11 +167,15 @@ class RateLimiter:
         Returns:
             bool: True si la requête est autorisée, False sinon
         """
-        # Nettoyage des anciennes requêtes
-        self._cleanup_old_requests(ip_address)
-        
         # Vérification du nombre de requêtes
-        if len(self.requests[ip_address]) >= self.max_requests:
+        if self.algorithm == 'gcra':
+            exceeded = (self._gcra_backlog(ip_address) + self.emission_interval
+                        > self.window_seconds + GCRA_TOLERANCE)
+        else:
+            exceeded = self._estimated_count(ip_address) >= self.max_requests
+        
+        if exceeded:
+            self.rejected += 1
             logger.warning(f"Rate limit atteint pour IP: {ip_address}")
             return False
         
@@ -104,7 +188,13 @@ class RateLimiter:
         Args:
             ip_address (str): L'adresse IP à enregistrer
         """
-        self.requests[ip_address].append(time.time())
+        if self.algorithm == 'gcra':
+            self.backend.advance(self._gcra_key(ip_address), time.time(), self.emission_interval)
+            return
+        
+        _, current_key, _ = self._window_keys(ip_address, time.time())
+        # Le compteur courant sert encore de "fenêtre précédente" ensuite
+        self.backend.incr(current_key, 2 * self.window_seconds)
     
     def get_remaining_requests(self, ip_address):
         """
@@ -116,8 +206,21 @@ class RateLimiter:
         Returns:
             int: Nombre de requêtes restantes
         """
-        self._cleanup_old_requests(ip_address)
-        return max(0, self.max_requests - len(self.requests[ip_address]))
+        if self.algorithm == 'gcra':
+            backlog = self._gcra_backlog(ip_address)
+            available = self.window_seconds + GCRA_TOLERANCE - backlog
+            return max(0, math.floor(available / self.emission_interval))
+        return max(0, math.ceil(self.max_requests - self._estimated_count(ip_address)))
+    
+    def reset(self, ip_address):
+        """
+        Remet à zéro les compteurs d'une IP (ex: après une connexion réussie).
+        
+        Args:
+            ip_address (str): L'adresse IP
+        """
+        previous_key, current_key, _ = self._window_keys(ip_address, time.time())
+        self.backend.delete(previous_key, current_key, self._gcra_key(ip_address))
     
     def limit(self, f):
         """
@@ -153,10 +256,89 @@ class RateLimiter:
         return decorated_function
 
 
+def init_rate_limiter(app):
+    """
+    Configure le stockage de tous les limiteurs de l'application.
+    
+    Configuration:
+        RATE_LIMIT_STORAGE_URL: memory:// (défaut), sqlite:///chemin ou
+            redis://hote:port/db. Avec plusieurs workers Gunicorn, seuls
+            SQLite et Redis appliquent une limite commune.
+        RATE_LIMIT_MAX_KEYS: Nombre de clés maximum (mémoire et SQLite)
+        RATE_LIMIT_SWEEP_INTERVAL: Secondes entre deux balayages des
+            clés expirées (IP inactives)
+    
+    Args:
+        app: Instance Flask
+    """
+    url = app.config.get('RATE_LIMIT_STORAGE_URL') or 'memory://'
+    max_keys = app.config.get('RATE_LIMIT_MAX_KEYS', DEFAULT_MAX_KEYS)
+    sweep_interval = app.config.get('RATE_LIMIT_SWEEP_INTERVAL', DEFAULT_SWEEP_INTERVAL)
+    
+    backend = create_backend(url, max_keys=max_keys, sweep_interval=sweep_interval)
+    for limiter in list(_limiters):
+        limiter.backend = backend
+    
+    logger.info(f"Rate limiter configuré avec le stockage {type(backend).__name__}")
+
+
+def get_rate_limit_backend_stats():
+    """
+    Retourne les jauges mémoire de chaque stockage des limiteurs.
+    
+    Un stockage partagé par plusieurs limiteurs (cas de init_rate_limiter)
+    n'apparaît qu'une fois, sous les noms de ces limiteurs.
+    
+    Returns:
+        dict: {noms des limiteurs séparés par ',': tracked_keys (None si
+            inconnu), evictions, expired}
+    """
+    groups = {}
+    for limiter in list(_limiters):
+        names, backend = groups.setdefault(id(limiter.backend), ([], limiter.backend))
+        names.append(limiter.name)
+    return {','.join(sorted(names)): backend.stats() for names, backend in groups.values()}
+
+
+def get_rate_limit_stats():
+    """
+    Retourne les jauges mémoire de l'ensemble des limiteurs.
+    
+    Les stockages partagés par plusieurs limiteurs ne sont comptés
+    qu'une fois.
+    
+    Returns:
+        dict: tracked_keys (None si inconnu), evictions, expired
+    """
+    totals = {'tracked_keys': 0, 'evictions': 0, 'expired': 0}
+    for stats in get_rate_limit_backend_stats().values():
+        for name in ('evictions', 'expired'):
+            totals[name] += stats[name]
+        if stats['tracked_keys'] is None or totals['tracked_keys'] is None:
+            totals['tracked_keys'] = None
+        else:
+            totals['tracked_keys'] += stats['tracked_keys']
+    return totals
+
+
+def get_rate_limit_rejections():
+    """
+    Retourne le nombre de requêtes refusées par chaque limiteur.
+    
+    Les compteurs sont ceux du processus courant (worker).
+    
+    Returns:
+        dict: {nom du limiteur: requêtes refusées}
+    """
+    return {limiter.name: limiter.rejected for limiter in list(_limiters)}
+
+
 # Instance globale du limiteur pour les tentatives de connexion
-# 5 tentatives par minute maximum
-login_limiter = RateLimiter(max_requests=5, window_seconds=60)
+# 5 tentatives d'affilée, puis une toutes les 12 secondes (GCRA)
+login_limiter = RateLimiter(max_requests=5, window_seconds=60, name='login',
+                            algorithm='gcra')
 
 # Instance pour les soumissions de formulaires
 # 10 soumissions par minute maximum
-form_limiter = RateLimiter(max_requests=10, window_seconds=60)
+form_limiter = RateLimiter(max_requests=10, window_seconds=60, name='form',
+                           algorithm='sliding_window')
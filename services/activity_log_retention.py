@@ -0,0 +1,399 @@
+"""
+================================================================================
+TheDraftClinic - Rétention et Partitionnement du Journal d'Activité
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module limite la croissance de la table activity_logs:
+
+Archivage (tous les SGBD):
+    Les entrées plus anciennes que la durée de rétention sont lues par lots
+    (index (created_at, id)), écrites dans un fichier JSON Lines compressé
+    (gzip), puis supprimées. Chaque lot est un membre gzip complet ajouté au
+    fichier et synchronisé sur disque avant la suppression des lignes: une
+    interruption ne perd aucune entrée (au pire, un lot est archivé deux
+    fois). Le fichier reste lisible d'un bloc (zcat, gzip.open).
+
+Partitionnement (PostgreSQL, optionnel):
+    La table peut être convertie en table partitionnée par mois sur
+    created_at (partitions "activity_logs_pAAAAMM" et une partition par
+    défaut). Les partitions des mois à venir sont créées à l'avance (les
+    entrées d'un mois tombées dans la partition par défaut y sont
+    déplacées), et les partitions entièrement archivées sont supprimées.
+
+Fonctions:
+- archive_activity_logs: Archive puis supprime les entrées anciennes
+- partition_activity_logs: Convertit la table en table partitionnée
+- ensure_activity_log_partitions: Crée les partitions des mois à venir
+- drop_archived_partitions: Supprime les partitions vides déjà archivées
+- is_partitioned: Indique si la table est partitionnée
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import os                                    # Chemins et synchronisation disque
+import gzip                                  # Compression de l'archive
+import json                                  # Format JSON Lines
+import logging                               # Logging des opérations
+from datetime import datetime, timedelta, date
+
+from sqlalchemy import delete, select, text
+
+from app import db
+from models.activity_log import ActivityLog
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Durée de rétention par défaut (jours)
+DEFAULT_RETENTION_DAYS = 365
+
+# Nombre d'entrées archivées par lot
+DEFAULT_BATCH_SIZE = 1000
+
+# Nombre de mois de partitions créés à l'avance
+DEFAULT_MONTHS_AHEAD = 3
+
+# Nom de la table et préfixe des partitions mensuelles
+TABLE_NAME = ActivityLog.__tablename__
+PARTITION_PREFIX = f'{TABLE_NAME}_p'
+DEFAULT_PARTITION = f'{TABLE_NAME}_default'
+
+
+# ==============================================================================
+# ARCHIVAGE
+# ==============================================================================
+
+def _serialize(row):
+    """
+    Convertit une ligne en objet JSON.
+
+    Args:
+        row: Ligne SQLAlchemy (mapping des colonnes)
+
+    Returns:
+        str: Ligne JSON terminée par un saut de ligne
+    """
+    values = {
+        key: value.isoformat() if isinstance(value, (datetime, date)) else value
+        for key, value in row.items()
+    }
+    return json.dumps(values, ensure_ascii=False) + '\n'
+
+
+def _append_gzip_member(path, lines):
+    """
+    Ajoute un membre gzip complet au fichier puis le synchronise.
+
+    Args:
+        path (str): Chemin du fichier d'archive
+        lines (list): Lignes JSON à écrire
+    """
+    with open(path, 'ab') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb') as member:
+            member.write(''.join(lines).encode('utf-8'))
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_activity_logs(archive_folder, retention_days=DEFAULT_RETENTION_DAYS,
+                          batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Archive puis supprime les entrées plus anciennes que la rétention.
+
+    Args:
+        archive_folder (str): Dossier des fichiers d'archive
+        retention_days (int): Âge maximum des entrées conservées (jours)
+        batch_size (int): Nombre d'entrées par lot
+        dry_run (bool): Compte seulement les entrées concernées
+
+    Returns:
+        dict: archived (nombre d'entrées), path (fichier, ou None), cutoff
+    """
+    table = ActivityLog.__table__
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    result = {'archived': 0, 'path': None, 'cutoff': cutoff}
+
+    if dry_run:
+        result['archived'] = db.session.execute(
+            select(db.func.count()).select_from(table).where(table.c.created_at < cutoff)
+        ).scalar()
+        return result
+
+    os.makedirs(archive_folder, exist_ok=True)
+    path = os.path.join(
+        archive_folder,
+        f"{TABLE_NAME}_before_{cutoff:%Y%m%d}_{datetime.utcnow():%Y%m%dT%H%M%S}.jsonl.gz"
+    )
+
+    oldest_first = select(table).where(table.c.created_at < cutoff).order_by(
+        table.c.created_at, table.c.id
+    ).limit(batch_size)
+
+    while True:
+        with db.engine.begin() as connection:
+            rows = connection.execute(oldest_first).mappings().all()
+            if not rows:
+                break
+
+            _append_gzip_member(path, [_serialize(row) for row in rows])
+            connection.execute(delete(table).where(table.c.id.in_([row['id'] for row in rows])))
+
+        result['archived'] += len(rows)
+        result['path'] = path
+
+    if result['archived']:
+        logger.info(f"Journal d'activité: {result['archived']} entrées archivées dans {path}")
+        if is_partitioned():
+            drop_archived_partitions(cutoff)
+
+    return result
+
+
+# ==============================================================================
+# PARTITIONNEMENT (POSTGRESQL)
+# ==============================================================================
+
+def _is_postgresql():
+    """Indique si la base de l'application est PostgreSQL."""
+    return db.engine.dialect.name == 'postgresql'
+
+
+def _month_start(value):
+    """Retourne le premier jour du mois d'une date."""
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value):
+    """Retourne le premier jour du mois suivant."""
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _partition_name(month):
+    """Retourne le nom de la partition d'un mois (ex: activity_logs_p202601)."""
+    return f'{PARTITION_PREFIX}{month:%Y%m}'
+
+
+def _create_month_partition(connection, month):
+    """
+    Crée la partition d'un mois si elle n'existe pas.
+
+    Si des entrées du mois sont déjà dans la partition par défaut (mois
+    dont la partition n'a pas été créée à temps), PostgreSQL refuse de
+    créer la partition: la partition par défaut est alors détachée, la
+    partition du mois créée, les entrées du mois déplacées, puis la
+    partition par défaut rattachée.
+
+    Args:
+        connection: Connexion de la transaction en cours
+        month (date): Premier jour du mois
+
+    Returns:
+        int: Nombre d'entrées déplacées depuis la partition par défaut
+    """
+    name = _partition_name(month)
+    if connection.execute(text("SELECT to_regclass(:name)"), {'name': name}).scalar():
+        return 0
+
+    bounds = f"FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+    in_month = (f"created_at >= '{month.isoformat()}' "
+                f"AND created_at < '{_next_month(month).isoformat()}'")
+
+    has_default = connection.execute(
+        text("SELECT to_regclass(:name)"), {'name': DEFAULT_PARTITION}
+    ).scalar()
+    conflicting = has_default and connection.execute(text(
+        f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_month} LIMIT 1"
+    )).first()
+    if not conflicting:
+        connection.execute(text(f"CREATE TABLE {name} PARTITION OF {TABLE_NAME} FOR VALUES {bounds}"))
+        return 0
+
+    connection.execute(text(f"ALTER TABLE {TABLE_NAME} DETACH PARTITION {DEFAULT_PARTITION}"))
+    connection.execute(text(f"CREATE TABLE {name} PARTITION OF {TABLE_NAME} FOR VALUES {bounds}"))
+    moved = connection.execute(text(
+        f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}"
+    )).rowcount
+    connection.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+    connection.execute(text(f"ALTER TABLE {TABLE_NAME} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    logger.warning(f"Partition {name} créée: {moved} entrées déplacées depuis {DEFAULT_PARTITION}")
+    return moved
+
+
+def is_partitioned():
+    """
+    Indique si activity_logs est une table partitionnée.
+
+    Returns:
+        bool: True sur PostgreSQL avec une table partitionnée
+    """
+    if not _is_postgresql():
+        return False
+    return bool(db.session.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name)"
+    ), {'name': TABLE_NAME}).scalar())
+
+
+def ensure_activity_log_partitions(months_ahead=DEFAULT_MONTHS_AHEAD):
+    """
+    Crée les partitions du mois courant et des mois à venir.
+
+    À exécuter régulièrement (ex: avec l'archivage) pour que les nouvelles
+    entrées n'aillent pas dans la partition par défaut. Chaque mois est
+    créé dans sa propre transaction: l'échec d'un mois n'empêche pas la
+    création des suivants.
+
+    Args:
+        months_ahead (int): Nombre de mois créés à l'avance
+
+    Returns:
+        int: Nombre de partitions vérifiées, 0 si la table n'est pas partitionnée
+
+    Raises:
+        RuntimeError: Si la partition d'un ou plusieurs mois n'a pas pu être
+            créée (après avoir traité tous les mois)
+    """
+    if not is_partitioned():
+        return 0
+    db.session.rollback()
+
+    month = _month_start(datetime.utcnow())
+    failed = []
+    for _ in range(months_ahead + 1):
+        try:
+            with db.engine.begin() as connection:
+                _create_month_partition(connection, month)
+        except Exception as e:
+            logger.error(f"Création de la partition {_partition_name(month)} impossible: {e}")
+            failed.append(f"{_partition_name(month)} ({e.__class__.__name__}: {e})")
+        month = _next_month(month)
+
+    if failed:
+        raise RuntimeError("Partitions non créées: " + "; ".join(failed))
+    return months_ahead + 1
+
+
+def drop_archived_partitions(cutoff):
+    """
+    Supprime les partitions vides entièrement antérieures à la date limite.
+
+    Args:
+        cutoff (datetime): Date limite de rétention
+
+    Returns:
+        int: Nombre de partitions supprimées
+    """
+    names = db.session.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:name)"
+    ), {'name': TABLE_NAME}).scalars().all()
+    db.session.rollback()
+
+    dropped = 0
+    for name in names:
+        suffix = name[len(PARTITION_PREFIX):]
+        if not name.startswith(PARTITION_PREFIX) or not suffix.isdigit():
+            continue
+        month = date(int(suffix[:4]), int(suffix[4:]), 1)
+        if datetime.combine(_next_month(month), datetime.min.time()) > cutoff:
+            continue
+
+        with db.engine.begin() as connection:
+            if connection.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first():
+                continue
+            connection.execute(text(f"DROP TABLE {name}"))
+        dropped += 1
+        logger.info(f"Partition archivée supprimée: {name}")
+    return dropped
+
+
+def partition_activity_logs(months_ahead=DEFAULT_MONTHS_AHEAD):
+    """
+    Convertit activity_logs en table partitionnée par mois (PostgreSQL).
+
+    La conversion se fait dans une seule transaction: la table existante
+    est renommée, la table partitionnée est créée avec les mêmes colonnes,
+    valeurs par défaut et clés étrangères (clé primaire (id, created_at)),
+    les lignes sont recopiées puis l'ancienne table est supprimée. La
+    séquence des identifiants est conservée.
+
+    Args:
+        months_ahead (int): Nombre de mois de partitions créés à l'avance
+
+    Returns:
+        bool: True si la table a été convertie, False si elle l'était déjà
+
+    Raises:
+        RuntimeError: Si la base n'est pas PostgreSQL
+    """
+    if not _is_postgresql():
+        raise RuntimeError("Le partitionnement n'est disponible que sur PostgreSQL")
+    if is_partitioned():
+        ensure_activity_log_partitions(months_ahead)
+        return False
+    db.session.rollback()
+
+    legacy = f'{TABLE_NAME}_unpartitioned'
+    sequence = f'{TABLE_NAME}_id_seq'
+    columns = ', '.join(column.name for column in ActivityLog.__table__.columns)
+    copied = ', '.join(
+        f'COALESCE({column.name}, now())' if column.name == 'created_at' else column.name
+        for column in ActivityLog.__table__.columns
+    )
+
+    with db.engine.begin() as connection:
+        connection.execute(text(f"LOCK TABLE {TABLE_NAME} IN ACCESS EXCLUSIVE MODE"))
+        oldest = connection.execute(text(f"SELECT min(created_at) FROM {TABLE_NAME}")).scalar()
+
+        connection.execute(text(f"ALTER TABLE {TABLE_NAME} RENAME TO {legacy}"))
+        connection.execute(text(
+            f"ALTER TABLE {legacy} RENAME CONSTRAINT {TABLE_NAME}_pkey TO {legacy}_pkey"
+        ))
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+        connection.execute(text(
+            f"CREATE TABLE {TABLE_NAME} (LIKE {legacy} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created_at)"
+        ))
+        connection.execute(text(f"ALTER TABLE {TABLE_NAME} ALTER COLUMN created_at SET NOT NULL"))
+        connection.execute(text(f"ALTER TABLE {TABLE_NAME} ADD PRIMARY KEY (id, created_at)"))
+        connection.execute(text(
+            f"ALTER TABLE {TABLE_NAME} ADD FOREIGN KEY (request_id) REFERENCES service_requests (id)"
+        ))
+        connection.execute(text(
+            f"ALTER TABLE {TABLE_NAME} ADD FOREIGN KEY (user_id) REFERENCES users (id)"
+        ))
+
+        # Partitions mensuelles couvrant l'historique et les mois à venir
+        month = _month_start(oldest or datetime.utcnow())
+        last = _month_start(datetime.utcnow())
+        for _ in range(months_ahead):
+            last = _next_month(last)
+        while month <= last:
+            _create_month_partition(connection, month)
+            month = _next_month(month)
+        connection.execute(text(f"CREATE TABLE {TABLE_NAME}_default PARTITION OF {TABLE_NAME} DEFAULT"))
+
+        connection.execute(text(
+            f"INSERT INTO {TABLE_NAME} ({columns}) SELECT {copied} FROM {legacy}"
+        ))
+        connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE_NAME}.id"))
+        connection.execute(text(f"DROP TABLE {legacy}"))
+
+        for index in ActivityLog.__table__.indexes:
+            index.create(connection)
+
+    logger.info("Table activity_logs convertie en table partitionnée par mois")
+    return True
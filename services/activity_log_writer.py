@@ -0,0 +1,293 @@
+"""
+================================================================================
+TheDraftClinic - Écriture Différée du Journal d'Activité
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module fournit un écrivain tamponné pour les entrées du journal
+d'activité qui ne sont qu'une trace (ex: téléchargements) et n'ont pas à
+être validées dans la même transaction qu'une modification métier.
+
+Fonctionnement:
+    Les entrées sont placées dans une file bornée en mémoire (par
+    processus). Un thread d'arrière-plan les insère par lots avec un
+    INSERT multi-lignes, dès que ACTIVITY_LOG_BATCH_SIZE entrées sont
+    en attente ou toutes les ACTIVITY_LOG_FLUSH_INTERVAL secondes. La file
+    est vidée à l'arrêt du processus.
+
+    La requête HTTP ne paie donc plus le commit du journal. Si la file est
+    pleine (base indisponible ou trop lente), l'entrée est abandonnée et
+    comptée dans les métriques plutôt que de bloquer la requête.
+
+Configuration:
+    ACTIVITY_LOG_ASYNC: Active l'écriture différée (défaut: désactivée,
+        les entrées sont validées immédiatement)
+    ACTIVITY_LOG_QUEUE_SIZE: Capacité de la file
+    ACTIVITY_LOG_BATCH_SIZE: Nombre maximum de lignes par INSERT
+    ACTIVITY_LOG_FLUSH_INTERVAL: Délai maximum avant écriture (secondes)
+
+Fonctions:
+- init_activity_log_writer: Configure l'écrivain de l'application
+- get_activity_log_writer: Retourne l'écrivain actif (ou None)
+- get_activity_log_stats: Métriques de la file (profondeur, pertes...)
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import os                                    # PID (relance après fork)
+import time                                  # Échéance des lots
+import queue                                 # File bornée des entrées
+import atexit                                # Vidage de la file à l'arrêt
+import threading                             # Thread d'écriture
+import logging                               # Logging des opérations
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Capacité par défaut de la file
+DEFAULT_QUEUE_SIZE = 10000
+
+# Nombre maximum de lignes par INSERT
+DEFAULT_BATCH_SIZE = 200
+
+# Délai maximum (secondes) entre la mise en file et l'écriture
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Délai maximum (secondes) accordé au vidage de la file à l'arrêt
+SHUTDOWN_TIMEOUT = 10.0
+
+# Écrivain actif (None = écriture immédiate)
+_writer = None
+
+
+# ==============================================================================
+# ÉCRIVAIN
+# ==============================================================================
+
+class ActivityLogWriter:
+    """
+    File bornée d'entrées du journal, écrite par lots en arrière-plan.
+
+    Attributes:
+        app: Instance Flask (contexte du thread d'écriture)
+        batch_size (int): Nombre maximum de lignes par INSERT
+        flush_interval (float): Délai maximum avant écriture
+    """
+
+    def __init__(self, app, queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        Initialise l'écrivain (le thread démarre à la première entrée).
+
+        Args:
+            app: Instance Flask
+            queue_size (int): Capacité de la file
+            batch_size (int): Nombre maximum de lignes par INSERT
+            flush_interval (float): Délai maximum avant écriture (secondes)
+        """
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+
+        # Compteurs exposés par stats()
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def _ensure_thread(self):
+        """Démarre le thread d'écriture (de nouveau après un fork)."""
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='activity-log-writer', daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, values):
+        """
+        Met une entrée en file sans jamais bloquer.
+
+        Args:
+            values (dict): Colonnes de la ligne activity_logs
+
+        Returns:
+            bool: True si l'entrée est en file, False si elle est abandonnée
+        """
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(values)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"File du journal d'activité pleine: {self.dropped} entrées abandonnées")
+            return False
+
+    def _next_batch(self):
+        """
+        Attend puis retire le prochain lot d'entrées.
+
+        Après la première entrée, les suivantes sont regroupées pendant au
+        plus flush_interval secondes ou jusqu'à batch_size entrées.
+
+        Returns:
+            list: Entrées du lot (vide si rien n'est arrivé à temps)
+        """
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        # Regroupe les entrées arrivées jusqu'à l'échéance du lot
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stopping.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """
+        Insère un lot en une seule instruction INSERT multi-lignes.
+
+        Args:
+            batch (list): Entrées à écrire
+        """
+        from app import db
+        from models.activity_log import ActivityLog
+
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as connection:
+                    connection.execute(ActivityLog.__table__.insert(), batch)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Erreur écriture du journal d'activité ({len(batch)} entrées): {e}")
+
+    def _run(self):
+        """Boucle du thread: écrit les lots jusqu'à l'arrêt."""
+        while not self._stopping.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def flush(self):
+        """Écrit immédiatement toutes les entrées en file (thread appelant)."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._write(batch)
+
+    def close(self, timeout=SHUTDOWN_TIMEOUT):
+        """
+        Arrête le thread et écrit les entrées restantes.
+
+        Args:
+            timeout (float): Attente maximum du thread en secondes
+        """
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self):
+        """
+        Retourne les métriques de la file.
+
+        Returns:
+            dict: queue_depth, queue_capacity, dropped, written, failed, batches
+        """
+        return {
+            'queue_depth': self._queue.qsize(),
+            'queue_capacity': self._queue.maxsize,
+            'dropped': self.dropped,
+            'written': self.written,
+            'failed': self.failed,
+            'batches': self.batches
+        }
+
+
+# ==============================================================================
+# CONFIGURATION DE L'APPLICATION
+# ==============================================================================
+
+def init_activity_log_writer(app):
+    """
+    Active l'écriture différée du journal si ACTIVITY_LOG_ASYNC est vrai.
+
+    Args:
+        app: Instance Flask
+    """
+    global _writer
+
+    if not app.config.get('ACTIVITY_LOG_ASYNC'):
+        return
+
+    if _writer is not None:
+        _writer.close()
+
+    _writer = ActivityLogWriter(
+        app,
+        queue_size=app.config.get('ACTIVITY_LOG_QUEUE_SIZE', DEFAULT_QUEUE_SIZE),
+        batch_size=app.config.get('ACTIVITY_LOG_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+        flush_interval=app.config.get('ACTIVITY_LOG_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+    )
+    atexit.register(_writer.close)
+
+    logger.info("Écriture différée du journal d'activité activée")
+
+
+def get_activity_log_writer():
+    """
+    Retourne l'écrivain différé actif.
+
+    Returns:
+        ActivityLogWriter: L'écrivain, ou None si l'écriture est immédiate
+    """
+    return _writer
+
+
+def get_activity_log_stats():
+    """
+    Retourne les métriques de l'écrivain différé.
+
+    Returns:
+        dict: Métriques (voir ActivityLogWriter.stats), ou None si désactivé
+    """
+    return _writer.stats() if _writer is not None else None
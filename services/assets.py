@@ -0,0 +1,245 @@
+"""
+================================================================================
+TheDraftClinic - Assets Statiques Compilés
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module sert les assets produits par build_assets.py (bundle Tailwind
+purgé, styles.css et main.js minifiés) et fournit leurs URLs aux templates.
+
+Fonctionnement:
+    Le build écrit chaque asset sous un nom contenant l'empreinte de son
+    contenu (ex: css/styles.3f2a9c1b0d.css), avec ses variantes
+    précompressées .gz et .br, et un manifeste {chemin source: chemin
+    compilé}. asset_url('css/styles.css') retourne l'URL /assets/... du
+    fichier compilé: son contenu ne change jamais, il est donc servi avec
+    "public, max-age=1 an, immutable", en brotli ou gzip selon
+    Accept-Encoding. Sans build (développement), asset_url retourne l'URL
+    du fichier source sous /static et Tailwind est chargé depuis le CDN.
+
+Configuration:
+    ASSETS_FOLDER: Dossier des assets compilés (défaut: static/dist)
+    ASSETS_MAX_AGE: Durée de cache des assets compilés (secondes)
+
+Fonctions:
+- init_assets: Charge le manifeste, installe la route et les helpers Jinja
+- asset_url: URL d'un asset (compilée si disponible)
+- has_built_asset: Indique si un asset a été compilé
+- get_assets_version: Empreinte du build (intégrée aux ETag des pages)
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import os                                    # Chemins des fichiers
+import json                                  # Lecture du manifeste
+import logging                               # Logging des opérations
+import mimetypes                             # Type de contenu des assets
+
+from flask import abort, request, send_file, url_for
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Nom du manifeste écrit par build_assets.py dans le dossier des assets
+MANIFEST_NAME = 'manifest.json'
+
+# Préfixe d'URL et endpoint des assets compilés
+ASSETS_URL_PATH = '/assets'
+ASSETS_ENDPOINT = 'assets'
+
+# Durée de cache par défaut des assets compilés (1 an)
+DEFAULT_MAX_AGE = 31536000
+
+# Variantes précompressées, par ordre de préférence: (encodage, extension)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Thème Tailwind partagé avec tailwind.config.js (mode CDN sans build)
+THEME_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'assets', 'tailwind.theme.json'
+)
+
+# État chargé par init_assets
+_folder = None
+_max_age = DEFAULT_MAX_AGE
+_files = {}              # {chemin source: chemin compilé}
+_encodings = {}          # {chemin compilé: [encodages disponibles]}
+_version = ''
+
+
+# ==============================================================================
+# MANIFESTE
+# ==============================================================================
+
+def load_manifest(folder):
+    """
+    Lit le manifeste d'un dossier d'assets compilés.
+
+    Args:
+        folder (str): Dossier des assets compilés
+
+    Returns:
+        dict: {'version': str, 'files': {source: compilé}}, vide sans build
+    """
+    try:
+        with open(os.path.join(folder, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {'version': '', 'files': {}}
+    except (OSError, ValueError) as e:
+        logger.error(f"Manifeste des assets illisible: {e}")
+        return {'version': '', 'files': {}}
+    return {'version': manifest.get('version', ''), 'files': manifest.get('files', {})}
+
+
+def get_assets_version():
+    """
+    Retourne l'empreinte du build courant.
+
+    Returns:
+        str: Empreinte du manifeste ('' sans build)
+    """
+    return _version
+
+
+# ==============================================================================
+# HELPERS DES TEMPLATES
+# ==============================================================================
+
+def has_built_asset(path):
+    """
+    Indique si un asset a été compilé par build_assets.py.
+
+    Args:
+        path (str): Chemin source (ex: 'css/tailwind.css')
+
+    Returns:
+        bool: True si l'asset figure dans le manifeste
+    """
+    return path in _files
+
+
+def asset_url(path):
+    """
+    Retourne l'URL d'un asset.
+
+    Args:
+        path (str): Chemin source, relatif à static/ (ex: 'js/main.js')
+
+    Returns:
+        str: URL du fichier compilé (empreinte dans le nom), ou du fichier
+            source sous /static sans build
+    """
+    built = _files.get(path)
+    if built is not None:
+        return url_for(ASSETS_ENDPOINT, filename=built)
+    return url_for('static', filename=path)
+
+
+def tailwind_cdn_config():
+    """
+    Retourne la configuration du Tailwind CDN (développement sans build).
+
+    Returns:
+        dict: Configuration tailwind.config avec le thème partagé
+    """
+    try:
+        with open(THEME_PATH, encoding='utf-8') as f:
+            return {'theme': {'extend': json.load(f)}}
+    except (OSError, ValueError) as e:
+        logger.error(f"Thème Tailwind illisible: {e}")
+        return {}
+
+
+# ==============================================================================
+# ENVOI DES ASSETS COMPILÉS
+# ==============================================================================
+
+def send_asset(filename):
+    """
+    Envoie un asset compilé, précompressé si le client l'accepte.
+
+    Seuls les fichiers du manifeste sont servis.
+
+    Args:
+        filename (str): Chemin compilé (ex: 'css/styles.3f2a9c1b0d.css')
+
+    Returns:
+        Response: Fichier avec cache immuable
+    """
+    available = _encodings.get(filename)
+    if available is None:
+        abort(404)
+
+    path = os.path.join(_folder, filename)
+    encoding = None
+    for name, extension in ENCODINGS:
+        if name in available and request.accept_encodings[name]:
+            encoding = name
+            path += extension
+            break
+
+    response = send_file(
+        path,
+        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        conditional=True
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = f'public, max-age={_max_age}, immutable'
+    return response
+
+
+# ==============================================================================
+# CONFIGURATION DE L'APPLICATION
+# ==============================================================================
+
+def init_assets(app):
+    """
+    Charge le manifeste et installe la route et les helpers des assets.
+
+    Args:
+        app: Instance Flask
+    """
+    global _folder, _max_age, _files, _encodings, _version
+
+    _folder = app.config.get('ASSETS_FOLDER') or os.path.join(app.static_folder, 'dist')
+    _max_age = app.config.get('ASSETS_MAX_AGE', DEFAULT_MAX_AGE)
+
+    manifest = load_manifest(_folder)
+    _files = manifest['files']
+    _version = manifest['version']
+    _encodings = {}
+    for built in _files.values():
+        path = os.path.join(_folder, built)
+        _encodings[built] = [
+            name for name, extension in ENCODINGS if os.path.exists(path + extension)
+        ]
+
+    app.add_url_rule(f'{ASSETS_URL_PATH}/<path:filename>', ASSETS_ENDPOINT, send_asset)
+    app.jinja_env.globals.update(
+        asset_url=asset_url,
+        has_built_asset=has_built_asset,
+        tailwind_cdn_config=tailwind_cdn_config
+    )
+
+    if _files:
+        logger.info(f"Assets compilés: {len(_files)} fichiers (build {_version})")
+    else:
+        logger.warning(
+            "Assets non compilés (python build_assets.py): "
+            "fichiers sources et Tailwind CDN utilisés"
+        )
@@ -10,13 +10,28 @@ Website: www.myoneart.com
 
 Ce module fournit les utilitaires de gestion des fichiers uploadés:
 - Validation des types de fichiers autorisés
-- Génération de noms de fichiers uniques
-- Sauvegarde sécurisée des uploads
+- Stockage adressé par contenu (nom = empreinte SHA-256), dédupliqué
+- Répartition des fichiers en sous-dossiers "ab/cd/<nom>" et résolution
+  des chemins (anciens fichiers à plat compris)
+- Sauvegarde sécurisée des uploads en flux (SHA-256 et taille calculés
+  pendant l'écriture)
+- Téléchargements avec reprise (Range / If-Range, ETag) ou déportés vers
+  le serveur frontal (X-Sendfile / X-Accel-Redirect)
+
+Upload en flux:
+    UploadRequest remplace la fabrique de fichiers temporaires de Werkzeug:
+    chaque fichier reçu est écrit par blocs dans un fichier de réception
+    (UploadSpool) situé sur le même disque que le dossier d'uploads, en
+    calculant son empreinte et sa taille au passage. La sauvegarde finale
+    n'est alors qu'un renommage (os.replace), sans seconde copie. Pour tout
+    autre flux, la copie se fait par blocs de CHUNK_SIZE octets. La mémoire
+    utilisée par un upload reste constante quelle que soit sa taille.
 
 Sécurité:
 - Seules certaines extensions sont autorisées
-- Les noms de fichiers sont sécurisés avec secure_filename
-- Les fichiers sont renommés avec un UUID pour éviter les conflits
+- Les fichiers sont renommés d'après l'empreinte SHA-256 de leur contenu
+- Un fichier n'est supprimé du disque que lorsque plus aucune ligne ne
+  le référence (models.file_blob.FileBlob)
 ================================================================================
 """
 
@@ -25,9 +40,16 @@ Sécurité:
 # ==============================================================================
 
 import os                                    # Opérations sur les fichiers
+import re                                    # Reconnaissance des noms adressés
+import time                                  # Âge des fichiers de réception
 import uuid                                  # Génération d'identifiants uniques
+import hashlib                               # Empreinte SHA-256 des fichiers
 import logging                               # Logging des opérations
+from collections import namedtuple           # Résultat d'une sauvegarde
+from flask import Request, current_app, has_app_context  # Réception en flux
 from werkzeug.utils import secure_filename   # Sécurisation des noms de fichiers
+from werkzeug.security import safe_join      # Chemins confinés au dossier d'uploads
+from services.perf_metrics import observe    # Taille et durée des uploads
 
 # Configuration du logger pour ce module
 logger = logging.getLogger(__name__)
@@ -55,6 +77,219 @@ ALLOWED_EXTENSIONS = {
     'gif',      # GIF
 }
 
+# Taille des blocs lus et écrits lors d'une copie en flux (64 KB)
+CHUNK_SIZE = 64 * 1024
+
+# Nom du sous-dossier des fichiers en cours de réception
+INCOMING_FOLDER = '.incoming'
+
+# Âge (secondes) au-delà duquel un fichier de réception orphelin est supprimé
+INCOMING_MAX_AGE = 24 * 3600
+
+# Nom adressé par contenu: "<sha256>.<extension>"
+CONTENT_ADDRESSED_NAME = re.compile(r'^[0-9a-f]{64}\.[a-z0-9]+$')
+
+# Résultat d'une sauvegarde: nom stocké, taille en octets, empreinte SHA-256
+StoredFile = namedtuple('StoredFile', ['filename', 'size', 'sha256'])
+
+
+# ==============================================================================
+# RÉPARTITION EN SOUS-DOSSIERS
+# ==============================================================================
+
+def shard_path(filename):
+    """
+    Retourne le chemin réparti d'un fichier: "ab/cd/<nom>".
+    
+    Les deux niveaux de sous-dossiers (256 x 256) limitent le nombre
+    d'entrées par dossier. Pour un nom adressé par contenu, ils sont tirés
+    de l'empreinte du nom; pour un ancien nom, de son empreinte SHA-256.
+    
+    Args:
+        filename (str): Nom du fichier (un chemin déjà réparti est conservé)
+        
+    Returns:
+        str: Chemin relatif réparti
+        
+    Example:
+        >>> shard_path("9f86d081...0f00a08.pdf")
+        "9f/86/9f86d081...0f00a08.pdf"
+    """
+    if '/' in filename:
+        return filename
+    if CONTENT_ADDRESSED_NAME.match(filename):
+        key = filename
+    else:
+        key = hashlib.sha256(filename.encode('utf-8')).hexdigest()
+    return f"{key[:2]}/{key[2:4]}/{filename}"
+
+
+def resolve_upload(filename, upload_folder):
+    """
+    Retrouve l'emplacement réel d'un fichier uploadé.
+    
+    Essaie le chemin enregistré, puis l'emplacement réparti et
+    l'emplacement à plat du même nom: un fichier reste accessible pendant
+    la migration vers la répartition, avant ou après la mise à jour de sa
+    ligne en base.
+    
+    Args:
+        filename (str): Nom ou chemin enregistré en base
+        upload_folder (str): Dossier d'uploads
+        
+    Returns:
+        str: Chemin relatif au dossier où se trouve le fichier, ou None
+    """
+    if not filename:
+        return None
+    
+    basename = filename.rsplit('/', 1)[-1]
+    for candidate in dict.fromkeys((filename, shard_path(basename), basename)):
+        full_path = safe_join(upload_folder, candidate)
+        if full_path and os.path.isfile(full_path):
+            return candidate
+    return None
+
+
+def upload_url(filename, folder='', external=False):
+    """
+    Retourne l'URL publique d'un fichier uploadé (helper Jinja).
+    
+    Args:
+        filename (str): Nom ou chemin enregistré en base
+        folder (str): Sous-dossier d'uploads ('branding', 'revisions'...)
+        external (bool): URL absolue (ex: og:image)
+        
+    Returns:
+        str: URL du fichier sous /static/uploads
+    """
+    from flask import url_for
+    
+    base = 'uploads/' + (f'{folder}/' if folder else '')
+    upload_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], folder)
+    resolved = resolve_upload(filename, upload_folder) or filename
+    return url_for('static', filename=base + resolved, _external=external)
+
+
+# ==============================================================================
+# RÉCEPTION EN FLUX
+# ==============================================================================
+
+class UploadSpool:
+    """
+    Fichier de réception d'un upload, écrit directement sur disque.
+    
+    Werkzeug y écrit le contenu du fichier au fil de la lecture de la
+    requête; l'empreinte SHA-256 et la taille sont calculées pendant ces
+    écritures. Le fichier peut ensuite être déplacé vers son emplacement
+    final par claim(). S'il n'est pas réclamé, il est supprimé à la
+    fermeture (fin de la requête).
+    
+    Attributes:
+        path (str): Chemin du fichier de réception
+        size (int): Nombre d'octets reçus
+        started (float): Début de la réception (time.monotonic)
+    """
+    
+    def __init__(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f"{uuid.uuid4().hex}.part")
+        self.size = 0
+        self.started = time.monotonic()
+        self._file = open(self.path, 'w+b')
+        self._hash = hashlib.sha256()
+        self._claimed = False
+    
+    def write(self, data):
+        self._hash.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+    
+    def hexdigest(self):
+        """Retourne l'empreinte SHA-256 du contenu reçu."""
+        return self._hash.hexdigest()
+    
+    def claim(self, destination):
+        """
+        Déplace le fichier reçu vers son emplacement final.
+        
+        Args:
+            destination (str): Chemin final du fichier
+            
+        Returns:
+            bool: True si le fichier a été déplacé (même système de fichiers)
+        """
+        if self._claimed:
+            return False
+        self._file.flush()
+        try:
+            os.replace(self.path, destination)
+        except OSError:
+            return False
+        self._claimed = True
+        self._file.close()
+        return True
+    
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self._claimed:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+    
+    @property
+    def closed(self):
+        return self._file.closed
+    
+    def __getattr__(self, name):
+        # read, readline, seek, tell, flush... délégués au fichier
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._file, name)
+    
+    def __iter__(self):
+        return iter(self._file)
+
+
+class UploadRequest(Request):
+    """
+    Requête Flask dont les fichiers uploadés sont reçus dans un UploadSpool.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        return UploadSpool(current_app.config['UPLOAD_INCOMING_FOLDER'])
+
+
+def init_file_service(app):
+    """
+    Active la réception des uploads en flux pour l'application.
+    
+    Les fichiers sont reçus dans UPLOAD_FOLDER/.incoming (même disque que
+    les fichiers finaux); les fichiers de réception orphelins (arrêt
+    brutal d'un worker) de plus de INCOMING_MAX_AGE sont supprimés.
+    
+    Args:
+        app: Instance Flask
+    """
+    incoming = app.config.setdefault(
+        'UPLOAD_INCOMING_FOLDER',
+        os.path.join(app.config['UPLOAD_FOLDER'], INCOMING_FOLDER)
+    )
+    os.makedirs(incoming, exist_ok=True)
+    app.request_class = UploadRequest
+    app.add_template_global(upload_url, 'upload_url')
+    
+    cutoff = time.time() - INCOMING_MAX_AGE
+    for entry in os.scandir(incoming):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
 
 # ==============================================================================
 # FONCTIONS DE VALIDATION
@@ -107,34 +342,98 @@ def allowed_file(filename):
 # FONCTIONS DE SAUVEGARDE
 # ==============================================================================
 
-def save_uploaded_file(file, upload_folder):
+def _incoming_folder(upload_folder):
     """
-    Sauvegarde un fichier uploadé avec un nom unique et sécurisé.
+    Retourne le dossier des fichiers en cours de réception.
+    
+    Args:
+        upload_folder (str): Dossier de destination de l'upload
+        
+    Returns:
+        str: Dossier de réception (même disque que les uploads)
+    """
+    if has_app_context() and current_app.config.get('UPLOAD_INCOMING_FOLDER'):
+        return current_app.config['UPLOAD_INCOMING_FOLDER']
+    return os.path.join(upload_folder, INCOMING_FOLDER)
+
+
+def _spool_stream(stream, folder):
+    """
+    Copie un flux par blocs dans un fichier de réception.
+    
+    Args:
+        stream: Flux binaire lisible
+        folder (str): Dossier de réception
+        
+    Returns:
+        UploadSpool: Fichier reçu (empreinte et taille calculées)
+    """
+    spool = UploadSpool(folder)
+    try:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _copy_spool(spool, destination):
+    """
+    Copie un fichier reçu vers sa destination par blocs (autre disque).
+    
+    Le fichier est écrit sous un nom temporaire puis renommé: un fichier
+    partiel n'est jamais visible sous son nom final.
+    
+    Args:
+        spool (UploadSpool): Fichier reçu
+        destination (str): Chemin final du fichier
+    """
+    partial_path = f"{destination}.{uuid.uuid4().hex[:8]}.part"
+    try:
+        spool.seek(0)
+        with open(partial_path, 'wb') as target:
+            while True:
+                chunk = spool.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                target.write(chunk)
+        os.replace(partial_path, destination)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+
+def stream_uploaded_file(file, upload_folder):
+    """
+    Sauvegarde un fichier uploadé dans le stockage adressé par contenu.
     
     Cette fonction:
     1. Vérifie que le fichier est valide et a une extension autorisée
-    2. Sécurise le nom du fichier pour éviter les injections
-    3. Génère un nom unique avec UUID pour éviter les conflits
-    4. Sauvegarde le fichier dans le dossier spécifié
+    2. Reçoit le contenu en flux en calculant SHA-256 et taille
+    3. Nomme le fichier d'après son empreinte: "ab/cd/<sha256>.<extension>"
+    4. Déplace le fichier reçu vers le dossier. Si un fichier identique
+       existe déjà, il est simplement remplacé (contenu identique): les
+       octets ne sont stockés qu'une fois par dossier
+    
+    Les références au fichier sont comptées par FileBlob lors de
+    l'enregistrement des lignes qui le désignent.
     
     Args:
         file: Objet FileStorage de Flask (request.files[...])
         upload_folder (str): Chemin vers le dossier de destination
         
     Returns:
-        str: Le nom unique du fichier sauvegardé, ou None si échec
+        StoredFile: (filename, size, sha256), ou None si échec
         
     Example:
-        >>> from flask import request
-        >>> file = request.files['document']
-        >>> filename = save_uploaded_file(file, app.config['UPLOAD_FOLDER'])
-        >>> print(filename)
-        "a1b2c3d4e5f6_document.pdf"
-        
-    Security Notes:
-        - secure_filename supprime les caractères dangereux du nom
-        - UUID garantit l'unicité et empêche l'écrasement de fichiers
-        - L'extension est préservée pour la compatibilité
+        >>> stored = stream_uploaded_file(request.files['document'], folder)
+        >>> stored.filename, stored.size
+        ("9f/86/9f86d081...0f00a08.pdf", 1048576)
     """
     # Vérification de base: le fichier existe-t-il?
     if not file:
@@ -147,27 +446,39 @@ def save_uploaded_file(file, upload_folder):
         return None
     
     try:
-        # Sécurisation du nom de fichier original
-        # Supprime les caractères spéciaux et les chemins relatifs
-        original_filename = secure_filename(file.filename)
+        # Extension du nom original sécurisé (seule partie conservée)
+        extension = secure_filename(file.filename).rsplit('.', 1)[1].lower()
         
-        # Génération d'un préfixe UUID unique
-        # Utilise les 8 premiers caractères pour un ID court mais unique
-        unique_prefix = uuid.uuid4().hex[:8]
+        # Réception du contenu: fichier déjà reçu par UploadRequest,
+        # sinon copie du flux par blocs
+        spool = file.stream
+        if not isinstance(spool, UploadSpool):
+            spool = _spool_stream(spool, _incoming_folder(upload_folder))
         
-        # Construction du nom de fichier final
-        unique_filename = f"{unique_prefix}_{original_filename}"
+        # Nom adressé par contenu, réparti en sous-dossiers
+        sha256 = spool.hexdigest()
+        stored_filename = shard_path(f"{sha256}.{extension}")
         
-        # Construction du chemin complet
-        file_path = os.path.join(upload_folder, unique_filename)
+        file_path = os.path.join(upload_folder, stored_filename)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        duplicate = os.path.exists(file_path)
         
-        # Sauvegarde du fichier
-        file.save(file_path)
+        # Renommage atomique (même disque) ou copie par blocs
+        if not spool.claim(file_path):
+            _copy_spool(spool, file_path)
+        spool.close()
         
         # Log de succès
-        logger.info(f"Fichier sauvegardé: {unique_filename}")
+        if duplicate:
+            logger.info(f"Fichier déjà stocké, contenu dédupliqué: {stored_filename}")
+        else:
+            logger.info(f"Fichier sauvegardé: {stored_filename} ({spool.size} octets)")
         
-        return unique_filename
+        # Métriques: taille et durée de la réception au stockage final (µs)
+        observe('upload_bytes', spool.size)
+        observe('upload_duration', (time.monotonic() - spool.started) * 1_000_000)
+        
+        return StoredFile(stored_filename, spool.size, sha256)
         
     except Exception as e:
         # Log de l'erreur
@@ -175,25 +486,77 @@ def save_uploaded_file(file, upload_folder):
         return None
 
 
+def save_uploaded_file(file, upload_folder):
+    """
+    Sauvegarde un fichier uploadé avec un nom unique et sécurisé.
+    
+    Raccourci de stream_uploaded_file lorsque seul le nom du fichier
+    stocké est nécessaire.
+    
+    Args:
+        file: Objet FileStorage de Flask (request.files[...])
+        upload_folder (str): Chemin vers le dossier de destination
+        
+    Returns:
+        str: Le nom unique du fichier sauvegardé, ou None si échec
+        
+    Example:
+        >>> from flask import request
+        >>> file = request.files['document']
+        >>> filename = save_uploaded_file(file, app.config['UPLOAD_FOLDER'])
+        >>> print(filename)
+        "9f/86/9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08.pdf"
+        
+    Security Notes:
+        - Le nom stocké est l'empreinte SHA-256 du contenu: aucun
+          caractère du nom original n'y figure, hormis l'extension
+        - Un fichier existant n'est remplacé que par un contenu identique
+        - L'extension est préservée pour la compatibilité
+    """
+    stored = stream_uploaded_file(file, upload_folder)
+    return stored.filename if stored else None
+
+
 def delete_file(filename, upload_folder):
     """
-    Supprime un fichier du dossier d'uploads.
+    Supprime un fichier du dossier d'uploads s'il n'est plus référencé.
+    
+    Avec le stockage adressé par contenu, un même fichier peut être
+    désigné par plusieurs lignes (documents, pièces jointes, preuves de
+    paiement, branding): il n'est supprimé du disque que lorsque son
+    compteur de références (FileBlob) est nul. Un fichier sans ligne
+    FileBlob (antérieur au comptage) est conservé: ses références sont
+    inconnues tant que rebuild_file_refs.py n'a pas été lancé.
     
     Args:
         filename (str): Nom du fichier à supprimer
         upload_folder (str): Chemin vers le dossier contenant le fichier
         
     Returns:
-        bool: True si la suppression a réussi, False sinon
+        bool: True si le fichier a été supprimé, False sinon
         
     Example:
-        >>> delete_file("a1b2c3d4_document.pdf", app.config['UPLOAD_FOLDER'])
+        >>> delete_file("9f/86/9f86d081...0f00a08.pdf", app.config['UPLOAD_FOLDER'])
         True
     """
+    from models.file_blob import FileBlob
+    
     try:
         # Construction du chemin complet
         file_path = os.path.join(upload_folder, filename)
         
+        # Le fichier est-il encore référencé?
+        root = current_app.config['UPLOAD_FOLDER'] if has_app_context() else upload_folder
+        path = os.path.relpath(file_path, root).replace(os.sep, '/')
+        ref_count = FileBlob.get_ref_count(path)
+        if ref_count is None:
+            # Fichier antérieur au comptage: références inconnues
+            logger.warning(f"Fichier non suivi conservé (python rebuild_file_refs.py): {filename}")
+            return False
+        if ref_count > 0:
+            logger.info(f"Fichier conservé, encore référencé {ref_count} fois: {filename}")
+            return False
+        
         # Vérification de l'existence du fichier
         if not os.path.exists(file_path):
             logger.warning(f"Fichier à supprimer non trouvé: {filename}")
@@ -232,3 +595,92 @@ def get_file_size(filename, upload_folder):
     except Exception as e:
         logger.error(f"Erreur lors de la lecture de la taille de {filename}: {e}")
         return 0
+
+
+# ==============================================================================
+# TÉLÉCHARGEMENT
+# ==============================================================================
+
+def is_resumed_download(req):
+    """
+    Indique si la requête reprend un téléchargement déjà commencé.
+    
+    Une requête Range qui ne commence pas au premier octet est la suite
+    d'un téléchargement interrompu, pas un nouveau téléchargement.
+    
+    Args:
+        req: Requête Flask
+        
+    Returns:
+        bool: True si la plage demandée commence après le premier octet
+    """
+    byte_range = req.range
+    return bool(byte_range and byte_range.ranges and byte_range.ranges[0][0] != 0)
+
+
+def send_upload(stored_path, download_name, upload_folder=None):
+    """
+    Envoie un fichier uploadé en pièce jointe.
+    
+    Modes (configuration UPLOAD_SENDFILE_MODE):
+        '' (défaut): le worker envoie le fichier lui-même, avec gestion
+            des en-têtes Range / If-Range (reprise) et ETag / 304
+        'x-sendfile': en-tête X-Sendfile (Apache mod_xsendfile, lighttpd)
+        'x-accel-redirect': en-tête X-Accel-Redirect vers l'emplacement
+            interne UPLOAD_ACCEL_PREFIX de Nginx
+    
+    En mode déporté, le worker ne fait que l'autorisation et répond aux
+    requêtes conditionnelles (304); le serveur frontal lit le fichier et
+    gère les plages d'octets.
+    
+    L'ETag d'un fichier adressé par contenu est son empreinte SHA-256:
+    elle ne change jamais pour un même nom, ce qui rend If-Range fiable.
+    
+    Args:
+        stored_path (str): Chemin relatif au dossier (voir resolve_upload)
+        download_name (str): Nom proposé au navigateur
+        upload_folder (str): Dossier d'uploads (défaut: UPLOAD_FOLDER)
+        
+    Returns:
+        Response: Réponse Flask (200, 206, 304 ou en-tête de déport)
+    """
+    from flask import request, send_file
+    
+    if upload_folder is None:
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+    
+    full_path = safe_join(upload_folder, stored_path)
+    if full_path is None:
+        raise FileNotFoundError(stored_path)
+    
+    basename = os.path.basename(stored_path)
+    etag = basename.rsplit('.', 1)[0] if CONTENT_ADDRESSED_NAME.match(basename) else True
+    
+    mode = (current_app.config.get('UPLOAD_SENDFILE_MODE') or '').lower()
+    if mode not in ('x-sendfile', 'x-accel-redirect'):
+        return send_file(full_path, as_attachment=True, download_name=download_name,
+                         conditional=True, etag=etag)
+    
+    from urllib.parse import quote
+    from werkzeug.utils import send_file as werkzeug_send_file
+    
+    # Réponse sans corps portant X-Sendfile, Content-Disposition, type et ETag
+    response = werkzeug_send_file(
+        full_path, request.environ, as_attachment=True, download_name=download_name,
+        use_x_sendfile=True, conditional=False, etag=etag,
+        response_class=current_app.response_class
+    )
+    # Le serveur frontal fixe la longueur (et les plages) lui-même
+    response.headers.pop('Content-Length', None)
+    
+    if mode == 'x-accel-redirect':
+        response.headers.pop('X-Sendfile', None)
+        prefix = current_app.config.get('UPLOAD_ACCEL_PREFIX', '/_uploads/').rstrip('/')
+        relative = os.path.relpath(full_path, upload_folder).replace(os.sep, '/')
+        response.headers['X-Accel-Redirect'] = f"{prefix}/{quote(relative)}"
+    
+    response = response.make_conditional(request.environ)
+    if response.status_code == 304:
+        response.headers.pop('X-Sendfile', None)
+        response.headers.pop('X-Accel-Redirect', None)
+    return response
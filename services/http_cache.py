@@ -0,0 +1,256 @@
+"""
+================================================================================
+TheDraftClinic - Politique de Cache HTTP
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module définit les en-têtes de cache des réponses HTML:
+
+- Pages publiques (@public_cache) consultées par un visiteur anonyme:
+  ETag fort calculé à partir des versions du contenu, sans rendu:
+      - version des templates (empreinte des fichiers au démarrage)
+      - version des traductions (empreinte des fichiers de langue)
+      - version des assets compilés (URLs à empreinte des CSS/JS)
+      - version du cache du site (modifiée à chaque enregistrement des
+        paramètres du site ou d'une page)
+      - langue, endpoint et arguments de la vue
+      - versions propres à la vue (ex: Page.updated_at)
+  Une requête conditionnelle (If-None-Match) dont l'ETag correspond reçoit
+  un 304 sans que la vue soit appelée; sinon la page est lue dans le cache
+  de pages complètes (services.page_cache) avec l'ETag pour clé, ou rendue
+  puis mise en cache. Les réponses 200 sont servies avec
+  "public, max-age=HTTP_CACHE_MAX_AGE, stale-while-revalidate=...".
+
+- Toutes les autres réponses HTML (utilisateurs connectés, messages flash,
+  session modifiée par la requête, pages privées):
+  "no-cache, no-store, must-revalidate". Une réponse publique ne porte donc
+  jamais de cookie de session (la langue négociée n'est pas enregistrée en
+  session, seul un choix explicite ?lang= l'est).
+
+Configuration:
+    HTTP_CACHE_MAX_AGE: Durée de fraîcheur des pages publiques (secondes)
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: Durée pendant laquelle une page
+        périmée peut être affichée pendant sa revalidation (secondes)
+
+Fonctions:
+- init_http_cache: Calcule la version des templates, installe la politique
+- public_cache: Décorateur des vues publiques
+- compute_etag: ETag fort d'une liste de versions
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import os                                    # Parcours des templates
+import hashlib                               # Empreintes des versions
+import logging                               # Logging des opérations
+from datetime import datetime                # Année affichée dans les pages
+from functools import wraps
+
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+
+from services.page_cache import get_page_cache
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Durées par défaut (secondes)
+DEFAULT_MAX_AGE = 60
+DEFAULT_STALE_WHILE_REVALIDATE = 300
+
+# En-tête des réponses non mises en cache
+NO_STORE = 'no-cache, no-store, must-revalidate'
+
+# Empreinte des templates (définie par init_http_cache)
+_templates_version = '0'
+
+
+# ==============================================================================
+# VERSIONS ET ETAG
+# ==============================================================================
+
+def _compute_templates_version(folder):
+    """
+    Calcule l'empreinte des fichiers de templates (chemin, taille, date).
+
+    Identique dans tous les workers d'un même déploiement.
+
+    Args:
+        folder (str): Dossier des templates
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f'{os.path.relpath(path, folder)}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode())
+    return digest.hexdigest()[:16]
+
+
+def compute_etag(*parts):
+    """
+    Calcule un ETag fort à partir d'une liste de versions.
+
+    Args:
+        *parts: Valeurs convertibles en chaîne
+
+    Returns:
+        str: ETag (sans guillemets)
+    """
+    payload = '\x1f'.join(str(part) for part in parts)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def is_public_request():
+    """
+    Indique si la requête peut recevoir une réponse publique en cache.
+
+    Returns:
+        bool: True pour un GET/HEAD anonyme sans message flash en attente
+            ni session modifiée (ex: choix de langue par ?lang=)
+    """
+    return (
+        request.method in ('GET', 'HEAD')
+        and not current_user.is_authenticated
+        and '_flashes' not in session
+        and not session.modified
+    )
+
+
+def _base_versions():
+    """Retourne les versions communes à toutes les pages publiques."""
+    from services.assets import get_assets_version
+    from services.site_cache import get_cache_version
+    from utils import i18n
+
+    return (
+        _templates_version,
+        i18n.TRANSLATIONS_VERSION,
+        get_assets_version(),
+        get_cache_version(),
+        i18n.get_locale(),
+        # Année du pied de page
+        datetime.utcnow().year
+    )
+
+
+def _apply_public_headers(response, etag):
+    """Ajoute l'ETag et les en-têtes de cache public à une réponse."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = (
+        f"public, max-age={current_app.config.get('HTTP_CACHE_MAX_AGE', DEFAULT_MAX_AGE)}, "
+        f"stale-while-revalidate="
+        f"{current_app.config.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', DEFAULT_STALE_WHILE_REVALIDATE)}"
+    )
+    # La réponse dépend de la langue (session ou navigateur) et de la connexion
+    response.vary.update(('Cookie', 'Accept-Language'))
+    return response
+
+
+# ==============================================================================
+# DÉCORATEUR DES VUES PUBLIQUES
+# ==============================================================================
+
+def public_cache(version=None):
+    """
+    Décorateur des vues publiques: ETag, 304 et cache public.
+
+    Args:
+        version (callable): Optionnel, reçoit les arguments de la vue et
+            retourne ses versions propres (None: pas de mise en cache,
+            ex: page introuvable)
+
+    Returns:
+        function: Le décorateur
+
+    Example:
+        @bp.route('/page/<slug>')
+        @public_cache(version=get_page_version)
+        def view_page(slug):
+            ...
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not is_public_request():
+                return f(*args, **kwargs)
+
+            extra = version(**kwargs) if version is not None else ()
+            if extra is None:
+                return f(*args, **kwargs)
+
+            etag = compute_etag(
+                *_base_versions(), request.endpoint, sorted(kwargs.items()), extra
+            )
+
+            # Version déjà détenue par le client: aucune requête, aucun rendu
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+                return _apply_public_headers(response, etag)
+
+            # Page complète en cache (l'ETag sert de clé)
+            cache = get_page_cache()
+            cached = cache.get(etag) if cache is not None else None
+            if cached is not None:
+                mimetype, body = cached
+                response = current_app.response_class(body, mimetype=mimetype)
+                return _apply_public_headers(response, etag)
+
+            response = make_response(f(*args, **kwargs))
+            # Session modifiée par la vue: la réponse porte un cookie de
+            # session, elle ne doit être ni partagée ni mise en cache
+            if response.status_code != 200 or session.modified:
+                return response
+            if cache is not None and not response.direct_passthrough:
+                cache.set(etag, response.mimetype, response.get_data())
+            return _apply_public_headers(response, etag)
+        return decorated_function
+    return decorator
+
+
+# ==============================================================================
+# CONFIGURATION DE L'APPLICATION
+# ==============================================================================
+
+def init_http_cache(app):
+    """
+    Calcule la version des templates et installe la politique par défaut.
+
+    Args:
+        app: Instance Flask
+    """
+    global _templates_version
+
+    _templates_version = _compute_templates_version(
+        os.path.join(app.root_path, app.template_folder)
+    )
+
+    @app.after_request
+    def apply_default_cache_policy(response):
+        """Interdit la mise en cache des pages HTML sans politique explicite."""
+        if response.mimetype == 'text/html' and 'Cache-Control' not in response.headers:
+            response.headers['Cache-Control'] = NO_STORE
+            response.headers['Pragma'] = 'no-cache'
+            response.headers['Expires'] = '0'
+        return response
+
+    logger.info(f"Cache HTTP des pages publiques (templates {_templates_version})")
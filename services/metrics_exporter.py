@@ -0,0 +1,361 @@
+"""
+================================================================================
+TheDraftClinic - Export des Métriques (OpenMetrics / Prometheus)
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module produit le texte OpenMetrics de la route /metrics à partir des
+mesures partagées entre workers (services.perf_metrics):
+- requêtes HTTP par endpoint: nombre, durée, rendu des templates, taille
+- pool de connexions: durée d'obtention d'une connexion, connexions
+  utilisées et libres par worker
+- uploads: taille et durée de réception
+- rate limiter: requêtes refusées par limiteur, clés suivies, clés
+  supprimées (éviction, expiration) par stockage
+- traductions: recherches trouvées / absentes des tables compilées
+- cache des pages publiques: lectures trouvées / absentes
+- journal d'activité différé: profondeur de la file, entrées abandonnées
+
+Les histogrammes sont exportés sur des bornes fixes (le) calculées à partir
+des histogrammes log-linéaires; les compteurs des workers sont additionnés,
+les jauges sont exportées par worker (libellé worker = PID).
+
+Configuration:
+    PERF_METRICS: Requis (sans mesures partagées, /metrics répond 404)
+    METRICS_TOKEN: Jeton attendu dans "Authorization: Bearer <jeton>";
+        requis (sans jeton, /metrics répond 404: derrière un proxy local,
+        l'adresse de chaque visiteur serait 127.0.0.1)
+
+Fonctions:
+- init_metrics_exporter: Déclare les sources de mesures (pool, limiteurs...)
+- render_openmetrics: Texte OpenMetrics de toutes les métriques
+- is_scrape_authorized: Vérifie l'accès d'une requête à /metrics
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import hmac                                  # Comparaison du jeton
+import time                                  # Durée d'obtention des connexions
+import logging                               # Logging des opérations
+
+from sqlalchemy import event
+
+from services import perf_metrics
+from services.perf_metrics import observe, register_counter, register_gauge
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Préfixe de toutes les métriques exportées
+METRIC_PREFIX = 'thedraftclinic_'
+
+# Type de contenu OpenMetrics
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Bornes des histogrammes exportés
+DURATION_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+POOL_WAIT_BOUNDS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5)
+SIZE_BOUNDS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+UPLOAD_SIZE_BOUNDS = (65536, 262144, 1048576, 4194304, 16777216, 52428800)
+UPLOAD_DURATION_BOUNDS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Histogrammes: (métrique de perf_metrics, nom exporté, unité, libellé de la clé,
+#                diviseur des valeurs, bornes, description)
+HISTOGRAMS = (
+    (perf_metrics.METRIC_TOTAL, 'http_request_duration_seconds', 'seconds', 'endpoint',
+     1_000_000, DURATION_BOUNDS, 'Durée de traitement des requêtes HTTP'),
+    (perf_metrics.METRIC_RENDER, 'http_template_render_seconds', 'seconds', 'endpoint',
+     1_000_000, DURATION_BOUNDS, 'Temps de rendu des templates'),
+    (perf_metrics.METRIC_SIZE, 'http_response_size_bytes', 'bytes', 'endpoint',
+     1, SIZE_BOUNDS, 'Taille du corps des réponses'),
+    ('db_pool_checkout', 'db_pool_checkout_seconds', 'seconds', None,
+     1_000_000, POOL_WAIT_BOUNDS, "Durée d'obtention d'une connexion du pool"),
+    ('upload_bytes', 'upload_size_bytes', 'bytes', None,
+     1, UPLOAD_SIZE_BOUNDS, 'Taille des fichiers uploadés'),
+    ('upload_duration', 'upload_duration_seconds', 'seconds', None,
+     1_000_000, UPLOAD_DURATION_BOUNDS, 'Durée de réception et de stockage des uploads'),
+)
+
+# Compteurs: (source, nom exporté, libellé, description)
+COUNTERS = (
+    ('ratelimit_rejected', 'ratelimit_rejections', 'limiter',
+     'Requêtes refusées par le rate limiter'),
+    ('ratelimit_evictions', 'ratelimit_evictions', 'limiter',
+     'Clés du rate limiter supprimées pour respecter RATE_LIMIT_MAX_KEYS'),
+    ('ratelimit_expired', 'ratelimit_expired', 'limiter',
+     'Clés expirées supprimées par le balayage du rate limiter'),
+    ('translation_lookups', 'translation_lookups', 'result',
+     'Recherches de traduction (hit: clé trouvée, miss: clé absente)'),
+    ('page_cache_lookups', 'page_cache_lookups', 'result',
+     'Lectures du cache des pages publiques (hit, miss)'),
+    ('activity_log_dropped', 'activity_log_dropped', None,
+     "Entrées du journal d'activité abandonnées (file pleine)"),
+)
+
+# Jauges: (source, nom exporté, libellé, description)
+GAUGES = (
+    ('db_pool_connections', 'db_pool_connections', 'state',
+     'Connexions du pool par état (in_use, idle, overflow)'),
+    ('db_pool_size', 'db_pool_size', None, 'Taille configurée du pool'),
+    ('ratelimit_tracked_keys', 'ratelimit_tracked_keys', 'limiter',
+     'Clés suivies par le stockage du rate limiter'),
+    ('activity_log_queue_depth', 'activity_log_queue_depth', None,
+     "Entrées du journal d'activité en attente d'écriture"),
+)
+
+
+# ==============================================================================
+# SOURCES DE MESURES
+# ==============================================================================
+
+def _instrument_pool(pool):
+    """
+    Chronomètre l'obtention des connexions d'un pool.
+
+    La durée comprend l'attente d'une connexion libre, l'ouverture d'une
+    nouvelle connexion et la vérification pool_pre_ping.
+
+    Args:
+        pool: Pool SQLAlchemy de l'engine
+    """
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            observe('db_pool_checkout', (time.perf_counter() - start) * 1_000_000)
+
+    pool.connect = timed_connect
+
+
+def _pool_gauges(engine):
+    """
+    Retourne la fonction des jauges du pool d'un engine.
+
+    Args:
+        engine: Engine SQLAlchemy
+
+    Returns:
+        callable: Fonction retournant {état: connexions}
+    """
+    def collect():
+        pool = engine.pool
+        # Seul QueuePool (défaut hors SQLite en mémoire) expose ces compteurs
+        if not hasattr(pool, 'checkedout'):
+            return {}
+        return {
+            'in_use': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(0, pool.overflow())
+        }
+    return collect
+
+
+def _page_cache_stats():
+    """Retourne les lectures du cache de pages (vide si désactivé)."""
+    from services.page_cache import get_page_cache
+
+    cache = get_page_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def _rate_limit_stat(key):
+    """
+    Retourne la fonction d'une mesure des stockages du rate limiter.
+
+    Args:
+        key (str): Clé des stats du stockage (ex: 'evictions')
+
+    Returns:
+        callable: Fonction retournant {limiteurs: valeur}; les valeurs
+            inconnues (tracked_keys du stockage Redis) sont omises
+    """
+    from security.rate_limiter import get_rate_limit_backend_stats
+
+    def collect():
+        return {
+            limiters: stats[key]
+            for limiters, stats in get_rate_limit_backend_stats().items()
+            if stats[key] is not None
+        }
+    return collect
+
+
+def _activity_log_stat(key):
+    """
+    Retourne la fonction d'une métrique de l'écrivain différé du journal.
+
+    Args:
+        key (str): Clé de get_activity_log_stats (ex: 'dropped')
+
+    Returns:
+        callable: Fonction retournant {'': valeur} (vide si désactivé)
+    """
+    from services.activity_log_writer import get_activity_log_stats
+
+    def collect():
+        stats = get_activity_log_stats()
+        return {'': stats[key]} if stats is not None else {}
+    return collect
+
+
+def init_metrics_exporter(app):
+    """
+    Déclare les sources de mesures exportées (si PERF_METRICS est actif).
+
+    Args:
+        app: Instance Flask
+    """
+    if not perf_metrics.is_perf_metrics_enabled():
+        return
+
+    from app import db
+    from security.rate_limiter import get_rate_limit_rejections
+    from utils.i18n import LOOKUP_STATS
+
+    with app.app_context():
+        engine = db.engine
+
+    _instrument_pool(engine.pool)
+    # engine.dispose() remplace le pool: le nouveau est instrumenté à son tour
+    event.listen(engine, 'engine_disposed', lambda disposed: _instrument_pool(disposed.pool))
+
+    register_gauge('db_pool_connections', _pool_gauges(engine))
+    register_gauge('db_pool_size', lambda: (
+        {'': engine.pool.size()} if hasattr(engine.pool, 'size') else {}
+    ))
+    register_counter('ratelimit_rejected', get_rate_limit_rejections)
+    register_counter('ratelimit_evictions', _rate_limit_stat('evictions'))
+    register_counter('ratelimit_expired', _rate_limit_stat('expired'))
+    register_gauge('ratelimit_tracked_keys', _rate_limit_stat('tracked_keys'))
+    register_counter('translation_lookups', lambda: dict(LOOKUP_STATS))
+    register_counter('page_cache_lookups', _page_cache_stats)
+    register_counter('activity_log_dropped', _activity_log_stat('dropped'))
+    register_gauge('activity_log_queue_depth', _activity_log_stat('queue_depth'))
+
+    if app.config.get('METRICS_TOKEN'):
+        logger.info("Export des métriques activé (/metrics)")
+    else:
+        logger.warning("METRICS_TOKEN non configuré: /metrics désactivé")
+
+
+# ==============================================================================
+# ACCÈS
+# ==============================================================================
+
+def is_scrape_authorized(req, token):
+    """
+    Vérifie qu'une requête peut lire /metrics.
+
+    Args:
+        req: Requête Flask
+        token (str): METRICS_TOKEN (None: accès toujours refusé)
+
+    Returns:
+        bool: True si l'accès est autorisé
+    """
+    if not token:
+        return False
+    return hmac.compare_digest(req.headers.get('Authorization', ''), f'Bearer {token}')
+
+
+# ==============================================================================
+# FORMAT OPENMETRICS
+# ==============================================================================
+
+def _escape(value):
+    """Échappe une valeur de libellé OpenMetrics."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    """
+    Formate les libellés d'un échantillon.
+
+    Args:
+        pairs (list): Couples (nom, valeur), les valeurs None sont ignorées
+
+    Returns:
+        str: Ex: '{endpoint="main.index",le="0.5"}', '' sans libellé
+    """
+    pairs = [(name, value) for name, value in pairs if value is not None]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    """Formate une valeur numérique (entiers sans décimale)."""
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+def _header(lines, name, kind, description, unit=None):
+    """Ajoute les lignes TYPE, UNIT et HELP d'une famille de métriques."""
+    lines.append(f'# TYPE {name} {kind}')
+    if unit:
+        lines.append(f'# UNIT {name} {unit}')
+    lines.append(f'# HELP {name} {description}')
+
+
+def render_openmetrics():
+    """
+    Produit le texte OpenMetrics de toutes les métriques.
+
+    Returns:
+        str: Exposition terminée par "# EOF"
+    """
+    histograms = perf_metrics.get_perf_histograms()
+    counters = perf_metrics.get_perf_counters()
+    gauges = perf_metrics.get_perf_gauges()
+    lines = []
+
+    for metric, exported, unit, key_label, scale, bounds, description in HISTOGRAMS:
+        name = METRIC_PREFIX + exported
+        series = sorted(
+            (key, histogram) for (key, source), histogram in histograms.items()
+            if source == metric and histogram.count
+        )
+        _header(lines, name, 'histogram', description, unit)
+        for key, histogram in series:
+            base = [(key_label, key)] if key_label else []
+            for bound in bounds:
+                labels = _labels(base + [('le', repr(float(bound)))])
+                lines.append(f'{name}_bucket{labels} {histogram.count_le(bound * scale)}')
+            lines.append(f'{name}_bucket{_labels(base + [("le", "+Inf")])} {histogram.count}')
+            lines.append(f'{name}_count{_labels(base)} {histogram.count}')
+            lines.append(f'{name}_sum{_labels(base)} {_number(histogram.total / scale)}')
+
+    for source, exported, label, description in COUNTERS:
+        name = METRIC_PREFIX + exported
+        _header(lines, name, 'counter', description)
+        for (counter, value_label), value in sorted(counters.items()):
+            if counter == source:
+                labels = _labels([(label, value_label if label else None)])
+                lines.append(f'{name}_total{labels} {_number(value)}')
+
+    for source, exported, label, description in GAUGES:
+        name = METRIC_PREFIX + exported
+        _header(lines, name, 'gauge', description)
+        for gauge, value_label, pid, value in gauges:
+            if gauge == source:
+                labels = _labels([(label, value_label if label else None), ('worker', pid)])
+                lines.append(f'{name}{labels} {_number(value)}')
+
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,304 @@
+"""
+================================================================================
+TheDraftClinic - Cache des Pages Publiques Complètes
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module conserve le HTML complet des pages publiques servies aux visiteurs
+anonymes (accueil, services, à propos, contact, pages CMS).
+
+Fonctionnement:
+    La clé d'une page est son ETag (services.http_cache), qui couvre
+    l'endpoint, ses arguments, la langue, la version des paramètres du site
+    et des pages, celle des traductions et celle des templates. Une page en
+    cache est donc servie sans requête SQL ni rendu Jinja, et toute
+    modification produit de nouvelles clés: les anciennes entrées sont
+    simplement évincées (LRU). Les sessions connectées et les requêtes avec
+    messages flash en attente ne passent jamais par le cache.
+
+Stockages (PAGE_CACHE_URL):
+    - memory:// (défaut): LRU en mémoire du processus
+    - file:///chemin: fichiers partagés par les workers d'une machine
+      (écriture atomique, éviction des moins récemment lus)
+    - none://: cache désactivé
+
+Fonctions:
+- init_page_cache: Crée le stockage configuré
+- get_page_cache: Retourne le stockage (None si désactivé)
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import os                                    # Fichiers du stockage partagé
+import time                                  # Échéance des balayages
+import hashlib                               # Noms des fichiers
+import threading                             # Verrou du LRU
+import logging                               # Logging des opérations
+from collections import OrderedDict          # Ordre d'utilisation (LRU)
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Nombre de pages conservées par défaut
+DEFAULT_MAX_ENTRIES = 500
+
+# Secondes entre deux balayages du stockage fichier
+DEFAULT_SWEEP_INTERVAL = 60
+
+# Stockage configuré (défini par init_page_cache)
+_cache = None
+
+
+# ==============================================================================
+# STOCKAGES
+# ==============================================================================
+
+class PageCacheBackend:
+    """
+    Interface commune des stockages du cache de pages.
+
+    Les valeurs sont des couples (mimetype, corps en octets).
+
+    Attributes:
+        hits (int): Pages servies depuis le cache (processus courant)
+        misses (int): Pages absentes du cache (processus courant)
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Lit une page.
+
+        Args:
+            key (str): Clé de la page
+
+        Returns:
+            tuple: (mimetype, corps), ou None si absente
+        """
+        raise NotImplementedError
+
+    def set(self, key, mimetype, body):
+        """
+        Enregistre une page.
+
+        Args:
+            key (str): Clé de la page
+            mimetype (str): Type de contenu
+            body (bytes): Corps de la réponse
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """Supprime toutes les pages."""
+        raise NotImplementedError
+
+    def stats(self):
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            dict: hits, misses
+        """
+        return {'hit': self.hits, 'miss': self.misses}
+
+
+class MemoryPageCache(PageCacheBackend):
+    """
+    Pages en mémoire du processus avec éviction LRU.
+
+    Attributes:
+        max_entries (int): Nombre maximum de pages conservées
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        super().__init__()
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, mimetype, body):
+        with self._lock:
+            self._data[key] = (mimetype, body)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class FilePageCache(PageCacheBackend):
+    """
+    Pages stockées dans un dossier partagé par les workers d'une machine.
+
+    Chaque page est un fichier (type de contenu sur la première ligne, puis
+    le corps) écrit de manière atomique. Une lecture rafraîchit la date de
+    modification du fichier; au plus une fois par sweep_interval, les
+    fichiers les plus anciens au-delà de max_entries sont supprimés.
+
+    Attributes:
+        folder (str): Dossier des pages
+        max_entries (int): Nombre maximum de pages conservées
+        sweep_interval (int): Secondes entre deux balayages
+    """
+
+    def __init__(self, folder, max_entries=DEFAULT_MAX_ENTRIES,
+                 sweep_interval=DEFAULT_SWEEP_INTERVAL):
+        super().__init__()
+        self.folder = folder
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, key):
+        """Retourne le chemin du fichier d'une clé."""
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, f'{name}.page')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                mimetype = f.readline().rstrip(b'\n').decode('ascii')
+                body = f.read()
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return mimetype, body
+
+    def set(self, key, mimetype, body):
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(mimetype.encode('ascii') + b'\n')
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Écriture du cache de page impossible: {e}")
+            return
+
+        now = time.time()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self._sweep()
+
+    def _sweep(self):
+        """Supprime les pages les moins récemment lues au-delà de max_entries."""
+        entries = []
+        for entry in os.scandir(self.folder):
+            try:
+                if entry.name.endswith('.page'):
+                    entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith('.page'):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+def create_page_cache(url, max_entries=DEFAULT_MAX_ENTRIES):
+    """
+    Crée le stockage du cache de pages à partir de son URL.
+
+    En cas d'URL inconnue ou de dossier inaccessible, le stockage en
+    mémoire est utilisé et l'erreur est journalisée.
+
+    Args:
+        url (str): memory://, file:///chemin ou none://
+        max_entries (int): Nombre maximum de pages conservées
+
+    Returns:
+        PageCacheBackend: Le stockage, ou None si désactivé
+    """
+    url = url or 'memory://'
+
+    if url.startswith('none://'):
+        return None
+
+    try:
+        if url.startswith('file:///'):
+            return FilePageCache(url[len('file://'):], max_entries=max_entries)
+        if not url.startswith('memory://'):
+            logger.error(f"Stockage du cache de pages inconnu: {url}")
+    except OSError as e:
+        logger.error(f"Erreur d'ouverture du cache de pages: {e}")
+
+    return MemoryPageCache(max_entries=max_entries)
+
+
+# ==============================================================================
+# CONFIGURATION DE L'APPLICATION
+# ==============================================================================
+
+def init_page_cache(app):
+    """
+    Crée le stockage du cache de pages configuré.
+
+    Configuration:
+        PAGE_CACHE_URL: memory:// (défaut), file:///chemin ou none://
+        PAGE_CACHE_MAX_ENTRIES: Nombre maximum de pages conservées
+
+    Args:
+        app: Instance Flask
+    """
+    global _cache
+
+    _cache = create_page_cache(
+        app.config.get('PAGE_CACHE_URL'),
+        max_entries=app.config.get('PAGE_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+    )
+    if _cache is not None:
+        logger.info(f"Cache des pages publiques: {type(_cache).__name__}")
+
+
+def get_page_cache():
+    """
+    Retourne le stockage du cache de pages.
+
+    Returns:
+        PageCacheBackend: Le stockage, ou None si désactivé
+    """
+    return _cache
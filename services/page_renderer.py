@@ -0,0 +1,130 @@
+"""
+================================================================================
+TheDraftClinic - Rendu et Cache du Contenu des Pages
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module convertit le contenu des pages dynamiques (HTML ou Markdown) et
+garde le résultat en mémoire.
+
+Fonctionnement:
+    Le HTML et la table des matières sont calculés une seule fois, à
+    l'enregistrement de la page (Page.render_content), et stockés en base
+    à côté du contenu source. À l'affichage, le rendu est lu dans un cache
+    LRU par processus dont la clé (page_id, updated_at) change à chaque
+    modification: aucune conversion Markdown n'est faite par les vues, et
+    le contenu n'est relu en base qu'à la première vue d'une version.
+
+Fonctions:
+- render_page_content: Convertit un contenu en (HTML, table des matières)
+- get_cached_render / cache_render: Lecture et écriture du cache LRU
+- clear_render_cache: Vide le cache du processus
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import threading                             # Verrou du cache
+import logging                               # Logging des opérations
+from collections import OrderedDict          # Ordre d'utilisation (LRU)
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Extensions Markdown des pages
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code', 'toc']
+
+# Nombre de rendus conservés par processus
+RENDER_CACHE_SIZE = 128
+
+# Cache LRU {(page_id, updated_at): (html, toc)} et son verrou
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+# ==============================================================================
+# RENDU
+# ==============================================================================
+
+def render_page_content(content, content_format):
+    """
+    Convertit le contenu d'une page en HTML.
+
+    Args:
+        content (str): Contenu source
+        content_format (str): 'html' ou 'markdown'
+
+    Returns:
+        tuple: (html, toc) - toc est le HTML de la table des matières
+            (Markdown avec titres), None sinon
+    """
+    content = content or ''
+    if content_format != 'markdown':
+        return content, None
+
+    try:
+        import markdown
+    except ImportError:
+        logger.warning("Module markdown non installé, retour au contenu brut")
+        return content, None
+
+    converter = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    html = converter.convert(content)
+    toc = getattr(converter, 'toc', None)
+    # Table des matières vide (aucun titre): non conservée
+    if not toc or '<li' not in toc:
+        toc = None
+    return html, toc
+
+
+# ==============================================================================
+# CACHE LRU
+# ==============================================================================
+
+def get_cached_render(key):
+    """
+    Retourne un rendu du cache.
+
+    Args:
+        key (tuple): (page_id, updated_at)
+
+    Returns:
+        tuple: (html, toc), ou None si absent
+    """
+    with _lock:
+        rendered = _cache.get(key)
+        if rendered is not None:
+            _cache.move_to_end(key)
+        return rendered
+
+
+def cache_render(key, rendered):
+    """
+    Ajoute un rendu au cache (le moins récemment utilisé est évincé).
+
+    Args:
+        key (tuple): (page_id, updated_at)
+        rendered (tuple): (html, toc)
+    """
+    with _lock:
+        _cache[key] = rendered
+        _cache.move_to_end(key)
+        while len(_cache) > RENDER_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_render_cache():
+    """Vide le cache des rendus (processus courant)."""
+    with _lock:
+        _cache.clear()
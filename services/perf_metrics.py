@@ -0,0 +1,761 @@
+"""
+================================================================================
+TheDraftClinic - Métriques de Latence par Endpoint
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module mesure chaque requête HTTP et en tient des histogrammes par
+endpoint Flask (blueprint.vue):
+- total: durée de traitement de la requête (microsecondes)
+- render: temps de rendu des templates (microsecondes)
+- size: taille du corps de la réponse (octets)
+
+Histogrammes:
+    Les histogrammes sont log-linéaires (à la manière d'HdrHistogram): les
+    valeurs 0 à 31 ont chacune leur classe, puis chaque puissance de deux
+    est découpée en 32 classes de même largeur. L'erreur relative d'un
+    centile est donc bornée (~1,5%) quelle que soit l'échelle, pour un
+    nombre de classes réduit (une centaine par histogramme en pratique).
+
+Agrégation entre workers:
+    Chaque worker cumule ses mesures en mémoire puis, au plus une fois par
+    PERF_METRICS_FLUSH_INTERVAL, ajoute ses compteurs au fichier SQLite
+    partagé (UPSERT count = count + delta). Les compteurs étant additifs,
+    les mesures des workers arrêtés sont conservées et la page admin lit
+    l'agrégat de tous les workers de la machine.
+
+    Les autres modules déclarent leurs propres mesures:
+    - observe(): valeur ajoutée à un histogramme (ex: taille d'un upload)
+    - register_counter(): compteurs cumulés du processus (ex: rejets du
+      rate limiter); seul l'écart depuis la dernière écriture est ajouté
+    - register_gauge(): valeurs instantanées (ex: connexions utilisées),
+      conservées par worker et ignorées quand le worker ne les met plus à
+      jour
+
+Configuration:
+    PERF_METRICS: Active les mesures (défaut: désactivées)
+    PERF_METRICS_STORE: Fichier SQLite partagé entre les workers
+    PERF_METRICS_FLUSH_INTERVAL: Secondes entre deux écritures d'un worker
+
+Fonctions:
+- init_perf_metrics: Active les mesures pour l'application
+- get_perf_stats: Centiles par endpoint, tous workers (page admin)
+- get_perf_histograms: Histogrammes agrégés (export des métriques)
+- get_perf_counters / get_perf_gauges: Compteurs et jauges agrégés
+- observe / register_counter / register_gauge: Mesures des autres modules
+- reset_perf_stats: Vide les mesures de tous les workers
+- is_perf_metrics_enabled: Indique si les mesures sont actives
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import os                                    # Création du dossier du fichier
+import math                                  # Rang des centiles
+import time                                  # Chronométrage des requêtes
+import atexit                                # Écriture finale à l'arrêt
+import sqlite3                               # Stockage partagé entre workers
+import threading                             # Verrous et connexions par thread
+import logging                               # Logging des opérations
+
+from flask import g, request, before_render_template, template_rendered
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Bits de précision des classes: 2**5 = 32 classes par puissance de deux
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+# Métriques mesurées pour chaque endpoint
+METRIC_TOTAL = 'total'
+METRIC_RENDER = 'render'
+METRIC_SIZE = 'size'
+
+# Centiles affichés sur la page admin
+PERCENTILES = (0.50, 0.95, 0.99)
+
+# Secondes entre deux écritures d'un worker dans le fichier partagé
+DEFAULT_FLUSH_INTERVAL = 10
+
+# Âge minimum (secondes) au-delà duquel la jauge d'un worker est ignorée
+GAUGE_MIN_MAX_AGE = 60
+
+# Registre du processus et stockage partagé (définis par init_perf_metrics)
+_registry = None
+_store = None
+
+# Sources des compteurs et des jauges: {nom: fonction -> {libellé: valeur}}
+_counter_sources = {}
+_gauge_sources = {}
+
+# Dernières valeurs des compteurs écrites par ce processus
+_written_counters = {}
+
+
+# ==============================================================================
+# HISTOGRAMME LOG-LINÉAIRE
+# ==============================================================================
+
+def bucket_index(value):
+    """
+    Retourne la classe d'une valeur entière positive.
+
+    Args:
+        value (int): Valeur mesurée (µs ou octets)
+
+    Returns:
+        int: Index de la classe
+    """
+    value = max(0, int(value))
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKET_COUNT + (value >> shift) - SUB_BUCKET_COUNT
+
+
+def bucket_lower_bound(index):
+    """
+    Retourne la plus petite valeur d'une classe.
+
+    Args:
+        index (int): Index de la classe
+
+    Returns:
+        int: Borne inférieure (incluse)
+    """
+    if index < SUB_BUCKET_COUNT:
+        return index
+    shift = index // SUB_BUCKET_COUNT - 1
+    return (index % SUB_BUCKET_COUNT + SUB_BUCKET_COUNT) << shift
+
+
+class Histogram:
+    """
+    Histogramme log-linéaire creux.
+
+    Attributes:
+        buckets (dict): Nombre de valeurs par index de classe
+        count (int): Nombre de valeurs
+        total (int): Somme des valeurs
+        max (int): Plus grande valeur
+    """
+
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        """
+        Ajoute une valeur.
+
+        Args:
+            value (int): Valeur mesurée
+        """
+        value = max(0, int(value))
+        index = bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Ajoute les valeurs d'un autre histogramme.
+
+        Args:
+            other (Histogram): Histogramme à ajouter
+        """
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction):
+        """
+        Retourne un centile (milieu de la classe qui le contient).
+
+        Args:
+            fraction (float): Centile entre 0 et 1
+
+        Returns:
+            float: Valeur du centile, 0 si l'histogramme est vide
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                lower = bucket_lower_bound(index)
+                upper = bucket_lower_bound(index + 1) - 1
+                return min((lower + upper) / 2, self.max)
+        return float(self.max)
+
+    def mean(self):
+        """
+        Retourne la moyenne des valeurs.
+
+        Returns:
+            float: Moyenne, 0 si l'histogramme est vide
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def count_le(self, bound):
+        """
+        Retourne le nombre de valeurs inférieures ou égales à une borne.
+
+        Le décompte est exact aux bornes de classes et approché (classe
+        entière) à l'intérieur d'une classe.
+
+        Args:
+            bound (int): Borne supérieure incluse
+
+        Returns:
+            int: Nombre de valeurs
+        """
+        limit = bucket_index(bound)
+        return sum(count for index, count in self.buckets.items() if index <= limit)
+
+
+# ==============================================================================
+# REGISTRE DU PROCESSUS
+# ==============================================================================
+
+class MetricsRegistry:
+    """
+    Mesures du worker courant non encore écrites dans le stockage partagé.
+
+    Attributes:
+        flush_interval (float): Secondes entre deux écritures
+    """
+
+    def __init__(self, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._next_flush = time.monotonic() + flush_interval
+
+    def record(self, endpoint, metric, value):
+        """
+        Ajoute une mesure.
+
+        Args:
+            endpoint (str): Endpoint Flask
+            metric (str): METRIC_TOTAL, METRIC_RENDER ou METRIC_SIZE
+            value (int): Valeur mesurée
+        """
+        key = (endpoint, metric)
+        with self._lock:
+            histogram = self._pending.get(key)
+            if histogram is None:
+                histogram = self._pending[key] = Histogram()
+            histogram.record(value)
+
+    def drain(self):
+        """
+        Retourne et vide les mesures en attente.
+
+        Returns:
+            dict: Histogramme par couple (endpoint, métrique)
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._next_flush = time.monotonic() + self.flush_interval
+        return pending
+
+    def flush_due(self):
+        """
+        Indique si l'intervalle d'écriture est écoulé.
+
+        Returns:
+            bool: True s'il faut écrire les mesures en attente
+        """
+        return time.monotonic() >= self._next_flush
+
+
+# ==============================================================================
+# STOCKAGE PARTAGÉ ENTRE WORKERS
+# ==============================================================================
+
+class SQLiteMetricsStore:
+    """
+    Histogrammes cumulés dans un fichier SQLite partagé par les workers.
+
+    Chaque écriture ajoute les compteurs d'un worker à ceux du fichier dans
+    une transaction unique; le mode WAL permet les lectures concurrentes.
+
+    Attributes:
+        path (str): Chemin du fichier SQLite
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Une connexion par thread (sqlite3 n'autorise pas le partage)
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS perf_buckets ('
+            'endpoint TEXT NOT NULL, metric TEXT NOT NULL, bucket INTEGER NOT NULL, '
+            'count INTEGER NOT NULL, PRIMARY KEY (endpoint, metric, bucket))'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS perf_totals ('
+            'endpoint TEXT NOT NULL, metric TEXT NOT NULL, count INTEGER NOT NULL, '
+            'total INTEGER NOT NULL, max INTEGER NOT NULL, PRIMARY KEY (endpoint, metric))'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS perf_counters ('
+            'name TEXT NOT NULL, label TEXT NOT NULL, value INTEGER NOT NULL, '
+            'PRIMARY KEY (name, label))'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS perf_gauges ('
+            'name TEXT NOT NULL, label TEXT NOT NULL, pid INTEGER NOT NULL, '
+            'value REAL NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (name, label, pid))'
+        )
+
+    def _connection(self):
+        """Retourne la connexion SQLite du thread courant."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            # Nouvelle connexion après un fork (workers Gunicorn)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA busy_timeout=5000')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, histograms, counters=None, gauges=None, gauge_max_age=GAUGE_MIN_MAX_AGE):
+        """
+        Ajoute les mesures d'un worker aux valeurs partagées.
+
+        Args:
+            histograms (dict): Histogramme par couple (endpoint, métrique)
+            counters (dict): Écart de chaque compteur par couple (nom, libellé)
+            gauges (dict): Valeur de chaque jauge par couple (nom, libellé)
+            gauge_max_age (float): Âge au-delà duquel les jauges sont supprimées
+        """
+        if not histograms and not counters and not gauges:
+            return
+        now = time.time()
+        pid = os.getpid()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT INTO perf_buckets (endpoint, metric, bucket, count) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(endpoint, metric, bucket) DO UPDATE SET count = count + excluded.count',
+                [(endpoint, metric, index, count)
+                 for (endpoint, metric), histogram in histograms.items()
+                 for index, count in histogram.buckets.items()]
+            )
+            conn.executemany(
+                'INSERT INTO perf_totals (endpoint, metric, count, total, max) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(endpoint, metric) DO UPDATE SET '
+                'count = count + excluded.count, total = total + excluded.total, '
+                'max = MAX(max, excluded.max)',
+                [(endpoint, metric, histogram.count, histogram.total, histogram.max)
+                 for (endpoint, metric), histogram in histograms.items()]
+            )
+            conn.executemany(
+                'INSERT INTO perf_counters (name, label, value) VALUES (?, ?, ?) '
+                'ON CONFLICT(name, label) DO UPDATE SET value = value + excluded.value',
+                [(name, label, value) for (name, label), value in (counters or {}).items()]
+            )
+            if gauges:
+                conn.executemany(
+                    'INSERT INTO perf_gauges (name, label, pid, value, updated_at) VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT(name, label, pid) DO UPDATE SET '
+                    'value = excluded.value, updated_at = excluded.updated_at',
+                    [(name, label, pid, value, now) for (name, label), value in gauges.items()]
+                )
+                # Jauges des workers arrêtés ou inactifs
+                conn.execute('DELETE FROM perf_gauges WHERE updated_at < ?', (now - gauge_max_age,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def load(self):
+        """
+        Lit les histogrammes cumulés de tous les workers.
+
+        Returns:
+            dict: Histogramme par couple (endpoint, métrique)
+        """
+        conn = self._connection()
+        histograms = {}
+        for endpoint, metric, count, total, maximum in conn.execute(
+            'SELECT endpoint, metric, count, total, max FROM perf_totals'
+        ):
+            histogram = histograms[(endpoint, metric)] = Histogram()
+            histogram.count = count
+            histogram.total = total
+            histogram.max = maximum
+        for endpoint, metric, index, count in conn.execute(
+            'SELECT endpoint, metric, bucket, count FROM perf_buckets'
+        ):
+            histogram = histograms.get((endpoint, metric))
+            if histogram is not None:
+                histogram.buckets[index] = count
+        return histograms
+
+    def load_counters(self):
+        """
+        Lit les compteurs cumulés de tous les workers.
+
+        Returns:
+            dict: Valeur par couple (nom, libellé)
+        """
+        rows = self._connection().execute('SELECT name, label, value FROM perf_counters')
+        return {(name, label): value for name, label, value in rows}
+
+    def load_gauges(self, max_age):
+        """
+        Lit les jauges récentes de chaque worker.
+
+        Args:
+            max_age (float): Âge maximum (secondes) d'une valeur
+
+        Returns:
+            list: Tuples (nom, libellé, pid, valeur)
+        """
+        return self._connection().execute(
+            'SELECT name, label, pid, value FROM perf_gauges WHERE updated_at >= ? '
+            'ORDER BY name, label, pid',
+            (time.time() - max_age,)
+        ).fetchall()
+
+    def reset(self):
+        """Supprime les histogrammes et les compteurs (les jauges restent)."""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('DELETE FROM perf_buckets')
+        conn.execute('DELETE FROM perf_totals')
+        conn.execute('DELETE FROM perf_counters')
+        conn.execute('COMMIT')
+
+
+def _collect(sources):
+    """
+    Interroge des sources de compteurs ou de jauges.
+
+    Args:
+        sources (dict): Fonction de chaque nom de mesure
+
+    Returns:
+        dict: Valeur par couple (nom, libellé)
+    """
+    values = {}
+    for name, collect in list(sources.items()):
+        try:
+            for label, value in collect().items():
+                values[(name, label)] = value
+        except Exception as e:
+            logger.warning(f"Lecture de la mesure {name} impossible: {e}")
+    return values
+
+
+def _gauge_max_age():
+    """Retourne l'âge au-delà duquel la jauge d'un worker est ignorée."""
+    return max(GAUGE_MIN_MAX_AGE, 3 * _registry.flush_interval)
+
+
+def flush_perf_metrics():
+    """
+    Écrit les mesures en attente du worker dans le stockage partagé.
+
+    Une erreur d'écriture (fichier verrouillé trop longtemps) est journalisée:
+    les histogrammes concernés sont abandonnés, les écarts des compteurs
+    seront écrits à la tentative suivante.
+    """
+    if _registry is None:
+        return
+    pending = _registry.drain()
+
+    totals = _collect(_counter_sources)
+    counters = {
+        key: value - _written_counters.get(key, 0)
+        for key, value in totals.items()
+        if key not in _written_counters or value != _written_counters[key]
+    }
+    gauges = _collect(_gauge_sources)
+
+    try:
+        _store.add(pending, counters, gauges, _gauge_max_age())
+    except sqlite3.Error as e:
+        logger.warning(f"Écriture des métriques de latence impossible: {e}")
+        return
+    _written_counters.update(totals)
+
+
+# ==============================================================================
+# MESURES DES AUTRES MODULES
+# ==============================================================================
+
+def observe(metric, value, key=''):
+    """
+    Ajoute une valeur à un histogramme partagé (sans effet si désactivé).
+
+    Args:
+        metric (str): Nom de la mesure (ex: 'upload_bytes')
+        value (int): Valeur entière (µs, octets...)
+        key (str): Libellé optionnel (endpoint, type...)
+    """
+    if _registry is not None:
+        _registry.record(key, metric, value)
+
+
+def register_counter(name, collect):
+    """
+    Déclare une source de compteurs cumulés du processus.
+
+    Args:
+        name (str): Nom de la mesure
+        collect (callable): Retourne {libellé: valeur cumulée}
+    """
+    _counter_sources[name] = collect
+
+
+def register_gauge(name, collect):
+    """
+    Déclare une source de jauges du processus.
+
+    Args:
+        name (str): Nom de la mesure
+        collect (callable): Retourne {libellé: valeur instantanée}
+    """
+    _gauge_sources[name] = collect
+
+
+# ==============================================================================
+# MESURE DES REQUÊTES HTTP
+# ==============================================================================
+
+def _render_started(sender, template, context, **extra):
+    """Note le début du rendu d'un template."""
+    starts = g.get('_perf_render_starts')
+    if starts is not None:
+        starts.append(time.perf_counter())
+
+
+def _render_finished(sender, template, context, **extra):
+    """Ajoute la durée du rendu (templates de premier niveau seulement)."""
+    starts = g.get('_perf_render_starts')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    # Un render_template appelé pendant un rendu est déjà compris dans le parent
+    if not starts:
+        g._perf_render = g.get('_perf_render', 0.0) + elapsed
+
+
+# ==============================================================================
+# CONSULTATION
+# ==============================================================================
+
+def get_perf_histograms():
+    """
+    Retourne les histogrammes agrégés de tous les workers.
+
+    Les mesures en attente du worker courant sont d'abord écrites.
+
+    Returns:
+        dict: Histogramme par couple (endpoint, métrique), vide si désactivé
+    """
+    if _registry is None:
+        return {}
+    flush_perf_metrics()
+    try:
+        return _store.load()
+    except sqlite3.Error as e:
+        logger.warning(f"Lecture des métriques de latence impossible: {e}")
+        return {}
+
+
+def get_perf_counters():
+    """
+    Retourne les compteurs agrégés de tous les workers.
+
+    Returns:
+        dict: Valeur par couple (nom, libellé), vide si désactivé
+    """
+    if _registry is None:
+        return {}
+    flush_perf_metrics()
+    try:
+        return _store.load_counters()
+    except sqlite3.Error as e:
+        logger.warning(f"Lecture des compteurs impossible: {e}")
+        return {}
+
+
+def get_perf_gauges():
+    """
+    Retourne les jauges récentes de chaque worker.
+
+    Returns:
+        list: Tuples (nom, libellé, pid, valeur), vide si désactivé
+    """
+    if _registry is None:
+        return []
+    flush_perf_metrics()
+    try:
+        return _store.load_gauges(_gauge_max_age())
+    except sqlite3.Error as e:
+        logger.warning(f"Lecture des jauges impossible: {e}")
+        return []
+
+
+def _summary(histogram, scale=1):
+    """
+    Résume un histogramme.
+
+    Args:
+        histogram (Histogram): Histogramme (ou None)
+        scale (float): Diviseur des valeurs (1000 pour des µs en ms)
+
+    Returns:
+        dict: count, avg, p50, p95, p99, max (None si pas de mesure)
+    """
+    if histogram is None or not histogram.count:
+        return None
+    summary = {
+        'count': histogram.count,
+        'avg': histogram.mean() / scale,
+        'max': histogram.max / scale
+    }
+    for fraction in PERCENTILES:
+        summary[f'p{int(fraction * 100)}'] = histogram.percentile(fraction) / scale
+    return summary
+
+
+def get_perf_stats():
+    """
+    Résume les mesures de chaque endpoint, tous workers confondus.
+
+    Returns:
+        list: Un dict par endpoint (endpoint, requests, total_ms, render_ms,
+            size_bytes, cumulative_ms), trié par temps cumulé; total_ms et
+            render_ms en ms, size_bytes en octets (résumés de _summary)
+    """
+    histograms = get_perf_histograms()
+    endpoints = sorted({endpoint for endpoint, _ in histograms})
+
+    summaries = []
+    for endpoint in endpoints:
+        total = histograms.get((endpoint, METRIC_TOTAL))
+        if total is None or not total.count:
+            continue
+        summaries.append({
+            'endpoint': endpoint,
+            'requests': total.count,
+            'cumulative_ms': total.total / 1000,
+            'total_ms': _summary(total, 1000),
+            'render_ms': _summary(histograms.get((endpoint, METRIC_RENDER)), 1000),
+            'size_bytes': _summary(histograms.get((endpoint, METRIC_SIZE)))
+        })
+
+    summaries.sort(key=lambda summary: summary['cumulative_ms'], reverse=True)
+    return summaries
+
+
+def reset_perf_stats():
+    """
+    Vide les histogrammes et les compteurs de tous les workers.
+
+    Les mesures en attente des autres workers (au plus un intervalle
+    d'écriture) seront ajoutées après la remise à zéro.
+    """
+    if _registry is None:
+        return
+    _registry.drain()
+    _store.reset()
+
+
+def is_perf_metrics_enabled():
+    """
+    Indique si les mesures de latence sont actives.
+
+    Returns:
+        bool: True si actives
+    """
+    return _registry is not None
+
+
+# ==============================================================================
+# CONFIGURATION DE L'APPLICATION
+# ==============================================================================
+
+def init_perf_metrics(app):
+    """
+    Active les mesures de latence si PERF_METRICS est vrai.
+
+    Args:
+        app: Instance Flask
+    """
+    global _registry, _store
+
+    if not app.config.get('PERF_METRICS'):
+        return
+
+    _store = SQLiteMetricsStore(app.config['PERF_METRICS_STORE'])
+    _registry = MetricsRegistry(
+        app.config.get('PERF_METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+    )
+    atexit.register(flush_perf_metrics)
+
+    before_render_template.connect(_render_started, app)
+    template_rendered.connect(_render_finished, app)
+
+    @app.before_request
+    def start_perf_measure():
+        """Démarre la mesure de la requête."""
+        if request.endpoint not in ('static', 'assets'):
+            g._perf_start = time.perf_counter()
+            g._perf_render_starts = []
+
+    @app.after_request
+    def record_perf_measure(response):
+        """Enregistre durée, temps de rendu et taille de la réponse."""
+        start = g.pop('_perf_start', None)
+        if start is None:
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        _registry.record(endpoint, METRIC_TOTAL, (time.perf_counter() - start) * 1_000_000)
+        render = g.pop('_perf_render', None)
+        if render is not None:
+            _registry.record(endpoint, METRIC_RENDER, render * 1_000_000)
+        # Réponses en flux (longueur inconnue): taille non mesurée
+        if response.content_length is not None:
+            _registry.record(endpoint, METRIC_SIZE, response.content_length)
+
+        if _registry.flush_due():
+            flush_perf_metrics()
+        return response
+
+    logger.info(f"Métriques de latence activées ({_store.path})")
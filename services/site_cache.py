@@ -0,0 +1,276 @@
+"""
+================================================================================
+TheDraftClinic - Cache des Paramètres du Site
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module fournit un cache en mémoire (par processus) des données injectées
+dans tous les templates:
+- Les paramètres du site (SiteSettings)
+- Les pages affichées dans le footer (Page.get_footer_pages)
+- La date de modification de chaque page publiée (versions HTTP)
+
+Invalidation entre workers:
+    Un fichier "tampon de version" partagé est réécrit après chaque
+    modification des paramètres ou des pages. Chaque worker Gunicorn compare
+    simplement la date de modification de ce fichier (un appel os.stat) à
+    celle qu'il a vue lors du dernier chargement, sans relire les lignes en
+    base. Les données ne sont rechargées que lorsque le tampon a changé.
+
+Fonctions:
+- init_site_cache: Configure l'emplacement du tampon de version
+- bump_cache_version: Invalide le cache dans tous les workers
+- get_cache_version: Retourne la version courante (utilisable comme clé)
+- get_site_settings / get_footer_pages: Lecture depuis le cache
+- get_page_version: Date de modification d'une page publiée
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import os                                    # Accès au fichier tampon
+import time                                  # Génération des versions
+import threading                             # Verrou de rechargement
+import logging                               # Logging des opérations
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# ÉTAT DU CACHE (PAR PROCESSUS)
+# ==============================================================================
+
+# Chemin du fichier tampon de version (défini par init_site_cache)
+_version_file = None
+
+# Verrou protégeant le rechargement du cache
+_lock = threading.Lock()
+
+# Dernière signature (inode, mtime) vue du fichier tampon
+_seen_stat = None
+
+# Version courante lue dans le fichier tampon
+_version = '0'
+
+# Données en cache (None = à recharger)
+_cached = None
+
+
+# ==============================================================================
+# TAMPON DE VERSION
+# ==============================================================================
+
+def init_site_cache(app):
+    """
+    Configure le cache des paramètres du site pour l'application.
+
+    Le tampon est stocké dans le dossier d'instance Flask par défaut, ou à
+    l'emplacement défini par SITE_CACHE_VERSION_FILE.
+
+    Args:
+        app: Instance Flask
+    """
+    global _version_file, _seen_stat, _cached
+
+    _version_file = app.config.get('SITE_CACHE_VERSION_FILE') or os.path.join(
+        app.instance_path, 'site_cache.version'
+    )
+    os.makedirs(os.path.dirname(_version_file), exist_ok=True)
+
+    if not os.path.exists(_version_file):
+        bump_cache_version()
+
+    _seen_stat = None
+    _cached = None
+
+
+def _stat_signature():
+    """
+    Retourne la signature (inode, mtime) du fichier tampon.
+
+    Returns:
+        tuple: Signature du fichier, ou None s'il est absent
+    """
+    try:
+        stat = os.stat(_version_file)
+        return stat.st_ino, stat.st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+def bump_cache_version():
+    """
+    Invalide le cache dans tous les workers.
+
+    Écrit une nouvelle version dans le fichier tampon de manière atomique
+    (fichier temporaire puis os.replace). À appeler après le commit de
+    toute modification des paramètres du site ou des pages.
+
+    Returns:
+        str: La nouvelle version
+    """
+    global _cached
+
+    version = str(time.time_ns())
+    _cached = None
+
+    if not _version_file:
+        return version
+
+    try:
+        tmp_path = f"{_version_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(tmp_path, _version_file)
+        logger.info(f"Cache des paramètres du site invalidé (version {version})")
+    except OSError as e:
+        logger.error(f"Erreur écriture du tampon de version du cache: {e}")
+
+    return version
+
+
+def get_cache_version():
+    """
+    Retourne la version courante du cache des paramètres du site.
+
+    Un simple os.stat est effectué à chaque appel; le fichier n'est relu
+    que si sa signature a changé. Toute nouvelle version vide le cache
+    local du processus.
+
+    Returns:
+        str: Version courante (identique dans tous les workers)
+    """
+    global _seen_stat, _version, _cached
+
+    signature = _stat_signature()
+    if signature == _seen_stat:
+        return _version
+
+    with _lock:
+        if signature != _seen_stat:
+            try:
+                with open(_version_file, 'r', encoding='utf-8') as f:
+                    _version = f.read().strip() or '0'
+            except (OSError, TypeError):
+                _version = '0'
+            _seen_stat = signature
+            _cached = None
+
+    return _version
+
+
+# ==============================================================================
+# CHARGEMENT DES DONNÉES
+# ==============================================================================
+
+def _detached_copy(instance):
+    """
+    Crée une copie transitoire (hors session) d'une instance de modèle.
+
+    La copie contient toutes les colonnes chargées et peut être partagée
+    entre requêtes sans risque d'expiration ou de DetachedInstanceError.
+
+    Args:
+        instance: Instance SQLAlchemy
+
+    Returns:
+        Instance transitoire du même modèle
+    """
+    from sqlalchemy import inspect
+
+    mapper = inspect(type(instance))
+    # Colonnes différées non chargées (ex: rendu des pages) non copiées
+    unloaded = inspect(instance).unloaded
+    values = {
+        attr.key: getattr(instance, attr.key)
+        for attr in mapper.column_attrs if attr.key not in unloaded
+    }
+    return type(instance)(**values)
+
+
+def _load():
+    """
+    Charge les paramètres et les pages du footer depuis la base.
+
+    Returns:
+        dict: {'settings': SiteSettings, 'footer_pages': [Page],
+            'page_versions': {slug: updated_at}}
+    """
+    from app import db
+    from models.site_settings import SiteSettings
+    from models.page import Page
+
+    from utils.query_budget import uncounted_queries
+
+    # Rechargement partagé: non imputé au budget de requêtes de la page
+    with uncounted_queries():
+        settings = SiteSettings.get_settings()
+        footer_pages = Page.get_footer_pages()
+        page_versions = dict(
+            db.session.query(Page.slug, Page.updated_at).filter_by(is_published=True)
+        )
+
+    return {
+        'settings': _detached_copy(settings),
+        'footer_pages': [_detached_copy(page) for page in footer_pages],
+        'page_versions': page_versions
+    }
+
+
+def _get_cached():
+    """
+    Retourne les données en cache, rechargées si la version a changé.
+
+    Returns:
+        dict: Données en cache
+    """
+    global _cached
+
+    get_cache_version()
+
+    cached = _cached
+    if cached is None:
+        cached = _load()
+        _cached = cached
+
+    return cached
+
+
+def get_site_settings():
+    """
+    Retourne les paramètres du site depuis le cache.
+
+    Returns:
+        SiteSettings: Copie transitoire des paramètres (lecture seule)
+    """
+    return _get_cached()['settings']
+
+
+def get_footer_pages():
+    """
+    Retourne les pages du footer depuis le cache.
+
+    Returns:
+        list: Copies transitoires des pages publiées du footer
+    """
+    return _get_cached()['footer_pages']
+
+
+def get_page_version(slug):
+    """
+    Retourne la date de modification d'une page publiée depuis le cache.
+
+    Args:
+        slug (str): Slug de la page
+
+    Returns:
+        datetime: updated_at, ou None si la page n'est pas publiée
+    """
+    return _get_cached()['page_versions'].get(slug)
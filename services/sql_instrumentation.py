@@ -0,0 +1,333 @@
+"""
+================================================================================
+TheDraftClinic - Instrumentation SQL par Requête
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module mesure, pour chaque requête HTTP, les requêtes SQL exécutées:
+- nombre de requêtes
+- temps SQL total
+- requête la plus lente (texte et durée)
+
+Fonctionnement:
+    Les événements SQLAlchemy before/after_cursor_execute chronomètrent
+    chaque requête SQL et cumulent les mesures dans flask.g. Pour les
+    administrateurs connectés, la mesure est ajoutée à la réponse dans
+    l'en-tête Server-Timing (visible dans l'onglet Réseau du navigateur);
+    elle est dans tous les cas enregistrée à la fin de la requête
+    (teardown) dans un historique glissant par endpoint: les
+    SQL_INSTRUMENTATION_WINDOW dernières requêtes de chaque endpoint.
+
+    L'historique est propre à chaque processus (worker Gunicorn): la page
+    admin affiche les mesures du worker qui la sert.
+
+Configuration:
+    SQL_INSTRUMENTATION: Active l'instrumentation (défaut: désactivée)
+    SQL_INSTRUMENTATION_WINDOW: Taille de l'historique par endpoint
+
+Fonctions:
+- init_sql_instrumentation: Active l'instrumentation pour l'application
+- get_sql_stats: Résumé par endpoint (page admin)
+- is_sql_instrumentation_enabled: Indique si l'instrumentation est active
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import time                                  # Chronométrage des requêtes
+import threading                             # Verrou de l'historique
+import logging                               # Logging des opérations
+from collections import deque                # Historique glissant
+
+from flask import g, has_request_context, request
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Nombre de requêtes HTTP conservées par endpoint
+DEFAULT_WINDOW = 500
+
+# Bornes supérieures (ms) des classes de l'histogramme du temps SQL
+SQL_TIME_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Longueur maximum conservée du texte de la requête la plus lente
+STATEMENT_MAX_LENGTH = 300
+
+# Clé de conn.info des débuts de requêtes en cours
+_START_KEY = 'sql_instrumentation_start'
+
+# Historique par endpoint et son verrou
+_history = {}
+_history_lock = threading.Lock()
+
+# Taille de l'historique (définie par init_sql_instrumentation)
+_window = DEFAULT_WINDOW
+
+# Instrumentation active dans ce processus
+_enabled = False
+
+
+# ==============================================================================
+# MESURE D'UNE REQUÊTE HTTP
+# ==============================================================================
+
+class RequestSqlStats:
+    """
+    Requêtes SQL d'une requête HTTP.
+
+    Attributes:
+        count (int): Nombre de requêtes SQL
+        total (float): Temps SQL total en secondes
+        slowest (float): Durée de la requête la plus lente en secondes
+        slowest_statement (str): Texte de la requête la plus lente
+    """
+
+    __slots__ = ('count', 'total', 'slowest', 'slowest_statement')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = None
+
+    def add(self, statement, elapsed):
+        """
+        Ajoute une requête SQL à la mesure.
+
+        Args:
+            statement (str): Texte SQL
+            elapsed (float): Durée en secondes
+        """
+        self.count += 1
+        self.total += elapsed
+        if elapsed >= self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+    def server_timing(self):
+        """
+        Retourne la valeur de l'en-tête Server-Timing.
+
+        Returns:
+            str: Ex: 'db;dur=12.34;desc="5 SQL"'
+        """
+        return f'db;dur={self.total * 1000:.2f};desc="{self.count} SQL"'
+
+
+def _current_stats():
+    """Retourne la mesure de la requête HTTP en cours, ou None."""
+    if not has_request_context():
+        return None
+    return g.get('_sql_stats')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Note le début d'une requête SQL."""
+    if _current_stats() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Ajoute la durée de la requête SQL à la mesure en cours."""
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    start = starts.pop()
+    stats = _current_stats()
+    if stats is not None:
+        stats.add(statement, time.perf_counter() - start)
+
+
+def _handle_error(exception_context):
+    """Retire le début noté d'une requête SQL en échec (connexion du pool)."""
+    conn = exception_context.connection
+    if conn is None:
+        return
+    try:
+        starts = conn.info.get(_START_KEY)
+    except Exception:
+        # Connexion invalidée: retirée du pool avec ses informations
+        return
+    if starts:
+        starts.pop()
+
+
+# ==============================================================================
+# HISTORIQUE PAR ENDPOINT
+# ==============================================================================
+
+def _record(endpoint, stats):
+    """
+    Enregistre la mesure d'une requête HTTP dans l'historique.
+
+    Args:
+        endpoint (str): Endpoint Flask
+        stats (RequestSqlStats): Mesure de la requête
+    """
+    statement = stats.slowest_statement
+    if statement:
+        statement = ' '.join(statement.split())[:STATEMENT_MAX_LENGTH]
+
+    sample = (stats.count, stats.total, stats.slowest, statement)
+    with _history_lock:
+        samples = _history.get(endpoint)
+        if samples is None:
+            samples = _history[endpoint] = deque(maxlen=_window)
+        samples.append(sample)
+
+
+def _percentile(sorted_values, fraction):
+    """
+    Retourne le centile d'une liste triée (méthode du rang le plus proche).
+
+    Args:
+        sorted_values (list): Valeurs triées
+        fraction (float): Centile entre 0 et 1
+
+    Returns:
+        float: Valeur du centile
+    """
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _histogram(values_ms):
+    """
+    Répartit des durées dans les classes SQL_TIME_BUCKETS_MS.
+
+    Args:
+        values_ms (list): Durées en millisecondes
+
+    Returns:
+        list: Tuples (libellé de la classe, nombre de requêtes)
+    """
+    counts = [0] * (len(SQL_TIME_BUCKETS_MS) + 1)
+    for value in values_ms:
+        for index, bound in enumerate(SQL_TIME_BUCKETS_MS):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+
+    labels = [f'≤{bound}' for bound in SQL_TIME_BUCKETS_MS] + [f'>{SQL_TIME_BUCKETS_MS[-1]}']
+    return list(zip(labels, counts))
+
+
+def get_sql_stats():
+    """
+    Résume l'historique SQL de chaque endpoint.
+
+    Returns:
+        list: Un dict par endpoint (requests, avg_queries, max_queries,
+            avg_ms, p50_ms, p95_ms, max_ms, total_ms, histogram,
+            slowest_ms, slowest_statement), trié par temps SQL cumulé
+    """
+    with _history_lock:
+        snapshot = {endpoint: list(samples) for endpoint, samples in _history.items()}
+
+    summaries = []
+    for endpoint, samples in snapshot.items():
+        if not samples:
+            continue
+        times_ms = sorted(total * 1000 for _, total, _, _ in samples)
+        counts = [count for count, _, _, _ in samples]
+        slowest = max(samples, key=lambda sample: sample[2])
+
+        summaries.append({
+            'endpoint': endpoint,
+            'requests': len(samples),
+            'avg_queries': sum(counts) / len(samples),
+            'max_queries': max(counts),
+            'avg_ms': sum(times_ms) / len(samples),
+            'p50_ms': _percentile(times_ms, 0.50),
+            'p95_ms': _percentile(times_ms, 0.95),
+            'max_ms': times_ms[-1],
+            'total_ms': sum(times_ms),
+            'histogram': _histogram(times_ms),
+            'slowest_ms': slowest[2] * 1000,
+            'slowest_statement': slowest[3]
+        })
+
+    summaries.sort(key=lambda summary: summary['total_ms'], reverse=True)
+    return summaries
+
+
+def reset_sql_stats():
+    """Vide l'historique de tous les endpoints (processus courant)."""
+    with _history_lock:
+        _history.clear()
+
+
+def is_sql_instrumentation_enabled():
+    """
+    Indique si l'instrumentation SQL est active dans ce processus.
+
+    Returns:
+        bool: True si active
+    """
+    return _enabled
+
+
+# ==============================================================================
+# CONFIGURATION DE L'APPLICATION
+# ==============================================================================
+
+def init_sql_instrumentation(app):
+    """
+    Active l'instrumentation SQL si SQL_INSTRUMENTATION est vrai.
+
+    Args:
+        app: Instance Flask
+    """
+    global _enabled, _window
+
+    if not app.config.get('SQL_INSTRUMENTATION'):
+        return
+
+    _window = app.config.get('SQL_INSTRUMENTATION_WINDOW', DEFAULT_WINDOW)
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+    _enabled = True
+
+    @app.before_request
+    def start_sql_measure():
+        """Démarre la mesure SQL de la requête."""
+        if request.endpoint != 'static':
+            g._sql_stats = RequestSqlStats()
+
+    @app.after_request
+    def add_server_timing(response):
+        """Ajoute la mesure SQL à l'en-tête Server-Timing (administrateurs)."""
+        stats = g.get('_sql_stats')
+        # Temps internes non exposés aux visiteurs ni aux pages publiques
+        # mises en cache
+        if stats is not None and current_user.is_authenticated and current_user.is_admin:
+            response.headers.add('Server-Timing', stats.server_timing())
+        return response
+
+    @app.teardown_request
+    def record_sql_measure(exception=None):
+        """Enregistre la mesure SQL dans l'historique de l'endpoint."""
+        stats = g.pop('_sql_stats', None)
+        if stats is not None:
+            _record(request.endpoint or 'unknown', stats)
+
+    logger.info("Instrumentation SQL activée")
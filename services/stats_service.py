@@ -0,0 +1,176 @@
+"""
+================================================================================
+TheDraftClinic - Service de Statistiques
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module calcule les statistiques de la page /admin/stats directement en SQL.
+
+Au lieu d'une requête COUNT par statut et par type de service, puis du
+chargement de toutes les demandes terminées en Python, les agrégats sont
+obtenus en deux requêtes groupées:
+- Répartition par (statut, type de service) avec GROUP BY
+- Agrégats conditionnels sur les demandes terminées (à temps, en retard,
+  délai moyen de livraison)
+
+Fonctions:
+- compute_request_statistics: Retourne le dictionnaire de stats du template
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import logging                               # Logging des erreurs
+from sqlalchemy import func, case, select, and_  # Construction des agrégats SQL
+from app import db                           # Instance SQLAlchemy
+from models.request import ServiceRequest    # Modèle demande de service
+from models.user import User                 # Modèle utilisateur
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Statuts considérés comme terminés pour le calcul des délais
+COMPLETED_STATUSES = ('completed', 'delivered')
+
+
+# ==============================================================================
+# FONCTIONS UTILITAIRES
+# ==============================================================================
+
+def _delivery_days_expression():
+    """
+    Construit l'expression SQL du nombre de jours entiers entre la
+    soumission et la livraison d'une demande.
+
+    Reproduit timedelta.days (partie entière) selon le dialecte:
+    - PostgreSQL: EXTRACT(EPOCH FROM ...) / 86400 arrondi à l'inférieur
+    - SQLite: différence de julianday tronquée
+
+    Returns:
+        ColumnElement: Expression SQL du délai en jours
+    """
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        return func.cast(
+            func.julianday(ServiceRequest.delivered_at) - func.julianday(ServiceRequest.created_at),
+            db.Integer
+        )
+
+    return func.floor(
+        func.extract('epoch', ServiceRequest.delivered_at - ServiceRequest.created_at) / 86400
+    )
+
+
+# ==============================================================================
+# CALCUL DES STATISTIQUES
+# ==============================================================================
+
+def compute_request_statistics():
+    """
+    Calcule les statistiques globales des demandes en deux requêtes SQL.
+
+    Returns:
+        dict: Statistiques attendues par le template admin/stats.html
+            - total_requests, total_users, completed_requests
+            - on_time_deliveries, late_deliveries, on_time_rate
+            - avg_delivery_time (jours, arrondi à 0.1)
+            - requests_by_status (libellé -> nombre, tous les statuts)
+            - requests_by_service (libellé -> nombre, types non vides)
+    """
+    # --------------------------------------------------------------------------
+    # REQUÊTE 1: RÉPARTITION PAR STATUT ET TYPE DE SERVICE
+    # --------------------------------------------------------------------------
+
+    grouped_rows = db.session.execute(
+        select(
+            ServiceRequest.status,
+            ServiceRequest.service_type,
+            func.count(ServiceRequest.id)
+        ).group_by(ServiceRequest.status, ServiceRequest.service_type)
+    ).all()
+
+    counts_by_status = {}
+    counts_by_service = {}
+    total_requests = 0
+
+    for status, service_type, count in grouped_rows:
+        counts_by_status[status] = counts_by_status.get(status, 0) + count
+        counts_by_service[service_type] = counts_by_service.get(service_type, 0) + count
+        total_requests += count
+
+    # --------------------------------------------------------------------------
+    # REQUÊTE 2: AGRÉGATS CONDITIONNELS SUR LES DEMANDES TERMINÉES
+    # --------------------------------------------------------------------------
+
+    has_dates = and_(
+        ServiceRequest.delivered_at.isnot(None),
+        ServiceRequest.deadline.isnot(None)
+    )
+
+    total_users_subquery = select(func.count(User.id)).where(
+        User.is_admin.is_(False)
+    ).scalar_subquery()
+
+    delivery_row = db.session.execute(
+        select(
+            func.count(ServiceRequest.id),
+            func.sum(case(
+                (and_(has_dates, ServiceRequest.delivered_at <= ServiceRequest.deadline), 1),
+                else_=0
+            )),
+            func.sum(case(
+                (and_(has_dates, ServiceRequest.delivered_at > ServiceRequest.deadline), 1),
+                else_=0
+            )),
+            func.avg(case(
+                (and_(has_dates, ServiceRequest.created_at.isnot(None)), _delivery_days_expression()),
+                else_=None
+            )),
+            total_users_subquery
+        ).where(ServiceRequest.status.in_(COMPLETED_STATUSES))
+    ).one()
+
+    completed_requests, on_time, late, avg_days, total_users = delivery_row
+    on_time = int(on_time or 0)
+    late = int(late or 0)
+
+    # --------------------------------------------------------------------------
+    # MISE EN FORME POUR LE TEMPLATE
+    # --------------------------------------------------------------------------
+
+    # Tous les statuts connus sont présents (le template filtre les zéros)
+    requests_by_status = {
+        label: counts_by_status.get(code, 0)
+        for code, label in ServiceRequest.STATUS_CHOICES
+    }
+
+    # Seuls les types de service ayant au moins une demande sont affichés
+    requests_by_service = {
+        label: counts_by_service[code]
+        for code, label in ServiceRequest.SERVICE_TYPES
+        if counts_by_service.get(code)
+    }
+
+    return {
+        'total_requests': total_requests,
+        'total_users': total_users or 0,
+        'completed_requests': completed_requests or 0,
+        'on_time_deliveries': on_time,
+        'late_deliveries': late,
+        'on_time_rate': (on_time / (on_time + late) * 100) if (on_time + late) > 0 else 0,
+        'avg_delivery_time': round(float(avg_days), 1) if avg_days is not None else 0,
+        'requests_by_status': requests_by_status,
+        'requests_by_service': requests_by_service
+    }
@@ -0,0 +1,118 @@
+"""
+================================================================================
+TheDraftClinic - Cache de Bytecode des Templates
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module partage entre les workers le code compilé des templates Jinja.
+
+Fonctionnement:
+    Sans cache, chaque worker analyse et compile chaque template (dont
+    layouts/admin_base.html et layouts/base.html) à sa première utilisation
+    après un démarrage ou un rechargement. Avec le cache de bytecode sur
+    disque, le premier worker qui compile un template écrit son bytecode
+    (écriture atomique); les autres le chargent sans compilation. Une
+    entrée n'est réutilisée que si l'empreinte de la source correspond:
+    un template modifié est recompilé.
+
+    warm_templates (script warm_templates.py) compile tous les templates
+    au déploiement, avant le démarrage des workers: aucune requête ne paie
+    la compilation.
+
+Configuration:
+    JINJA_BYTECODE_CACHE_DIR: Dossier du cache (défaut: instance/jinja_cache,
+        vide: cache désactivé)
+
+Fonctions:
+- init_template_cache: Installe le cache de bytecode sur l'environnement Jinja
+- warm_templates: Compile tous les templates dans le cache
+================================================================================
+"""
+
+# ==============================================================================
+# IMPORTATIONS
+# ==============================================================================
+
+import os                                    # Dossier du cache
+import logging                               # Logging des opérations
+
+from jinja2 import FileSystemBytecodeCache
+
+# Configuration du logger pour ce module
+logger = logging.getLogger(__name__)
+
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+# Modèle des noms de fichiers du cache
+CACHE_PATTERN = '__jinja2_%s.cache'
+
+
+# ==============================================================================
+# CACHE DE BYTECODE
+# ==============================================================================
+
+def init_template_cache(app):
+    """
+    Installe le cache de bytecode partagé sur l'environnement Jinja.
+
+    Args:
+        app: Instance Flask
+
+    Returns:
+        FileSystemBytecodeCache: Le cache, ou None si désactivé
+    """
+    folder = app.config.get('JINJA_BYTECODE_CACHE_DIR')
+    if not folder:
+        return None
+
+    try:
+        os.makedirs(folder, exist_ok=True)
+    except OSError as e:
+        logger.error(f"Dossier du cache des templates inaccessible: {e}")
+        return None
+
+    cache = FileSystemBytecodeCache(folder, CACHE_PATTERN)
+    app.jinja_env.bytecode_cache = cache
+    logger.info(f"Cache de bytecode des templates: {folder}")
+    return cache
+
+
+def warm_templates(app, clear=False):
+    """
+    Compile tous les templates de l'application dans le cache de bytecode.
+
+    Args:
+        app: Instance Flask (cache installé par init_template_cache)
+        clear (bool): Vide le cache avant la compilation
+
+    Returns:
+        tuple: (templates compilés, {template: erreur})
+    """
+    env = app.jinja_env
+    if env.bytecode_cache is None:
+        raise RuntimeError("Cache de bytecode des templates désactivé (JINJA_BYTECODE_CACHE_DIR)")
+
+    if clear:
+        env.bytecode_cache.clear()
+    # Le cache mémoire de l'environnement masquerait les templates déjà chargés
+    if env.cache is not None:
+        env.cache.clear()
+
+    compiled = []
+    errors = {}
+    for name in env.list_templates():
+        try:
+            env.get_template(name)
+        except Exception as e:
+            errors[name] = str(e)
+            continue
+        compiled.append(name)
+
+    return compiled, errors
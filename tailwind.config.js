@@ -0,0 +1,37 @@
+/**
+ * ================================================================================
+ * TheDraftClinic - Configuration Tailwind CSS
+ * ================================================================================
+ * By MOA Digital Agency LLC
+ * Developed by: Aisance KALONJI
+ * Contact: moa@myoneart.com
+ * Website: www.myoneart.com
+ * ================================================================================
+ *
+ * Utilisée par build_assets.py pour compiler le bundle CSS purgé
+ * (static/dist/css/tailwind.<empreinte>.css).
+ *
+ * Le thème (police, couleurs primary et accent) est partagé avec le mode
+ * de développement sans build (Tailwind CDN) via assets/tailwind.theme.json.
+ * ================================================================================
+ */
+
+const theme = require('./assets/tailwind.theme.json');
+
+// Couleurs de ActivityLog.get_color(), insérées dynamiquement dans les
+// classes des templates (bg-{{ activity.get_color() }}-900/30)
+const activityColors = ['blue', 'green', 'orange', 'gray', 'purple', 'yellow', 'red', 'indigo'];
+
+module.exports = {
+    content: [
+        './templates/**/*.html',
+        './static/js/**/*.js',
+    ],
+    safelist: activityColors.flatMap((color) => [
+        `bg-${color}-900/30`,
+        `text-${color}-400`,
+    ]),
+    theme: {
+        extend: theme,
+    },
+};
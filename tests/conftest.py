@@ -0,0 +1,62 @@
+"""
+================================================================================
+TheDraftClinic - Configuration des Tests
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Fixtures partagées par les tests:
+- app: Application créée sur une base SQLite temporaire
+- client_as: Client de test connecté en tant qu'utilisateur donné
+
+Usage:
+    python -m pytest
+================================================================================
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """
+    Crée l'application sur une base SQLite temporaire.
+
+    Les journaux et les templates compilés sont écrits dans le dossier temporaire; le cache
+    des pages publiques est désactivé.
+    """
+    folder = tmp_path_factory.mktemp('instance')
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('DATABASE_URL', f"sqlite:///{folder / 'test.sqlite3'}")
+        mp.setenv('JINJA_BYTECODE_CACHE_DIR', str(folder / 'jinja_cache'))
+        mp.setenv('PAGE_CACHE_URL', 'none://')
+        # Journaux (logs/) écrits dans le dossier temporaire
+        mp.chdir(folder)
+
+        from app import create_app
+        app = create_app()
+
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    yield app
+
+
+@pytest.fixture
+def client_as(app):
+    """
+    Retourne une fonction créant un client de test connecté.
+
+    Returns:
+        callable: client_as(user) -> FlaskClient
+    """
+    def make_client(user_id):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+        return client
+    return make_client
@@ -0,0 +1,48 @@
+"""
+================================================================================
+TheDraftClinic - Tests des Compteurs du Dashboard
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Vérifie que la ligne des compteurs est créée au démarrage et que son
+absence à l'affichage n'entraîne aucune écriture.
+================================================================================
+"""
+
+
+def test_counters_row_created_at_startup(app):
+    from app import db
+    from models.dashboard_counter import DashboardCounters, COUNTERS_ROW_ID
+
+    with app.app_context():
+        assert db.session.get(DashboardCounters, COUNTERS_ROW_ID) is not None
+
+
+def test_missing_row_is_computed_without_commit(app, monkeypatch):
+    from app import db
+    from models.dashboard_counter import DashboardCounters, COUNTERS_ROW_ID
+
+    with app.app_context():
+        db.session.delete(db.session.get(DashboardCounters, COUNTERS_ROW_ID))
+        db.session.commit()
+
+        def forbidden_commit():
+            raise AssertionError("commit pendant la lecture des compteurs")
+        monkeypatch.setattr(db.session, 'commit', forbidden_commit)
+
+        counters = DashboardCounters.get_counters()
+        expected = DashboardCounters.compute_values()
+        stats = counters.to_dashboard_stats()
+        monkeypatch.undo()
+
+        assert stats['total_users'] == expected['clients_total']
+        assert counters not in db.session
+        db.session.rollback()
+        assert db.session.get(DashboardCounters, COUNTERS_ROW_ID) is None
+
+        DashboardCounters.ensure_counters()
+        assert db.session.get(DashboardCounters, COUNTERS_ROW_ID) is not None
@@ -0,0 +1,104 @@
+"""
+================================================================================
+TheDraftClinic - Tests des Références de Fichiers
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Vérifie la suppression des fichiers sans référence: balayage des lignes à
+zéro conservées par le délai de grâce, conservation des fichiers non suivis.
+================================================================================
+"""
+
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def uploads(app, tmp_path, monkeypatch):
+    """
+    Dossier d'uploads temporaire; les lignes file_blobs créées sont supprimées.
+
+    Returns:
+        callable: write(path, age) -> chemin complet du fichier écrit
+    """
+    from app import db
+    from models.file_blob import FileBlob
+
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+
+    def write(path, age=0):
+        file_path = tmp_path / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(b'%PDF-1.4')
+        written = time.time() - age
+        os.utime(file_path, (written, written))
+        return file_path
+
+    with app.app_context():
+        yield write
+        db.session.rollback()
+        FileBlob.query.filter(FileBlob.path.like('test/%')).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def _add_blob(path, ref_count):
+    from app import db
+    from models.file_blob import FileBlob
+
+    db.session.add(FileBlob(path=path, ref_count=ref_count))
+    db.session.commit()
+
+
+def test_sweep_removes_files_kept_by_grace_period(uploads):
+    from app import db
+    from models.file_blob import FileBlob, RELEASE_GRACE_SECONDS, sweep_unreferenced_files
+
+    old = uploads('test/aa/old.pdf', age=RELEASE_GRACE_SECONDS * 2)
+    recent = uploads('test/bb/recent.pdf')
+    referenced = uploads('test/cc/referenced.pdf', age=RELEASE_GRACE_SECONDS * 2)
+    _add_blob('test/aa/old.pdf', 0)
+    _add_blob('test/bb/recent.pdf', 0)
+    _add_blob('test/cc/referenced.pdf', 1)
+
+    assert sweep_unreferenced_files() == 1
+    assert not old.exists()
+    assert FileBlob.get_ref_count('test/aa/old.pdf') is None
+    # Fichier récent (upload possible en cours) et fichier référencé conservés
+    assert recent.exists() and FileBlob.get_ref_count('test/bb/recent.pdf') == 0
+    assert referenced.exists()
+    db.session.rollback()
+
+
+def test_delete_file_keeps_untracked_file(app, uploads):
+    from services.file_service import delete_file
+
+    untracked = uploads('test/dd/legacy.pdf')
+    assert delete_file('test/dd/legacy.pdf', app.config['UPLOAD_FOLDER']) is False
+    assert untracked.exists()
+
+    released = uploads('test/ee/released.pdf')
+    _add_blob('test/ee/released.pdf', 0)
+    assert delete_file('test/ee/released.pdf', app.config['UPLOAD_FOLDER']) is True
+    assert not released.exists()
+
+
+def test_commit_releasing_files_sweeps_when_due(uploads, monkeypatch):
+    from app import db
+    from models import file_blob
+
+    old = uploads('test/ff/old.pdf', age=file_blob.RELEASE_GRACE_SECONDS * 2)
+    _add_blob('test/ff/old.pdf', 0)
+    monkeypatch.setattr(file_blob, '_next_sweep', 0.0)
+
+    # Commit qui libère un autre fichier: le balayage est dû
+    db.session.info[file_blob._RELEASE_KEY] = {'test/gg/missing.pdf'}
+    db.session.commit()
+
+    assert not old.exists()
+    assert file_blob._next_sweep > time.monotonic()
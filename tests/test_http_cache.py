@@ -0,0 +1,47 @@
+"""
+================================================================================
+TheDraftClinic - Tests du Cache HTTP des Pages Publiques
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Vérifie qu'une réponse publique (cacheable par un cache partagé) ne porte
+jamais de cookie de session, y compris en 304.
+================================================================================
+"""
+
+
+def test_public_page_sets_no_cookie(app):
+    """La langue négociée (Accept-Language) n'écrit pas la session."""
+    client = app.test_client()
+
+    response = client.get('/', headers={'Accept-Language': 'fr-FR,fr;q=0.9'})
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'].startswith('public')
+    assert 'Set-Cookie' not in response.headers
+    assert 'lang="fr"' in response.get_data(as_text=True)
+
+    revalidated = client.get('/', headers={
+        'Accept-Language': 'fr-FR,fr;q=0.9',
+        'If-None-Match': response.headers['ETag']
+    })
+    assert revalidated.status_code == 304
+    assert 'Set-Cookie' not in revalidated.headers
+
+
+def test_language_choice_is_not_public(app):
+    """Un choix explicite ?lang= est enregistré en session: réponse privée."""
+    client = app.test_client()
+
+    response = client.get('/?lang=en')
+    assert response.status_code == 200
+    assert 'Set-Cookie' in response.headers
+    assert 'no-store' in response.headers['Cache-Control']
+
+    # Langue désormais en session: la page suivante est de nouveau publique
+    following = client.get('/')
+    assert following.headers['Cache-Control'].startswith('public')
+    assert 'Set-Cookie' not in following.headers
@@ -0,0 +1,99 @@
+"""
+================================================================================
+TheDraftClinic - Tests de l'Export des Métriques
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Vérifie l'accès à /metrics et les métriques exportées, avec un stockage
+des mesures dans le dossier temporaire du test.
+================================================================================
+"""
+
+import pytest
+
+TOKEN = 'test-metrics-token'
+
+
+@pytest.fixture
+def metrics(app, tmp_path, monkeypatch):
+    """
+    Active les mesures partagées et déclare les sources de l'exportateur.
+
+    Le pool de connexions n'est pas instrumenté (partagé entre les tests).
+    """
+    from services import perf_metrics, metrics_exporter
+
+    monkeypatch.setattr(perf_metrics, '_store',
+                        perf_metrics.SQLiteMetricsStore(str(tmp_path / 'perf.sqlite3')))
+    monkeypatch.setattr(perf_metrics, '_registry', perf_metrics.MetricsRegistry())
+    monkeypatch.setattr(perf_metrics, '_counter_sources', {})
+    monkeypatch.setattr(perf_metrics, '_gauge_sources', {})
+    monkeypatch.setattr(perf_metrics, '_written_counters', {})
+    monkeypatch.setattr(metrics_exporter, '_instrument_pool', lambda pool: None)
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', None)
+
+    metrics_exporter.init_metrics_exporter(app)
+    return metrics_exporter
+
+
+def test_local_scrape_without_token_is_denied(app, metrics):
+    """Sans METRICS_TOKEN, une requête locale (nginx) n'accède pas à /metrics."""
+    client = app.test_client()
+
+    response = client.get('/metrics', environ_base={'REMOTE_ADDR': '127.0.0.1'})
+    assert response.status_code == 404
+
+
+def test_scrape_requires_token(app, metrics, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', TOKEN)
+    client = app.test_client()
+
+    assert client.get('/metrics').status_code == 404
+    response = client.get('/metrics', headers={'Authorization': f'Bearer {TOKEN}'})
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).endswith('# EOF\n')
+
+
+def test_activity_log_queue_metrics(app, metrics, monkeypatch):
+    """Profondeur de la file et entrées abandonnées du journal différé."""
+    import os
+    from services import activity_log_writer
+
+    writer = activity_log_writer.ActivityLogWriter(app, queue_size=2)
+    # Pas de thread d'écriture: les entrées restent en file
+    monkeypatch.setattr(writer, '_ensure_thread', lambda: None)
+    monkeypatch.setattr(activity_log_writer, '_writer', writer)
+    for _ in range(3):
+        writer.submit({'action': 'download'})
+
+    text = metrics.render_openmetrics()
+    assert f'thedraftclinic_activity_log_queue_depth{{worker="{os.getpid()}"}} 2\n' in text
+    assert 'thedraftclinic_activity_log_dropped_total 1\n' in text
+
+
+def test_rate_limit_backend_metrics(app, metrics, monkeypatch):
+    """Clés suivies et évictions par stockage (tracked_keys inconnu omis)."""
+    import os
+    import weakref
+    from security import rate_limiter
+    from security.rate_limit_backends import MemoryBackend, RateLimitBackend
+
+    monkeypatch.setattr(rate_limiter, '_limiters', weakref.WeakSet())
+    shared = MemoryBackend(max_keys=2)
+    limiters = [
+        rate_limiter.RateLimiter(5, 60, name='login', backend=shared),
+        rate_limiter.RateLimiter(5, 60, name='form', backend=shared),
+        # Stockage sans nombre de clés (comme Redis)
+        rate_limiter.RateLimiter(5, 60, name='remote', backend=RateLimitBackend()),
+    ]
+    for ip_address in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+        limiters[0].record_request(ip_address)
+
+    text = metrics.render_openmetrics()
+    assert f'thedraftclinic_ratelimit_tracked_keys{{limiter="form,login",worker="{os.getpid()}"}} 2\n' in text
+    assert 'thedraftclinic_ratelimit_evictions_total{limiter="form,login"} 1\n' in text
+    assert 'ratelimit_tracked_keys{limiter="remote"' not in text
@@ -0,0 +1,188 @@
+"""
+================================================================================
+TheDraftClinic - Tests du Nombre de Requêtes des Pages de Détail
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Vérifie que les pages de détail d'une demande (admin et client) restent
+dans leur budget de requêtes SQL et que ce nombre ne dépend pas du nombre
+de documents, paiements, révisions, prolongations et entrées d'historique.
+================================================================================
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from flask_login import current_user
+
+from routes import admin as admin_routes
+from routes import client as client_routes
+from utils.query_budget import count_queries
+
+
+# ==============================================================================
+# DONNÉES DE TEST
+# ==============================================================================
+
+@pytest.fixture(scope='module')
+def users(app):
+    """Crée un administrateur et un client."""
+    from app import db
+    from models.user import User
+
+    with app.app_context():
+        admin = User(email='admin-queries@example.com', first_name='Ada', last_name='Admin',
+                     is_admin=True, admin_role='super_admin')
+        admin.set_password('password')
+        client = User(email='client-queries@example.com', first_name='Carl', last_name='Client')
+        client.set_password('password')
+        db.session.add_all([admin, client])
+        db.session.commit()
+        return admin.id, client.id
+
+
+def create_request(admin_id, client_id, children):
+    """
+    Crée une demande avec `children` éléments de chaque type.
+
+    Args:
+        admin_id (int): Auteur des livrables et des réponses
+        client_id (int): Propriétaire de la demande
+        children (int): Nombre de documents, paiements, révisions,
+            prolongations et entrées d'historique (auteurs distincts)
+
+    Returns:
+        int: ID de la demande
+    """
+    from app import db
+    from models import (
+        User, ServiceRequest, Document, Payment, ActivityLog,
+        RevisionRequest, RevisionAttachment, DeadlineExtension
+    )
+
+    now = datetime.utcnow()
+    request = ServiceRequest(
+        user_id=client_id, service_type='proofreading', title=f'Demande {children}',
+        description='Description', status='in_progress', deadline=now + timedelta(days=30),
+        quote_amount=500.0, deposit_required=250.0, word_count=10000, pages_count=40
+    )
+    db.session.add(request)
+    db.session.flush()
+
+    for i in range(children):
+        document = Document(
+            request_id=request.id, filename=f'doc-{i}.pdf', original_filename=f'doc-{i}.pdf',
+            document_type='deliverable', uploaded_by=admin_id
+        )
+        db.session.add(document)
+        db.session.flush()
+        db.session.add(Payment(
+            request_id=request.id, amount=50.0, payment_type='deposit',
+            status='pending', proof_document=f'proof-{i}.pdf'
+        ))
+        revision = RevisionRequest(
+            request_id=request.id, delivery_document_id=document.id,
+            requested_by=client_id, revision_details=f'Révision {i}',
+            responded_by=admin_id
+        )
+        db.session.add(revision)
+        db.session.flush()
+        db.session.add(RevisionAttachment(
+            revision_request_id=revision.id, filename=f'rev-{i}.pdf',
+            original_filename=f'rev-{i}.pdf', uploaded_by=client_id
+        ))
+        db.session.add(DeadlineExtension(
+            request_id=request.id, requested_by=client_id, original_deadline=request.deadline,
+            new_deadline=request.deadline + timedelta(days=i + 1), reason='Délai'
+        ))
+        # Un auteur distinct par entrée: un chargement par auteur se verrait
+        author = User(email=f'author-{children}-{i}@example.com', first_name='Auteur',
+                      last_name=str(i))
+        author.set_password('password')
+        db.session.add(author)
+        db.session.flush()
+        ActivityLog.log_action(request.id, author.id, 'comment', title=f'Commentaire {i}')
+
+    db.session.commit()
+    return request.id
+
+
+@pytest.fixture(scope='module')
+def requests_by_size(app, users):
+    """Crée une demande par taille: {nombre d'enfants: ID}."""
+    admin_id, client_id = users
+    with app.app_context():
+        return {size: create_request(admin_id, client_id, size) for size in (1, 3, 12)}
+
+
+# ==============================================================================
+# MESURE
+# ==============================================================================
+
+def view_query_count(app, client, endpoint, url):
+    """
+    Affiche une page et retourne le nombre de requêtes SQL de sa vue.
+
+    Seule la vue est mesurée (rendu du template compris), pas le
+    chargement de l'utilisateur connecté par Flask-Login.
+
+    Args:
+        app: Instance Flask
+        client: Client de test connecté
+        endpoint (str): Endpoint de la vue
+        url (str): URL de la page
+
+    Returns:
+        int: Nombre de requêtes SQL de la vue
+    """
+    view = app.view_functions[endpoint]
+    counts = []
+
+    def counted_view(*args, **kwargs):
+        # Utilisateur connecté chargé hors mesure (commun à toutes les pages)
+        current_user._get_current_object()
+        with count_queries() as counter:
+            response = view(*args, **kwargs)
+        counts.append(counter.count)
+        return response
+
+    app.view_functions[endpoint] = counted_view
+    try:
+        response = client.get(url)
+    finally:
+        app.view_functions[endpoint] = view
+
+    assert response.status_code == 200, response.data[:500]
+    assert len(counts) == 1
+    return counts[0]
+
+
+# ==============================================================================
+# TESTS
+# ==============================================================================
+
+@pytest.mark.parametrize('endpoint, url, budget, as_admin', [
+    ('admin.view_request', '/admin/request/{}', admin_routes.DETAIL_PAGE_QUERY_BUDGET, True),
+    ('client.view_request', '/client/request/{}', client_routes.DETAIL_PAGE_QUERY_BUDGET, False),
+])
+def test_detail_page_query_count(app, client_as, users, requests_by_size,
+                                 endpoint, url, budget, as_admin):
+    """Le nombre de requêtes respecte le budget et ne croît pas avec les enfants."""
+    admin_id, client_id = users
+    client = client_as(admin_id if as_admin else client_id)
+
+    # Premier affichage: chargement du cache des paramètres du site
+    client.get(url.format(requests_by_size[1]))
+
+    counts = {
+        size: view_query_count(app, client, endpoint, url.format(request_id))
+        for size, request_id in requests_by_size.items()
+    }
+
+    for size, count in counts.items():
+        assert count <= budget, f"{endpoint}: {count} requêtes pour {size} enfants (budget {budget})"
+    assert len(set(counts.values())) == 1, f"{endpoint}: le nombre de requêtes varie: {counts}"
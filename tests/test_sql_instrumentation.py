@@ -0,0 +1,54 @@
+"""
+================================================================================
+TheDraftClinic - Tests de l'Instrumentation SQL
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Vérifie qu'une requête SQL en échec ne laisse pas de début de mesure sur
+la connexion (réutilisée par le pool).
+================================================================================
+"""
+
+import pytest
+from flask import g
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from services import sql_instrumentation as instrumentation
+
+
+@pytest.fixture
+def listeners():
+    """Installe les écouteurs SQL de l'instrumentation pendant le test."""
+    pairs = [
+        ('before_cursor_execute', instrumentation._before_cursor_execute),
+        ('after_cursor_execute', instrumentation._after_cursor_execute),
+        ('handle_error', instrumentation._handle_error),
+    ]
+    added = [(name, fn) for name, fn in pairs if not event.contains(Engine, name, fn)]
+    for name, fn in added:
+        event.listen(Engine, name, fn)
+    yield
+    for name, fn in added:
+        event.remove(Engine, name, fn)
+
+
+def test_failed_statement_leaves_no_start(app, listeners):
+    """Les débuts notés sont retirés, que la requête réussisse ou échoue."""
+    from app import db
+
+    with app.test_request_context():
+        g._sql_stats = instrumentation.RequestSqlStats()
+        with db.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+            with pytest.raises(OperationalError):
+                connection.execute(text('SELECT * FROM missing_table'))
+            connection.execute(text('SELECT 2'))
+
+            assert connection.info.get(instrumentation._START_KEY) == []
+        assert g._sql_stats.count == 2
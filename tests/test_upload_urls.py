@@ -0,0 +1,45 @@
+"""
+================================================================================
+TheDraftClinic - Tests des URLs des Fichiers Uploadés
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Vérifie que les liens vers les fichiers uploadés suivent les fichiers
+déplacés par migrate_uploads.py (répartition ab/cd/<nom>).
+================================================================================
+"""
+
+
+def test_branding_urls_follow_moved_files(app, tmp_path, monkeypatch):
+    """Favicon et og:image résolus quand le fichier a déjà été réparti."""
+    from app import db
+    from models.site_settings import SiteSettings
+    from services.file_service import shard_path
+    from services.site_cache import bump_cache_version
+
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    stored = shard_path('0123abcd.png')
+    (tmp_path / 'branding' / stored).parent.mkdir(parents=True)
+    (tmp_path / 'branding' / stored).write_bytes(b'\x89PNG')
+
+    with app.app_context():
+        settings = SiteSettings.get_settings()
+        previous = (settings.favicon_filename, settings.og_image_filename)
+        # Ligne pas encore migrée: nom à plat
+        settings.favicon_filename = settings.og_image_filename = '0123abcd.png'
+        db.session.commit()
+        bump_cache_version()
+    try:
+        html = app.test_client().get('/').get_data(as_text=True)
+        assert f'href="/static/uploads/branding/{stored}"' in html
+        assert f'content="http://localhost/static/uploads/branding/{stored}"' in html
+    finally:
+        with app.app_context():
+            settings = SiteSettings.get_settings()
+            settings.favicon_filename, settings.og_image_filename = previous
+            db.session.commit()
+            bump_cache_version()
@@ -14,19 +14,43 @@ Fonctionnalités:
 - Fonction de traduction avec clés imbriquées
 - Gestion de la langue courante via session
 - Injection dans les templates Jinja2
+
+Tables compilées:
+    Au chargement, chaque langue est aplatie en un dictionnaire
+    {cle.en.pointilles: valeur} dans lequel la langue par défaut est déjà
+    fusionnée (fallback). Les chaînes contenant des accolades sont repérées
+    une fois pour toutes: t() se réduit ainsi à une seule recherche dans un
+    dictionnaire et n'appelle str.format() que si nécessaire.
 ================================================================================
 """
 
 import os
 import json
 import glob
-from flask import session, request, g
+import hashlib
+from string import Formatter
+from flask import session, request, g, has_request_context
 from functools import wraps
 
 LANGUAGES = []
 DEFAULT_LANGUAGE = 'en'
 TRANSLATIONS = {}
 
+# Tables compilées par langue: {lang: {cle_pointee: valeur}}
+FLAT_TRANSLATIONS = {}
+
+# Clés dont la valeur est une chaîne de format valide: {lang: set(cles)}
+FORMAT_KEYS = {}
+
+# Empreinte du contenu des traductions (clé des caches HTTP)
+TRANSLATIONS_VERSION = '0'
+
+# Recherches de t() dans les tables compilées (processus courant)
+LOOKUP_STATS = {'hit': 0, 'miss': 0}
+
+# Marqueur d'une clé absente des tables
+_MISSING = object()
+
 
 def discover_languages():
     """
@@ -42,6 +66,80 @@ def discover_languages():
     return LANGUAGES
 
 
+def _flatten(translations, prefix=''):
+    """
+    Aplatit un dictionnaire de traductions imbriqué.
+    
+    Les noeuds intermédiaires sont conservés (ex: 'services' -> dict) pour
+    que t() retourne les mêmes valeurs qu'avec un parcours des clés.
+    
+    Args:
+        translations: Dictionnaire imbriqué chargé depuis le JSON
+        prefix: Préfixe de clé courant
+        
+    Returns:
+        dict: {cle_pointee: valeur}
+    """
+    flat = {}
+    for key, value in translations.items():
+        dotted = f'{prefix}{key}'
+        flat[dotted] = value
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{dotted}.'))
+    return flat
+
+
+def _format_keys(flat):
+    """
+    Repère les valeurs qui doivent passer par str.format().
+    
+    Une valeur est retenue si elle contient des accolades (champs ou
+    accolades échappées) et si son format est valide.
+    
+    Args:
+        flat: Table aplatie d'une langue
+        
+    Returns:
+        set: Clés dont la valeur est une chaîne de format
+    """
+    keys = set()
+    formatter = Formatter()
+    for key, value in flat.items():
+        if isinstance(value, str) and ('{' in value or '}' in value):
+            try:
+                list(formatter.parse(value))
+                keys.add(key)
+            except ValueError:
+                pass
+    return keys
+
+
+def compile_translations():
+    """
+    Compile les tables de traduction aplaties de toutes les langues.
+    
+    La langue par défaut sert de base et chaque langue la surcharge:
+    une clé absente est donc déjà résolue vers sa traduction de repli.
+    """
+    global FLAT_TRANSLATIONS, FORMAT_KEYS, TRANSLATIONS_VERSION
+    
+    fallback = _flatten(TRANSLATIONS.get(DEFAULT_LANGUAGE, {}))
+    
+    flat_tables = {}
+    format_keys = {}
+    for lang, translations in TRANSLATIONS.items():
+        flat = dict(fallback)
+        flat.update(_flatten(translations))
+        flat_tables[lang] = flat
+        format_keys[lang] = _format_keys(flat)
+    
+    FLAT_TRANSLATIONS = flat_tables
+    FORMAT_KEYS = format_keys
+    TRANSLATIONS_VERSION = hashlib.sha256(
+        json.dumps(TRANSLATIONS, sort_keys=True).encode('utf-8')
+    ).hexdigest()[:16]
+
+
 def load_translations():
     """
     Charge tous les fichiers de traduction JSON depuis le dossier lang/.
@@ -53,16 +151,20 @@ def load_translations():
     
     lang_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'lang')
     
+    translations = {}
     for lang in LANGUAGES:
         lang_file = os.path.join(lang_dir, f'{lang}.json')
         if os.path.exists(lang_file):
             try:
                 with open(lang_file, 'r', encoding='utf-8') as f:
-                    TRANSLATIONS[lang] = json.load(f)
+                    translations[lang] = json.load(f)
             except json.JSONDecodeError:
-                TRANSLATIONS[lang] = {}
+                translations[lang] = {}
         else:
-            TRANSLATIONS[lang] = {}
+            translations[lang] = {}
+    
+    TRANSLATIONS = translations
+    compile_translations()
 
 
 def reload_translations():
@@ -87,6 +189,25 @@ def get_available_languages():
 def get_locale():
     """
     Recupere la langue courante.
+    
+    La langue est resolue une seule fois par requete (hook before_request)
+    puis lue depuis g.lang: les appels suivants (t(), filtre translate,
+    context processor) ne touchent plus la session ni Accept-Language.
+    
+    Returns:
+        str: Code de la langue courante
+    """
+    if has_request_context():
+        lang = g.get('lang')
+        if lang is None:
+            lang = g.lang = resolve_locale()
+        return lang
+    return resolve_locale()
+
+
+def resolve_locale():
+    """
+    Determine la langue de la requete courante.
     Ordre de priorite:
     1. Session utilisateur
     2. Parametre URL (?lang=xx)
@@ -104,13 +225,13 @@ def get_locale():
             session['lang'] = lang
             return lang
     
+    # Langue negociee: non enregistree en session (recalculee a chaque
+    # requete), les pages publiques restent sans cookie de session
     if request and request.accept_languages:
         for lang_code, quality in request.accept_languages:
             if lang_code.lower().startswith('fr') and 'fr' in available:
-                session['lang'] = 'fr'
                 return 'fr'
         if 'en' in available:
-            session['lang'] = 'en'
             return 'en'
     
     return DEFAULT_LANGUAGE if DEFAULT_LANGUAGE in available else (available[0] if available else 'en')
@@ -126,6 +247,8 @@ def set_locale(lang):
     available = get_available_languages()
     if lang in available:
         session['lang'] = lang
+        if has_request_context():
+            g.lang = lang
         return True
     return False
 
@@ -147,30 +270,19 @@ def t(key, **kwargs):
     """
     lang = get_locale()
     
-    if lang not in TRANSLATIONS:
+    if lang not in FLAT_TRANSLATIONS:
         lang = DEFAULT_LANGUAGE
     
-    translations = TRANSLATIONS.get(lang, {})
-    
-    keys = key.split('.')
-    value = translations
-    
-    try:
-        for k in keys:
-            value = value[k]
-    except (KeyError, TypeError):
-        fallback = TRANSLATIONS.get(DEFAULT_LANGUAGE, {})
-        try:
-            value = fallback
-            for k in keys:
-                value = value[k]
-        except (KeyError, TypeError):
-            return key
+    value = FLAT_TRANSLATIONS.get(lang, {}).get(key, _MISSING)
+    if value is _MISSING:
+        LOOKUP_STATS['miss'] += 1
+        return key
+    LOOKUP_STATS['hit'] += 1
     
-    if isinstance(value, str) and kwargs:
+    if kwargs and key in FORMAT_KEYS.get(lang, ()):
         try:
             value = value.format(**kwargs)
-        except KeyError:
+        except (KeyError, IndexError):
             pass
     
     return value
@@ -196,7 +308,14 @@ def init_i18n(app):
     
     @app.before_request
     def before_request():
-        g.lang = get_locale()
+        # Fichiers statiques et assets: session non lue (ni cookie de
+        # langue, ni Vary: Cookie sur des reponses mises en cache)
+        if request.endpoint in ('static', 'assets'):
+            g.pop('lang', None)
+            return
+        # Toujours recalculee: g peut survivre a la requete precedente
+        # lorsqu'un contexte d'application englobant est deja actif
+        g.lang = resolve_locale()
     
     @app.context_processor
     def inject_i18n():
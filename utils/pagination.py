@@ -0,0 +1,189 @@
+"""
+================================================================================
+TheDraftClinic - Pagination par curseur (keyset)
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module fournit une pagination par curseur sur le couple (created_at, id)
+pour les listes admin (demandes, utilisateurs, paiements).
+
+Contrairement à OFFSET/LIMIT, chaque page est une lecture de plage d'index
+"(created_at, id) < curseur" : le coût ne dépend pas de la position de la
+page dans la liste.
+
+Paramètres d'URL:
+- per_page: Taille de page (bornée à MAX_PER_PAGE)
+- after: Curseur de la page suivante (éléments plus anciens)
+- before: Curseur de la page précédente (éléments plus récents)
+================================================================================
+"""
+
+import base64
+import logging
+from datetime import datetime
+from flask import request, url_for
+from sqlalchemy import tuple_
+
+logger = logging.getLogger(__name__)
+
+# Taille de page par défaut et maximale
+DEFAULT_PER_PAGE = 25
+MAX_PER_PAGE = 100
+
+
+def encode_cursor(created_at, item_id):
+    """
+    Encode un curseur opaque à partir de (created_at, id).
+
+    Args:
+        created_at: Date de création de l'élément
+        item_id: Clé primaire de l'élément
+
+    Returns:
+        str: Curseur encodé en base64 URL-safe
+    """
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Décode un curseur produit par encode_cursor.
+
+    Args:
+        token: Curseur encodé
+
+    Returns:
+        tuple: (created_at, id) ou None si le curseur est invalide
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        created_at, item_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, UnicodeError):
+        logger.warning(f"Curseur de pagination invalide ignoré: {token}")
+        return None
+
+
+def get_per_page():
+    """
+    Lit la taille de page depuis la requête courante.
+
+    Returns:
+        int: Taille de page entre 1 et MAX_PER_PAGE
+    """
+    per_page = request.args.get('per_page', DEFAULT_PER_PAGE, type=int)
+    return max(1, min(per_page or DEFAULT_PER_PAGE, MAX_PER_PAGE))
+
+
+class KeysetPage:
+    """
+    Page de résultats avec curseurs de navigation.
+
+    Attributes:
+        items (list): Éléments de la page (ordre created_at desc, id desc)
+        per_page (int): Taille de page demandée
+        next_cursor (str): Curseur de la page suivante ou None
+        prev_cursor (str): Curseur de la page précédente ou None
+    """
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def _url(self, **cursor):
+        """Construit l'URL courante en remplaçant les curseurs."""
+        args = request.args.to_dict()
+        args.pop('after', None)
+        args.pop('before', None)
+        args.update(cursor)
+        return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    def next_url(self):
+        """Retourne l'URL de la page suivante."""
+        return self._url(after=self.next_cursor)
+
+    def prev_url(self):
+        """Retourne l'URL de la page précédente."""
+        return self._url(before=self.prev_cursor)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def keyset_paginate(query, model, per_page=None, after=None, before=None):
+    """
+    Pagine une requête par curseur sur (created_at, id) décroissants.
+
+    Args:
+        query: Requête SQLAlchemy (déjà filtrée, sans ORDER BY)
+        model: Modèle possédant les colonnes created_at et id
+        per_page: Taille de page (défaut: paramètre per_page de la requête)
+        after: Curseur "après" (défaut: paramètre after de la requête)
+        before: Curseur "avant" (défaut: paramètre before de la requête)
+
+    Returns:
+        KeysetPage: La page de résultats et ses curseurs
+
+    Example:
+        page = keyset_paginate(ServiceRequest.query, ServiceRequest)
+        for req in page.items:
+            ...
+    """
+    if per_page is None:
+        per_page = get_per_page()
+    if after is None and before is None:
+        after = request.args.get('after')
+        before = request.args.get('before')
+
+    after_key = decode_cursor(after)
+    before_key = decode_cursor(before) if after_key is None else None
+
+    key = tuple_(model.created_at, model.id)
+
+    if before_key is not None:
+        # Page précédente: lecture ascendante puis inversion
+        rows = query.filter(key > before_key).order_by(
+            model.created_at.asc(), model.id.asc()
+        ).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        has_newer, has_older = has_more, True
+    else:
+        if after_key is not None:
+            query = query.filter(key < after_key)
+        rows = query.order_by(
+            model.created_at.desc(), model.id.desc()
+        ).limit(per_page + 1).all()
+        items = rows[:per_page]
+        has_newer, has_older = after_key is not None, len(rows) > per_page
+
+    next_cursor = None
+    prev_cursor = None
+    if items:
+        if has_older:
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        if has_newer:
+            prev_cursor = encode_cursor(items[0].created_at, items[0].id)
+
+    return KeysetPage(items, per_page, next_cursor, prev_cursor)
@@ -0,0 +1,160 @@
+"""
+================================================================================
+TheDraftClinic - Budget de requêtes SQL par page
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+Ce module compte les requêtes SQL exécutées pendant un bloc de code et
+permet de plafonner ce nombre pour une page.
+
+Un chargement paresseux dans une boucle de template (N+1) fait croître le
+nombre de requêtes avec le volume de données; une page dont les relations
+sont chargées à l'avance (selectinload, joinedload) garde un nombre fixe.
+Le décorateur query_budget vérifie ce plafond à chaque affichage:
+- QUERY_BUDGET_STRICT activé (ou app.testing): AssertionError
+- sinon: avertissement dans les logs
+
+Les rechargements des caches partagés entre pages (uncounted_queries) ne
+sont pas imputés à la page qui les déclenche.
+
+Usage:
+    @bp.route('/request/<int:request_id>')
+    @query_budget(5)
+    def view_request(request_id):
+        ...
+
+    with assert_max_queries(3):
+        ServiceRequest.load_detail(request_id)
+================================================================================
+"""
+
+import logging
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Compteurs actifs du contexte courant (blocs count_queries imbriqués)
+_active_counters = contextvars.ContextVar('query_counters', default=())
+
+
+class QueryCounter:
+    """
+    Requêtes SQL exécutées pendant un bloc count_queries.
+
+    Attributes:
+        count (int): Nombre de requêtes
+        statements (list): Texte SQL des requêtes, dans l'ordre
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def report(self):
+        """
+        Retourne la liste numérotée des requêtes (messages d'erreur).
+
+        Returns:
+            str: Une ligne par requête
+        """
+        return '\n'.join(
+            f"  {number}. {' '.join(statement.split())[:200]}"
+            for number, statement in enumerate(self.statements, 1)
+        )
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Ajoute la requête à tous les compteurs actifs."""
+    for counter in _active_counters.get():
+        counter.count += 1
+        counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """
+    Compte les requêtes SQL exécutées dans le bloc.
+
+    Yields:
+        QueryCounter: Compteur mis à jour pendant le bloc
+    """
+    counter = QueryCounter()
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
+
+
+@contextmanager
+def uncounted_queries():
+    """
+    Exclut des compteurs actifs les requêtes exécutées dans le bloc.
+
+    Sert aux chargements partagés qui ne dépendent pas de la page (ex:
+    rechargement du cache des paramètres du site après invalidation).
+    """
+    token = _active_counters.set(())
+    try:
+        yield
+    finally:
+        _active_counters.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries):
+    """
+    Vérifie que le bloc exécute au plus max_queries requêtes SQL.
+
+    Args:
+        max_queries (int): Nombre maximum de requêtes
+
+    Raises:
+        AssertionError: Si le plafond est dépassé (avec la liste des requêtes)
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > max_queries:
+        raise AssertionError(
+            f"{counter.count} requêtes SQL pour un maximum de {max_queries}:\n{counter.report()}"
+        )
+
+
+def query_budget(max_queries):
+    """
+    Décorateur plafonnant le nombre de requêtes SQL d'une vue.
+
+    Le rendu du template est compris dans la mesure (render_template est
+    appelé dans la vue).
+
+    Args:
+        max_queries (int): Nombre maximum de requêtes de la vue
+
+    Returns:
+        function: Le décorateur
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            with count_queries() as counter:
+                response = f(*args, **kwargs)
+
+            if counter.count > max_queries:
+                message = (f"Budget de requêtes dépassé pour {f.__name__}: "
+                           f"{counter.count} > {max_queries}")
+                if current_app.testing or current_app.config.get('QUERY_BUDGET_STRICT'):
+                    raise AssertionError(f"{message}\n{counter.report()}")
+                logger.warning(message)
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,83 @@
+"""
+================================================================================
+TheDraftClinic - Template Warm-up Script
+================================================================================
+By MOA Digital Agency LLC
+Developed by: Aisance KALONJI
+Contact: moa@myoneart.com
+Website: www.myoneart.com
+================================================================================
+
+This script compiles every template under templates/ into the shared Jinja
+bytecode cache (JINJA_BYTECODE_CACHE_DIR). Run it at deploy time, before
+starting the workers: they then load compiled templates instead of
+compiling them on the first request after each rollout.
+
+Usage:
+    python warm_templates.py
+    python warm_templates.py --clear    # Empty the cache first
+
+Templates that fail to compile are reported and the script exits with an
+error, which also catches template syntax errors before the rollout.
+================================================================================
+"""
+
+import sys
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def run(args):
+    """
+    Compile every template into the bytecode cache.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    print("=" * 60)
+    print("TheDraftClinic - Template Warm-up")
+    print("=" * 60)
+    print()
+
+    try:
+        from app import create_app
+        from services.template_cache import warm_templates
+
+        app = create_app()
+        print(f"[*] Cache folder: {app.config['JINJA_BYTECODE_CACHE_DIR']}")
+
+        compiled, errors = warm_templates(app, clear=args.clear)
+        print(f"      ✓ {len(compiled)} templates compiled")
+        for name, error in sorted(errors.items()):
+            print(f"      ✗ {name}: {error}")
+
+        print()
+        print("=" * 60)
+        if errors:
+            print(f"Template warm-up finished with {len(errors)} errors!")
+            print("=" * 60)
+            return False
+        print("Template warm-up completed successfully!")
+        print("=" * 60)
+        return True
+
+    except Exception as e:
+        print(f"ERROR: Template warm-up failed!")
+        print(f"Details: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile all templates into the shared Jinja bytecode cache')
+    parser.add_argument('--clear', action='store_true', help='Empty the cache before compiling')
+    args = parser.parse_args()
+
+    success = run(args)
+    sys.exit(0 if success else 1)